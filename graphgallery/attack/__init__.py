@@ -1,5 +1,6 @@
 from .attacker import Attacker
 from .flip_attacker import FlipAttacker
+from .flip_set import FlipSet
 
 from . import targeted
 from . import untargeted
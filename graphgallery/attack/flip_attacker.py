@@ -3,6 +3,7 @@ import scipy.sparse as sp
 
 from graphgallery import functional as gf
 from .attacker import Attacker
+from .flip_set import FlipSet
 
 
 class FlipAttacker(Attacker):
@@ -79,6 +80,9 @@ class FlipAttacker(Attacker):
         if flips is None or len(flips) == 0:
             return None
 
+        if isinstance(flips, FlipSet):
+            return flips.as_array()
+
         if isinstance(flips, dict):
             flips = list(flips.keys())
 
@@ -90,6 +94,9 @@ class FlipAttacker(Attacker):
         if flips is None or len(flips) == 0:
             return None
 
+        if isinstance(flips, FlipSet):
+            return flips.as_array()
+
         if isinstance(flips, dict):
             flips = list(flips.keys())
 
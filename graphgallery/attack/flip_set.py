@@ -0,0 +1,243 @@
+import numpy as np
+
+__all__ = ["FlipSet", "pack_flips", "random_flips"]
+
+
+class FlipSet:
+    """A set of flips, e.g., the flipped edges `(u, v)` or
+    the flipped node attributes `(node, attr)`, with O(1) membership test.
+
+    Each flip is packed into an int64 key `(u << 32) | v` in a hash table,
+    and the flips are stored in insertion order in an (amortized)
+    append-only int64 array, which is exported as a read-only (M, 2) array
+    without copying by `as_array`. A removed flip is only marked as removed,
+    and the array is compacted in order when it is exported.
+
+    It can be used as both the dict (`flips[(u, v)] = value`)
+    and the list (`flips.append((u, v))`) of flips used by the attackers,
+    where appending a flip that is already in the set cancels it,
+    as flipping twice restores the entry.
+
+    Example
+    -------
+    >>> flips = FlipSet(symmetric=True)
+    >>> flips.append((1, 2))
+    >>> (2, 1) in flips
+    True
+    >>> flips.as_array()
+    array([[1, 2]])
+    """
+
+    def __init__(self, flips=None, symmetric=False, capacity=16):
+        """
+        Parameters
+        ----------
+        flips: iterable of (u, v), optional
+            The initial flips.
+        symmetric: bool
+            Whether the flip `(u, v)` is the same as `(v, u)`,
+            e.g., for the flipped edges of undirected graphs.
+        capacity: int
+            The initial capacity of the array.
+        """
+        self.symmetric = symmetric
+        self._index = {}
+        self._data = np.empty((max(capacity, 1), 2), dtype=np.int64)
+        self._values = np.empty(max(capacity, 1), dtype=np.float64)
+        self._removed = np.zeros(max(capacity, 1), dtype=bool)
+        # the number of stored flips, including the removed ones
+        self._size = 0
+        if flips is not None:
+            self.update(flips)
+
+    def key(self, u, v):
+        u, v = int(u), int(v)
+        if self.symmetric and u > v:
+            u, v = v, u
+        return (u << 32) | v
+
+    def add(self, u, v, value=1.0):
+        """Add the flip `(u, v)` if it is not in the set,
+        returns whether it is added."""
+        key = self.key(u, v)
+        if key in self._index:
+            return False
+        if self._size == self._data.shape[0]:
+            self._grow()
+        pos = self._size
+        self._data[pos] = (int(u), int(v))
+        self._values[pos] = value
+        self._removed[pos] = False
+        self._index[key] = pos
+        self._size += 1
+        return True
+
+    def remove(self, u, v):
+        """Remove the flip `(u, v)`, the order of the others is kept."""
+        pos = self._index.pop(self.key(u, v))
+        self._removed[pos] = True
+
+    def flip(self, u, v):
+        """Add the flip `(u, v)`, or remove it if it is already in the set."""
+        if not self.add(u, v):
+            self.remove(u, v)
+
+    def append(self, flip):
+        self.flip(*flip)
+
+    def update(self, flips):
+        for flip in flips:
+            self.add(*flip)
+
+    def contains(self, flips):
+        """Vectorized membership test of the flips of shape (M, 2), returns a boolean mask."""
+        flips = np.asarray(flips, dtype=np.int64).reshape(-1, 2)
+        if len(self) == 0:
+            return np.zeros(flips.shape[0], dtype=bool)
+        return np.isin(pack_flips(flips, self.symmetric),
+                       pack_flips(self.as_array(), self.symmetric))
+
+    def as_array(self):
+        """The flips of shape (M, 2) in insertion order.
+
+        NOTE: It is a read-only view of the internal buffer, which is invalid
+        (not updated) after further modifications of the set.
+        """
+        self._compact()
+        return _readonly(self._data[:self._size])
+
+    def values(self):
+        self._compact()
+        return _readonly(self._values[:self._size])
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        return zip(iter(self), self.values().tolist())
+
+    def clear(self):
+        self._index.clear()
+        self._size = 0
+
+    def _compact(self):
+        """Drop the removed flips and keep the order of the others."""
+        if len(self._index) == self._size:
+            return
+        keep = ~self._removed[:self._size]
+        size = len(self._index)
+        self._data[:size] = self._data[:self._size][keep]
+        self._values[:size] = self._values[:self._size][keep]
+        self._removed[:size] = False
+        self._size = size
+        keys = pack_flips(self._data[:size], self.symmetric).tolist()
+        self._index = dict(zip(keys, range(size)))
+
+    def _grow(self):
+        self._compact()
+        if self._size < self._data.shape[0] // 2:
+            return
+        capacity = 2 * self._data.shape[0]
+        data = np.empty((capacity, 2), dtype=np.int64)
+        data[:self._size] = self._data[:self._size]
+        values = np.empty(capacity, dtype=np.float64)
+        values[:self._size] = self._values[:self._size]
+        removed = np.zeros(capacity, dtype=bool)
+        self._data, self._values, self._removed = data, values, removed
+
+    def __setitem__(self, flip, value):
+        u, v = flip
+        if not self.add(u, v, value):
+            self._values[self._index[self.key(u, v)]] = value
+
+    def __getitem__(self, flip):
+        return self._values[self._index[self.key(*flip)]]
+
+    def __contains__(self, flip):
+        try:
+            u, v = flip
+        except (TypeError, ValueError):
+            return False
+        return self.key(u, v) in self._index
+
+    def __iter__(self):
+        return iter(map(tuple, self.as_array().tolist()))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(size={len(self)}, symmetric={self.symmetric})"
+
+    __str__ = __repr__
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+def pack_flips(flips, symmetric=False):
+    """Pack the flips of shape (M, 2) into int64 keys `(u << 32) | v`."""
+    flips = np.asarray(flips, dtype=np.int64).reshape(-1, 2)
+    u, v = flips[:, 0], flips[:, 1]
+    if symmetric:
+        u, v = np.minimum(u, v), np.maximum(u, v)
+    return (u << 32) | v
+
+
+def random_flips(adj_matrix, influence_nodes, size, add=True, flips=None, exclude=None):
+    """Propose `size` random flips `(u, v)` at once, where `u` is uniformly
+    chosen from `influence_nodes`, and `v` from the non-neighbors (`add=True`)
+    or the neighbors (`add=False`) of `u`.
+
+    The proposals with `u == v`, `v` in `exclude`, or that are already
+    in `flips`, are rejected, so fewer than `size` flips may be returned.
+
+    Parameters
+    ----------
+    adj_matrix: sp.csr_matrix
+        The adjacency matrix.
+    influence_nodes: array-like
+        The candidates of `u`.
+    size: int
+        The number of proposals.
+    add: bool
+        Whether to propose the flips that add edges or remove edges.
+    flips: FlipSet, optional
+        The existing flips.
+    exclude: array-like, optional
+        The nodes that are not allowed as `v`.
+
+    Returns
+    -------
+    np.ndarray of shape (M, 2), with M <= size
+    """
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    if size <= 0 or len(influence_nodes) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    u = np.random.choice(np.asarray(influence_nodes, dtype=np.int64), size)
+    if add:
+        # the uniformly sampled `v` is accepted if it is not a neighbor,
+        # i.e., uniformly sampled from the non-neighbors
+        v = np.random.randint(adj_matrix.shape[0], size=size)
+        mask = adj_matrix[u, v].A1 == 0
+    else:
+        indptr, indices = adj_matrix.indptr, adj_matrix.indices
+        if indices.size == 0:
+            return np.empty((0, 2), dtype=np.int64)
+        degree = indptr[u + 1] - indptr[u]
+        mask = degree > 0
+        offset = (np.random.rand(size) * degree).astype(np.int64)
+        # the positions of nodes without neighbors are clipped and masked out
+        v = indices[np.minimum(indptr[u] + offset, indices.size - 1)].astype(np.int64)
+
+    mask &= u != v
+    if exclude is not None:
+        mask &= ~np.isin(v, exclude)
+
+    proposals = np.column_stack([u, v])[mask]
+    if flips is not None and len(flips):
+        proposals = proposals[~flips.contains(proposals)]
+    return proposals
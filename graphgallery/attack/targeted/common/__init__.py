@@ -3,3 +3,4 @@ from .dice import DICE
 from .nettack import Nettack
 from .gf_attack import GFA
 from .node_embedding_attack import NodeEmbeddingAttack
+from .batch_nettack import BatchNettack
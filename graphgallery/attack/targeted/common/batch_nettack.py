@@ -0,0 +1,175 @@
+import numpy as np
+import scipy.sparse as sp
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+from graphgallery import functional as gf
+from graphgallery.data import Graph
+from graphgallery.utils import tqdm
+from .nettack import Nettack
+
+__all__ = ["BatchNettack"]
+
+
+class BatchNettack:
+    """Run `Nettack` on many targets with shared precomputation.
+
+    The co-occurrence matrix, `X @ W`, the sorted adjacency matrix and the degrees
+    are computed once and shared by all targets. With `num_workers > 1`,
+    the targets are attacked in worker processes, where the adjacency
+    matrix, the node attributes, the co-occurrence matrix and `X @ W` are placed
+    in shared memory (CSR buffers) instead of being pickled for each worker.
+
+    Example
+    -------
+    >>> batch = BatchNettack(graph, W, num_workers=4)
+    >>> flips = batch.attack(targets, direct_attack=True)
+    >>> flips[target].adj_flips
+    """
+
+    def __init__(self, graph, W_surrogate, num_workers=None, seed=None):
+        """
+        Parameters
+        ----------
+        graph: Graph
+            The graph to be attacked.
+        W_surrogate: np.array, shape [num_attrs, num_classes]
+            The weights of the linearized surrogate model.
+        num_workers: int, optional
+            The number of worker processes, by default None, i.e.,
+            all the CPUs. The targets are attacked serially
+            in the current process if `num_workers <= 1`.
+        seed: int, optional
+            The random seed of the attackers.
+        """
+        adj_matrix = graph.adj_matrix.tocsr(copy=True)
+        adj_matrix.sort_indices()
+        sparse_x = sp.csr_matrix(graph.node_attr)
+
+        self.adj_matrix = adj_matrix
+        self.sparse_x = sparse_x
+        self.cooc_matrix = (sparse_x.T @ sparse_x).tocsr()
+        self.node_label = np.asarray(graph.node_label)
+        self.W = gf.tensoras(W_surrogate)
+        self.XW = np.asarray(sparse_x @ self.W)
+        self.num_workers = mp.cpu_count() if num_workers is None else num_workers
+        self.seed = seed
+
+    def attack(self, targets, num_budgets=None, disable=False, **kwargs):
+        """Attack each of the targets independently.
+
+        Parameters
+        ----------
+        targets: list of int
+            The target nodes.
+        num_budgets: int, float or None
+            The budget for each target, see `Nettack.attack`.
+        disable: bool
+            Whether to disable the progress bar.
+        kwargs: other keyword arguments passed into `Nettack.attack`.
+
+        Returns
+        -------
+        dict, mapping each target to a `BunchDict` with
+        `adj_flips` and `nattr_flips`, i.e., the list of flipped edges and attributes.
+        """
+        targets = [int(t) for t in targets]
+        kwargs["num_budgets"] = num_budgets
+        kwargs["disable"] = True
+
+        if self.num_workers <= 1 or len(targets) <= 1:
+            _init_worker(self._arrays(), self.W, self.seed)
+            results = [_attack_target(t, kwargs) for t in tqdm(targets, desc='Attacking targets', disable=disable)]
+            _release_worker()
+            return dict(results)
+
+        shms = []
+        try:
+            specs = {k: _to_shared(v, shms) for k, v in self._arrays().items()}
+            with mp.Pool(self.num_workers, initializer=_init_worker,
+                         initargs=(specs, self.W, self.seed)) as pool:
+                jobs = pool.imap_unordered(_attack_target_star,
+                                           ((t, kwargs) for t in targets))
+                results = dict(tqdm(jobs, total=len(targets), desc='Attacking targets', disable=disable))
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+        return {t: results[t] for t in targets}
+
+    def _arrays(self):
+        return dict(adj_matrix=self.adj_matrix,
+                    node_attr=self.sparse_x,
+                    cooc_matrix=self.cooc_matrix,
+                    XW=self.XW,
+                    node_label=self.node_label)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(num_workers={self.num_workers})"
+
+    __str__ = __repr__
+
+
+# the attacker in each worker process
+_ATTACKER = None
+_SHARED = []
+
+
+def _init_worker(specs, W, seed):
+    global _ATTACKER
+    arrays = {k: _from_shared(v) for k, v in specs.items()}
+    # the indices have been sorted before sharing
+    arrays["adj_matrix"].has_sorted_indices = True
+    graph = Graph(adj_matrix=arrays["adj_matrix"],
+                  node_label=arrays["node_label"],
+                  copy=False)
+    # keep the node attributes sparse, `Nettack` only uses them in CSR format
+    graph.node_attr = arrays["node_attr"]
+    _ATTACKER = Nettack(graph, seed=seed).process(W, cooc_matrix=arrays["cooc_matrix"], XW=arrays["XW"])
+
+
+def _release_worker():
+    global _ATTACKER
+    _ATTACKER = None
+    for shm in _SHARED:
+        shm.close()
+    _SHARED.clear()
+
+
+def _attack_target(target, kwargs):
+    attacker = _ATTACKER.reset()
+    attacker.attack(target, **kwargs)
+    return target, gf.BunchDict(adj_flips=list(attacker.adj_flips),
+                                nattr_flips=list(attacker.nattr_flips))
+
+
+def _attack_target_star(args):
+    return _attack_target(*args)
+
+
+def _to_shared(value, shms):
+    """Copy the array (or each array of the CSR matrix) into shared memory."""
+    if sp.isspmatrix(value):
+        return dict(shape=value.shape,
+                    data=_to_shared(value.data, shms),
+                    indices=_to_shared(value.indices, shms),
+                    indptr=_to_shared(value.indptr, shms))
+    value = np.ascontiguousarray(value)
+    shm = shared_memory.SharedMemory(create=True, size=max(value.nbytes, 1))
+    np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)[...] = value
+    shms.append(shm)
+    return dict(name=shm.name, shape=value.shape, dtype=value.dtype.str)
+
+
+def _from_shared(spec):
+    if not isinstance(spec, dict):
+        # arrays in the current process
+        return spec
+    if "indptr" in spec:
+        return sp.csr_matrix((_from_shared(spec["data"]),
+                              _from_shared(spec["indices"]),
+                              _from_shared(spec["indptr"])),
+                             shape=spec["shape"], copy=False)
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    _SHARED.append(shm)
+    return np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
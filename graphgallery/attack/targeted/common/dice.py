@@ -1,4 +1,3 @@
-import random
 import numpy as np
 from graphgallery.attack.targeted import Common
 from .rand import RAND
@@ -6,42 +5,12 @@ from .rand import RAND
 
 @Common.register()
 class DICE(RAND):
-    def add_edge(self, influence_nodes):
-        u = random.choice(influence_nodes)
-        neighbors = self.graph.adj_matrix[u].indices.tolist()
-        potential_nodes = list(self.nodes_set - set(neighbors) -
-                               set([self.target, u]))
-
-        if len(potential_nodes) == 0:
-            return None
-
-        v = random.choice(potential_nodes)
-
+    def propose(self, influence_nodes, size, add=True):
+        edges = super().propose(influence_nodes, size, add=add)
         label = self.graph.node_label
-
-        if not self.is_modified(u, v) and (label[u] != label[v]):
-            return (u, v)
-        else:
-            return None
-
-    def del_edge(self, influence_nodes):
-
-        u = random.choice(influence_nodes)
-        neighbors = self.graph.adj_matrix[u].indices.tolist()
-        potential_nodes = list(set(neighbors) - set([self.target, u]))
-
-        if len(potential_nodes) == 0:
-            return None
-
-        v = random.choice(potential_nodes)
-
-        if not self.allow_singleton and (self.modified_degree[u] <= 1
-                                         or self.modified_degree[v] <= 1):
-            return None
-
-        label = self.graph.node_label
-
-        if not self.is_modified(u, v) and (label[u] == label[v]):
-            return (u, v)
+        same_label = label[edges[:, 0]] == label[edges[:, 1]]
+        # connect nodes with different labels and disconnect nodes with the same labels
+        if add:
+            return edges[~same_label]
         else:
-            return None
+            return edges[same_label]
@@ -1,6 +1,7 @@
 import numpy as np
 import scipy.sparse as sp
 from scipy import linalg
+from scipy.sparse.linalg import eigsh
 
 from graphgallery.utils import tqdm
 from graphgallery import functional as gf
@@ -16,14 +17,30 @@ class GFA(TargetedAttacker):
     T=_N//2 for cora to reproduce results in paper.
     """
 
-    def process(self, K=2, T=128, reset=True):
+    def process(self, K=2, T=128, num_eigs=None, reset=True):
+        """
+        Parameters
+        ----------
+        K: int, default: 2
+            The order of graph filter K.
+        T: int, default: 128
+            Selecting the Top-T eigen-values/vectors.
+        num_eigs: int, optional
+            The number of the largest (generalized) eigen-values/vectors computed
+            by `scipy.sparse.linalg.eigsh`, the scores are then computed only on them.
+            By default None, i.e., all of them are computed by the dense `linalg.eigh`.
+        """
         adj, x = self.graph.adj_matrix, self.graph.node_attr
 
         adj_with_I = adj + sp.eye(adj.shape[0])
         rowsum = adj_with_I.sum(1).A1
-        degree_mat = np.diag(rowsum)
-        eig_vals, eig_vec = linalg.eigh(adj_with_I.A, degree_mat)
-        X_mean = np.sum(x, axis=1)
+        if num_eigs is None:
+            degree_mat = np.diag(rowsum)
+            eig_vals, eig_vec = linalg.eigh(adj_with_I.A, degree_mat)
+        else:
+            degree_mat = sp.diags(rowsum, format='csc')
+            eig_vals, eig_vec = eigsh(adj_with_I.tocsc(), k=num_eigs, M=degree_mat, which='LA')
+        X_mean = np.asarray(x.sum(1)).ravel()
 
         # The order of graph filter K
         self.K = K
@@ -160,7 +177,8 @@ class GFA(TargetedAttacker):
                      filtered_edges,
                      K,
                      T,
-                     lambda_method="nosum"):
+                     lambda_method="nosum",
+                     chunk_size=None):
         '''
         Calculate the scores as formulated in paper.
 
@@ -177,44 +195,55 @@ class GFA(TargetedAttacker):
             "nosum" denotes Equation (8), where the loss is derived from Graph Convolutional Networks,
             "sum" denotes Equation (12), where the loss is derived from Sampling-based Graph Embedding Methods.
 
+        chunk_size: int, optional
+            The number of candidate edges scored at once, which bounds the memory
+            of the temporary [chunk_size, len(eig_vals)] arrays.
+            By default None, i.e., about 2^24 elements for each array.
+
         Returns
         -------
         Scores for candidate edges.
 
         '''
-        results = []
-        A = A + sp.eye(A.shape[0])
-        #         A[A > 1] = 1
-        rowsum = A.sum(1).A1
+        A = A.tocsr(copy=False)
+        # A + I, the self-loops do not affect the candidates (u != v)
+        rowsum = A.sum(1).A1 + 1.
         D_min = rowsum.min()
-        abs_V = len(eig_vals)
-        return_values = []
-
-        for j, (u, v) in enumerate(filtered_edges):
-            # eig_vals_res = np.zeros(len(eig_vals))
-            eig_vals_res = (1 - 2 * A[(u, v)]) * (
-                2 * eig_vec[u, :] * eig_vec[v, :] - eig_vals *
-                (np.square(eig_vec[u, :]) + np.square(eig_vec[v, :])))
-            eig_vals_res = eig_vals + eig_vals_res
+        num_eigs = len(eig_vals)
+        T = min(T, num_eigs)
+        # the squared projection of the mean features on each eigen-vector,
+        # so that the norm of `u_k.T @ X_mean` is a sum over the selected ones
+        x_proj = np.square(eig_vec.T @ X_mean)
+
+        if chunk_size is None:
+            chunk_size = max(1, 2**24 // num_eigs)
+
+        filtered_edges = np.asarray(filtered_edges)
+        return_values = np.empty(len(filtered_edges), dtype=eig_vals.dtype)
+
+        for start in range(0, len(filtered_edges), chunk_size):
+            u, v = filtered_edges[start:start + chunk_size].T
+            sign = (1 - 2 * A[u, v].A1)[:, None]
+            eig_vec_u, eig_vec_v = eig_vec[u], eig_vec[v]
+            eig_vals_res = sign * (2 * eig_vec_u * eig_vec_v - eig_vals *
+                                   (np.square(eig_vec_u) + np.square(eig_vec_v)))
+            eig_vals_res += eig_vals
 
             if lambda_method == "sum":
-                if K == 1:
-                    eig_vals_res = np.abs(eig_vals_res / K) * (1 / D_min)
-                else:
-                    for itr in range(1, K):
-                        eig_vals_res = eig_vals_res + np.power(
-                            eig_vals_res, itr + 1)
-                    eig_vals_res = np.abs(eig_vals_res / K) * (1 / D_min)
+                for itr in range(1, K):
+                    eig_vals_res = eig_vals_res + np.power(eig_vals_res, itr + 1)
+                eig_vals_res = np.abs(eig_vals_res / K) * (1 / D_min)
+            else:
+                eig_vals_res = np.power(np.square(eig_vals_res + 1), K)
+
+            # the T smallest ones of each candidate
+            if T < num_eigs:
+                eig_vals_idx = np.argpartition(eig_vals_res, T - 1, axis=1)[:, :T]
+                eig_vals_res = np.take_along_axis(eig_vals_res, eig_vals_idx, axis=1)
+                x_proj_k = x_proj[eig_vals_idx]
             else:
-                eig_vals_res = np.square(
-                    (eig_vals_res + np.ones(len(eig_vals_res))))
-                eig_vals_res = np.power(eig_vals_res, K)
-
-            eig_vals_idx = np.argsort(eig_vals_res)  # from small to large
-            eig_vals_k_sum = eig_vals_res[eig_vals_idx[:T]].sum()
-            u_k = eig_vec[:, eig_vals_idx[:T]]
-            u_x_mean = u_k.T.dot(X_mean)
-            return_values.append(eig_vals_k_sum *
-                                 np.square(np.linalg.norm(u_x_mean)))
-
-        return np.asarray(return_values)
+                x_proj_k = x_proj[None, :]
+
+            return_values[start:start + chunk_size] = eig_vals_res.sum(1) * x_proj_k.sum(1)
+
+        return return_values
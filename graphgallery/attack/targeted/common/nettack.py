@@ -8,10 +8,9 @@ Copyright (C) 2018
 Daniel Zügner
 Technical University of Munich
 """
-import warnings
 import numpy as np
 import scipy.sparse as sp
-from numba import njit
+from numba import njit, prange
 
 import graphgallery as gg
 from graphgallery import functional as gf
@@ -31,29 +30,86 @@ class Nettack(TargetedAttacker):
     # nettack can conduct feature attack
     _allow_feature_attack = True
 
-    def process(self, W_surrogate, reset=True):
-
+    def process(self, W_surrogate, reset=True, cooc_matrix=None, XW=None):
+        """
+        Parameters
+        ----------
+        W_surrogate: np.array, shape [num_attrs, num_classes]
+            The weights of the linearized surrogate model.
+        reset: bool, optional
+            whether to reset the attacker.
+        cooc_matrix: sp.sparse_matrix, optional
+            The precomputed co-occurrence matrix `X.T @ X`,
+            which can be shared by attackers on the same graph.
+        XW: np.array, shape [num_nodes, num_classes], optional
+            The precomputed `X @ W_surrogate`, which can be shared
+            by attackers on the same graph as well.
+        """
         self.W = W_surrogate
         sparse_x = sp.csr_matrix(self.graph.node_attr)
-        self.cooc_matrix = sparse_x.T @ sparse_x
+        if cooc_matrix is None:
+            cooc_matrix = sparse_x.T @ sparse_x
+        if XW is None:
+            XW = sparse_x @ W_surrogate
+        self.cooc_matrix = cooc_matrix
         self.sparse_x = sparse_x
+        # XW of the clean features, only recomputed after feature flips
+        self.XW_start = XW
+
+        adj_matrix = self.graph.adj_matrix.tocsr(copy=False)
+        if not adj_matrix.has_sorted_indices:
+            adj_matrix = adj_matrix.copy()
+            adj_matrix.sort_indices()
+        self.adj_matrix = adj_matrix
+        # the sorted neighbors and the degrees (with self-loops) of the modified graph,
+        # which are updated inplace by the edge flips and restored on reset
+        self.neighbors = SortedNeighbors(adj_matrix)
+        self.degrees = adj_matrix.sum(0).A1 + 1
+        self._performed_flips = []
         if reset:
             self.reset()
         return self
 
     def reset(self):
         super().reset()
-        self.modified_adj = self.graph.adj_matrix.copy()
-        self.modified_nx = self.sparse_x.copy()
-        self.adj_norm = gf.normalize_adj(self.modified_adj)
+        # undo the edge flips in reverse order, so that a reset only costs
+        # O(budget * degree) instead of copying the whole graph
+        while self._performed_flips:
+            u, v = self._performed_flips.pop()
+            delta = self.neighbors.flip(u, v)
+            self.degrees[[u, v]] += delta
+        # the feature flips create new matrices instead of modifying
+        # them inplace, so it is not necessary to copy them
+        self.modified_adj = self.adj_matrix
+        self.modified_nx = self.sparse_x
+        self._XW = self.XW_start
 
-        self.adj_flips = []
-        self.nattr_flips = []
         self.influence_nodes = []
         self.potential_edges = []
         self.cooc_constraint = None
         return self
 
+    @property
+    def adj_norm(self):
+        """The normalized adjacency matrix of the modified graph,
+        it is NOT used during attacking and computed on demand."""
+        return gf.normalize_adj(self.A)
+
+    def a_hat_sq_row(self):
+        """
+        Compute the row of the target in the squared normalized adjacency matrix A_hat^2,
+        using only the two-hop neighborhood of the target.
+
+        Returns
+        -------
+        cols: np.array, shape [T,]
+            The sorted indices of the two-hop neighborhood of the target, including itself.
+        values: np.array, shape [T,]
+            The nonzero values of the row.
+        """
+        nbrs = self.neighbors
+        return a_hat_sq_row(nbrs.start, nbrs.count, nbrs.indices, self.degrees, self.target)
+
     def compute_cooccurrence_constraint(self, nodes):
         """
         Co-occurrence constraint as described in the paper.
@@ -76,26 +132,29 @@ class Nettack(TargetedAttacker):
         words_graph.eliminate_zeros()
         #         words_graph.setdiag(0)
         words_graph.data = words_graph.data > 0
+        words_graph = words_graph.astype(float)
         word_degrees = words_graph.sum(0).A1
 
-        inv_word_degrees = np.reciprocal(word_degrees.astype(float) + 1e-8)
+        inv_word_degrees = np.reciprocal(word_degrees + 1e-8)
 
-        sd = np.zeros(num_nodes)
-        for n in range(num_nodes):
-            n_idx = self.modified_nx[n, :].nonzero()[1]
-            sd[n] = np.sum(inv_word_degrees[n_idx.tolist()])
+        # sd[n] = sum of the inverse degrees of the words of node n
+        binary_x = self.modified_nx.astype(bool).astype(float)
+        sd = binary_x @ inv_word_degrees
 
-        scores_matrix = sp.lil_matrix((num_nodes, num_attrs))
+        # scores[n, i] = sum of the inverse degrees of the words j of node n
+        # that co-occur with word i, i.e., (X[nodes] * inv_degs) @ words_graph
+        nodes = np.asarray(nodes, dtype=int)
+        x_nodes = binary_x[nodes] @ sp.diags(inv_word_degrees)
+        scores = (x_nodes @ words_graph).tocsr()
+        # only the positive scores are allowed, and the scores are nonnegative,
+        # so it is enough to compare the nonzero entries
+        scores.data -= 0.5 * np.repeat(sd[nodes], np.diff(scores.indptr))
+        scores.data = (scores.data > 0).astype(float)
+        scores.eliminate_zeros()
 
-        for n in nodes:
-            common_words = words_graph.multiply(self.modified_nx[n])
-            idegs = inv_word_degrees[common_words.nonzero()[1]]
-            nnz = common_words.nonzero()[0]
-            scores = np.array(
-                [idegs[nnz == ix].sum() for ix in range(num_attrs)])
-            scores_matrix[n] = scores
-        self.cooc_constraint = sp.csr_matrix(
-            scores_matrix - 0.5 * sd[:, None] > 0)
+        rows = np.repeat(nodes, np.diff(scores.indptr))
+        self.cooc_constraint = sp.csr_matrix((scores.data.astype(bool), (rows, scores.indices)),
+                                             shape=(num_nodes, num_attrs))
 
     def gradient_wrt_x(self, label):
         """
@@ -112,8 +171,10 @@ class Nettack(TargetedAttacker):
 
         """
 
-        return (self.adj_norm @ self.adj_norm)[self.target].T @ sp.coo_matrix(
-            self.W[:, label].reshape(1, -1))
+        cols, values = self.a_hat_sq_row()
+        a_hat_sq_col = sp.csr_matrix((values, (cols, np.zeros_like(cols))),
+                                     shape=(self.num_nodes, 1))
+        return a_hat_sq_col @ sp.coo_matrix(self.W[:, label].reshape(1, -1))
 
     def compute_logits(self):
         """
@@ -125,8 +186,8 @@ class Nettack(TargetedAttacker):
             The log probabilities for each node.
 
         """
-        return (self.adj_norm @ self.adj_norm @ self.modified_nx
-                @ self.W)[self.target].ravel()
+        cols, values = self.a_hat_sq_row()
+        return values @ self.compute_XW()[cols]
 
     def strongest_wrong_class(self, logits):
         """
@@ -210,8 +271,10 @@ class Nettack(TargetedAttacker):
         -------
         x @ W: np.array, shape [num_nodes, num_classes]
         """
-
-        return self.modified_nx @ self.W
+        # cached until the features are modified
+        if self._XW is None:
+            self._XW = self.modified_nx @ self.W
+        return self._XW
 
     def get_attacker_nodes(self, n=5, add_additional_nodes=False):
         """
@@ -239,7 +302,7 @@ class Nettack(TargetedAttacker):
         assert n < self.num_nodes - 1, "number of influencers cannot be >= number of nodes in the graph!"
 
         #         neighbors = self.modified_adj[self.target].nonzero()[1]
-        neighbors = self.modified_adj[self.target].indices
+        neighbors = self.neighbors.row(self.target).copy()
         #         assert self.target not in neighbors
 
         potential_edges = np.column_stack((np.tile(self.target, len(neighbors)), neighbors)).astype("int32")
@@ -290,30 +353,13 @@ class Nettack(TargetedAttacker):
         sp.sparse_matrix: updated A_hat_square_u entries, a sparse PxN matrix, where P is len(possible_edges).
         """
 
-        edges = np.transpose(self.modified_adj.nonzero())
-        edges_set = {tuple(e) for e in edges}
-        A_hat_sq = self.adj_norm @ self.adj_norm
-        values_before = A_hat_sq[self.target].toarray()[0]
-        node_ixs = np.unique(edges[:, 0], return_index=True)[1].astype("int32")
-        twohop_ixs = np.transpose(A_hat_sq.nonzero())
-        degrees = self.modified_adj.sum(0).A1 + 1
-
-        # Ignore warnings:
-        #     NumbaPendingDeprecationWarning:
-        # Encountered the use of a type that is scheduled for deprecation: type 'reflected set' found for argument 'edges_set' of function 'compute_new_a_hat_uv'.
-
-        # For more information visit http://numba.pydata.org/numba-doc/latest/reference/deprecation.html#deprecation-of-reflection-for-list-and-set-types
-        with warnings.catch_warnings(record=True):
-            warnings.filterwarnings(
-                'ignore',
-                '.*Encountered the use of a type that is scheduled for deprecation*'
-            )
-            ixs, vals = compute_new_a_hat_uv(edges, node_ixs, edges_set,
-                                             twohop_ixs, values_before,
-                                             degrees, potential_edges,
-                                             self.target)
-        ixs_arr = np.array(ixs)
-        a_hat_uv = sp.coo_matrix((vals, (ixs_arr[:, 0], ixs_arr[:, 1])),
+        nbrs = self.neighbors
+        twohop_u, values_before = self.a_hat_sq_row()
+        rows, cols, vals = compute_new_a_hat_uv(nbrs.start, nbrs.count, nbrs.indices,
+                                                twohop_u, values_before,
+                                                self.degrees, potential_edges,
+                                                self.target)
+        a_hat_uv = sp.coo_matrix((vals, (rows, cols)),
                                  shape=[len(potential_edges), self.num_nodes])
 
         return a_hat_uv
@@ -332,7 +378,7 @@ class Nettack(TargetedAttacker):
         super().attack(target, num_budgets, direct_attack, structure_attack,
                        feature_attack)
 
-        if feature_attack and not self.graph.is_binary():
+        if feature_attack and not np.isin(self.sparse_x.data, (0, 1)).all():
             raise RuntimeError(
                 "Currently only attack binary node attributes are supported")
 
@@ -389,16 +435,19 @@ class Nettack(TargetedAttacker):
                        desc='Peturbing Graph',
                        disable=disable):
             if structure_attack:
+                filtered_edges = self.potential_edges
+                existing_edges = self.neighbors.has_edges(filtered_edges)
                 # Do not consider edges that, if removed, result in singleton edges in the graph.
+                # It is the same as `gf.singleton_filter` with the degrees (with self-loops) of the modified graph.
                 if not self.allow_singleton:
-                    filtered_edges = gf.singleton_filter(self.potential_edges, self.modified_adj).astype("int32")
-                else:
-                    filtered_edges = self.potential_edges
+                    edge_degrees = self.degrees[filtered_edges] - 2 * existing_edges[:, None]
+                    mask = np.logical_and(edge_degrees[:, 0] > 0, edge_degrees[:, 1] > 0)
+                    filtered_edges = filtered_edges[mask]
+                    existing_edges = existing_edges[mask]
 
                 if ll_constraint:
                     # Update the values for the power law likelihood ratio test.
-                    deltas = 2 * (1 - self.modified_adj[tuple(
-                        filtered_edges.T)].A.ravel()) - 1
+                    deltas = 1 - 2 * existing_edges.astype("int64")
                     d_edges_old = current_degree_sequence[filtered_edges]
                     d_edges_new = current_degree_sequence[
                         filtered_edges] + deltas[:, None]
@@ -450,11 +499,9 @@ class Nettack(TargetedAttacker):
             if change_structure:
                 # perform edge perturbation
                 u, v = best_edge
-                modified_adj = self.modified_adj.tolil(copy=False)
-                modified_adj[(u, v)] = modified_adj[(
-                    v, u)] = 1 - modified_adj[(u, v)]
-                self.modified_adj = modified_adj.tocsr(copy=False)
-                self.adj_norm = gf.normalize_adj(modified_adj)
+                delta = self.neighbors.flip(u, v)
+                self.degrees[[u, v]] += delta
+                self._performed_flips.append((u, v))
                 self.adj_flips.append((u, v))
 
                 if ll_constraint:
@@ -469,7 +516,12 @@ class Nettack(TargetedAttacker):
                 modified_nx[tuple(
                     best_feature_ix)] = 1 - modified_nx[tuple(best_feature_ix)]
                 self.modified_nx = modified_nx.tocsr(copy=False)
+                self._XW = None
                 self.nattr_flips.append(tuple(best_feature_ix))
+
+        if self._performed_flips:
+            # built from `adj_flips` on demand, see `A`
+            self.modified_adj = None
         return self
 
 
@@ -484,27 +536,176 @@ def connected_after(u, v, connected_before, delta):
         return connected_before
 
 
+class SortedNeighbors:
+    """
+    The sorted neighbors of each node in a shared buffer,
+    where each row has its own capacity. Flipping the edge (u, v)
+    only shifts the rows `u` and `v`, and a full row is moved
+    to the end of the buffer with doubled capacity.
+    """
+
+    def __init__(self, adj_matrix):
+        """
+        Parameters
+        ----------
+        adj_matrix: sp.csr_matrix, shape [num_nodes, num_nodes]
+            The adjacency matrix with sorted indices and without self-loops,
+            which is copied and not modified.
+        """
+        self.start = adj_matrix.indptr[:-1].astype("int64")
+        self.count = np.diff(adj_matrix.indptr).astype("int64")
+        self.capacity = self.count.copy()
+        self.indices = adj_matrix.indices.copy()
+        self.size = self.indices.size
+
+    def row(self, u):
+        """The sorted neighbors of node `u`, a view of the buffer."""
+        start = self.start[u]
+        return self.indices[start:start + self.count[u]]
+
+    def flip(self, u, v):
+        """Flip the undirected edge (u, v), return 1 if it is inserted, otherwise -1."""
+        self.indices, self.size, delta = flip_edge(self.start, self.count,
+                                                   self.capacity, self.indices,
+                                                   self.size, u, v)
+        return delta
+
+    def has_edges(self, edges):
+        """Whether each of the edges, shape [P, 2], exists."""
+        return has_edges(self.start, self.count, self.indices, edges)
+
+
 @njit
-def compute_new_a_hat_uv(edge_ixs, node_nb_ixs, edges_set, twohop_ixs,
-                         values_before, degs, potential_edges, u):
+def flip_edge(start, count, capacity, indices, size, u, v):
+    """
+    Flip the undirected edge (u, v) of the sorted neighbor rows,
+    it costs O(deg(u) + deg(v)) except when the buffer is reallocated,
+    which grows geometrically.
+
+    Returns
+    -------
+    indices: np.array, the buffer, which is reallocated if full.
+    size: int, the used size of the buffer.
+    delta: int, 1 if the edge is inserted, otherwise -1.
+    """
+    delta = -1 if has_edge(start, count, indices, u, v) else 1
+    for k in range(1 if u == v else 2):
+        a, b = (u, v) if k == 0 else (v, u)
+        s, c = start[a], count[a]
+        pos = s + np.searchsorted(indices[s:s + c], b)
+        if delta == -1:
+            for i in range(pos, s + c - 1):
+                indices[i] = indices[i + 1]
+        else:
+            if c == capacity[a]:
+                # move the full row to the end of the buffer
+                cap = 2 * c + 1
+                if size + cap > len(indices):
+                    grown = np.empty(max(2 * len(indices), size + cap), dtype=indices.dtype)
+                    grown[:size] = indices[:size]
+                    indices = grown
+                indices[size:size + c] = indices[s:s + c]
+                pos += size - s
+                s = size
+                start[a] = s
+                capacity[a] = cap
+                size += cap
+            for i in range(s + c, pos, -1):
+                indices[i] = indices[i - 1]
+            indices[pos] = b
+        count[a] += delta
+    return indices, size, delta
+
+
+@njit
+def has_edge(start, count, indices, u, v):
+    """Whether (u, v) is an edge of the sorted neighbor rows."""
+    s, e = start[u], start[u] + count[u]
+    pos = s + np.searchsorted(indices[s:e], v)
+    return pos < e and indices[pos] == v
+
+
+@njit(parallel=True)
+def has_edges(start, count, indices, edges):
+    out = np.empty(len(edges), dtype=np.bool_)
+    for i in prange(len(edges)):
+        out[i] = has_edge(start, count, indices, edges[i, 0], edges[i, 1])
+    return out
+
+
+@njit
+def a_hat_sq_row(start, count, indices, degs, u):
+    """
+    Compute the row `u` of A_hat^2, where A_hat = D^{-1/2} (A + I) D^{-1/2}
+    and `degs` is the degree of A + I.
+
+    Returns
+    -------
+    cols: np.array, the sorted two-hop neighbors of `u`, including `u` itself.
+    values: np.array, the values of the row at `cols`.
+    """
+    nbs_u = indices[start[u]:start[u] + count[u]]
+    total = count[u] + 1
+    for w in nbs_u:
+        total += count[w] + 1
+
+    cols = np.empty(total, dtype=indices.dtype)
+    values = np.empty(total)
+    k = 0
+    for i in range(len(nbs_u) + 1):
+        w = nbs_u[i] if i < len(nbs_u) else u
+        a_uw = 1. / np.sqrt(degs[u] * degs[w])
+        nbs_w = indices[start[w]:start[w] + count[w]]
+        for j in range(len(nbs_w) + 1):
+            x = nbs_w[j] if j < len(nbs_w) else w
+            cols[k] = x
+            values[k] = a_uw / np.sqrt(degs[w] * degs[x])
+            k += 1
+
+    # sum up the values of the same column
+    out_cols = np.empty(total, dtype=indices.dtype)
+    out_values = np.zeros(total)
+    m = -1
+    for k in np.argsort(cols):
+        if m < 0 or out_cols[m] != cols[k]:
+            m += 1
+            out_cols[m] = cols[k]
+        out_values[m] += values[k]
+    return out_cols[:m + 1], out_values[:m + 1]
+
+
+@njit
+def row_value(cols, values, v):
+    """The value at column `v` of a row with sorted `cols`."""
+    pos = np.searchsorted(cols, v)
+    if pos < len(cols) and cols[pos] == v:
+        return values[pos]
+    return 0.
+
+
+@njit
+def new_degree(degs, x, edge, delta):
+    if x == edge[0] or x == edge[1]:
+        return degs[x] + delta
+    return degs[x]
+
+
+@njit
+def compute_new_a_hat_uv(start, count, indices, twohop_u, values_before, degs,
+                         potential_edges, u):
     """
     Compute the new values [A_hat_square]_u for every potential edge, where u is the target node. C.f. Theorem 5.1
     equation 17.
 
     Parameters
     ----------
-    edge_ixs: np.array, shape [E,2], where E is the number of edges in the graph.
-        The indices of the nodes connected by the edges in the input graph.
-    node_nb_ixs: np.array, shape [num_nodes,], dtype int
-        For each node, this gives the first index of edges associated to this node in the edge array (edge_ixs).
-        This will be used to quickly look up the neighbors of a node, since numba does not allow nested lists.
-    edges_set: set((e0, e1))
-        The set of edges in the input graph, i.e. e0 and e1 are two nodes connected by an edge
-    twohop_ixs: np.array, shape [T, 2], where T is the number of edges in A_tilde^2
-        The indices of nodes that are in the twohop neighborhood of each other, including self-loops.
-    values_before: np.array, shape [num_nodes,], the values in [A_hat]^2_uv to be updated.
-    degs: np.array, shape [num_nodes,], dtype int
-        The degree of the nodes in the input graph.
+    start, count, indices: np.array
+        The sorted neighbor rows of the input graph, without self-loops, see `SortedNeighbors`.
+    twohop_u: np.array, shape [T,]
+        The sorted indices of nodes that are in the twohop neighborhood of u, including u itself.
+    values_before: np.array, shape [T,], the values in [A_hat]^2_uv at `twohop_u` to be updated.
+    degs: np.array, shape [num_nodes,]
+        The degree of the nodes in the input graph (with self-loops).
     potential_edges: np.array, shape [P, 2], where P is the number of potential edges.
         The potential edges to be evaluated. For each of these potential edges, this function will compute the values
         in [A_hat]^2_uv that would result after inserting/removing this edge.
@@ -513,43 +714,41 @@ def compute_new_a_hat_uv(edge_ixs, node_nb_ixs, edges_set, twohop_ixs,
 
     Returns
     -------
-    return_ixs: List of tuples
+    rows, cols: np.array
         The ixs in the [P, num_nodes] matrix of updated values that have changed
-    return_values:
+    values: np.array
+        The updated values.
 
     """
-    num_nodes = degs.shape[0]
-
-    twohop_u = twohop_ixs[twohop_ixs[:, 0] == u, 1]
-    nbs_u = edge_ixs[edge_ixs[:, 0] == u, 1]
-    nbs_u_set = set(nbs_u)
-
-    return_ixs = []
+    return_rows = []
+    return_cols = []
     return_values = []
 
     for ix in range(len(potential_edges)):
         edge = potential_edges[ix]
-        edge_set = set(edge)
-        degs_new = degs.copy()
-        delta = -2 * ((edge[0], edge[1]) in edges_set) + 1
-        degs_new[edge] += delta
+        e0, e1 = edge[0], edge[1]
+        delta = -2 * has_edge(start, count, indices, e0, e1) + 1
+
+        nbs_edge0 = indices[start[e0]:start[e0] + count[e0]]
+        nbs_edge1 = indices[start[e1]:start[e1] + count[e1]]
 
-        nbs_edge0 = edge_ixs[edge_ixs[:, 0] == edge[0], 1]
-        nbs_edge1 = edge_ixs[edge_ixs[:, 0] == edge[1], 1]
+        affected_nodes = np.unique(np.concatenate((twohop_u, nbs_edge0, nbs_edge1, edge.astype(indices.dtype))))
+        a_um = has_edge(start, count, indices, u, e0)
+        a_un = has_edge(start, count, indices, u, e1)
 
-        affected_nodes = set(np.concatenate((twohop_u, nbs_edge0, nbs_edge1)))
-        affected_nodes = affected_nodes.union(edge_set)
-        a_um = edge[0] in nbs_u_set
-        a_un = edge[1] in nbs_u_set
+        a_un_after = connected_after(u, e0, a_un, delta)
+        a_um_after = connected_after(u, e1, a_um, delta)
 
-        a_un_after = connected_after(u, edge[0], a_un, delta)
-        a_um_after = connected_after(u, edge[1], a_um, delta)
+        degs_new_u = new_degree(degs, u, edge, delta)
+        degs_new_e0 = new_degree(degs, e0, edge, delta)
+        degs_new_e1 = new_degree(degs, e1, edge, delta)
+        u_in_edge = u == e0 or u == e1
 
         for v in affected_nodes:
-            a_uv_before = v in nbs_u_set
+            a_uv_before = has_edge(start, count, indices, u, v)
             a_uv_before_sl = a_uv_before or v == u
 
-            if v in edge_set and u in edge_set and u != v:
+            if (v == e0 or v == e1) and u_in_edge and u != v:
                 if delta == -1:
                     a_uv_after = False
                 else:
@@ -558,32 +757,29 @@ def compute_new_a_hat_uv(edge_ixs, node_nb_ixs, edges_set, twohop_ixs,
                 a_uv_after = a_uv_before
             a_uv_after_sl = a_uv_after or v == u
 
-            from_ix = node_nb_ixs[v]
-            to_ix = node_nb_ixs[v + 1] if v < num_nodes - 1 else len(edge_ixs)
-            node_nbs = edge_ixs[from_ix:to_ix, 1]
-            node_nbs_set = set(node_nbs)
-            a_vm_before = edge[0] in node_nbs_set
-
-            a_vn_before = edge[1] in node_nbs_set
-            a_vn_after = connected_after(v, edge[0], a_vn_before, delta)
-            a_vm_after = connected_after(v, edge[1], a_vm_before, delta)
+            a_vm_before = has_edge(start, count, indices, v, e0)
+            a_vn_before = has_edge(start, count, indices, v, e1)
+            a_vn_after = connected_after(v, e0, a_vn_before, delta)
+            a_vm_after = connected_after(v, e1, a_vm_before, delta)
 
-            mult_term = 1 / np.sqrt(degs_new[u] * degs_new[v])
+            degs_new_v = new_degree(degs, v, edge, delta)
+            mult_term = 1 / np.sqrt(degs_new_u * degs_new_v)
 
-            sum_term1 = np.sqrt(degs[u] * degs[v]) * values_before[v] - a_uv_before_sl / degs[u] - a_uv_before / \
+            sum_term1 = np.sqrt(degs[u] * degs[v]) * row_value(twohop_u, values_before, v) - a_uv_before_sl / degs[u] - a_uv_before / \
                 degs[v]
-            sum_term2 = a_uv_after / degs_new[v] + a_uv_after_sl / degs_new[u]
-            sum_term3 = -((a_um and a_vm_before) / degs[edge[0]]) + (
-                a_um_after and a_vm_after) / degs_new[edge[0]]
-            sum_term4 = -((a_un and a_vn_before) / degs[edge[1]]) + (
-                a_un_after and a_vn_after) / degs_new[edge[1]]
+            sum_term2 = a_uv_after / degs_new_v + a_uv_after_sl / degs_new_u
+            sum_term3 = -((a_um and a_vm_before) / degs[e0]) + (
+                a_um_after and a_vm_after) / degs_new_e0
+            sum_term4 = -((a_un and a_vn_before) / degs[e1]) + (
+                a_un_after and a_vn_after) / degs_new_e1
             new_val = mult_term * (sum_term1 + sum_term2 + sum_term3 +
                                    sum_term4)
 
-            return_ixs.append((ix, v))
+            return_rows.append(ix)
+            return_cols.append(v)
             return_values.append(new_val)
 
-    return return_ixs, return_values
+    return np.array(return_rows), np.array(return_cols), np.array(return_values)
 
 
 def compute_alpha(n, S_d, d_min):
@@ -4,7 +4,6 @@ from numba import njit
 import scipy.sparse as sp
 import scipy.linalg as spl
 
-import tensorflow as tf
 from graphgallery import functional as gf
 from graphgallery.attack.targeted import Common
 from graphgallery.attack.utils.estimate_utils import (
@@ -16,8 +15,6 @@ from ..targeted_attacker import TargetedAttacker
 @Common.register()
 class NodeEmbeddingAttack(TargetedAttacker):
     def process(self, K=50, reset=True):
-        self.nodes_set = set(range(self.num_nodes))
-
         deg_matrix = sp.diags(self.degree, dtype="float64")
         self.vals_org, self.vecs_org = sp.linalg.eigsh(
             self.graph.adj_matrix.astype('float64'), k=K, M=deg_matrix)
@@ -31,9 +28,18 @@ class NodeEmbeddingAttack(TargetedAttacker):
                dim=32,
                window_size=5,
                n_neg_samples=3,
+               method="eig",
                direct_attack=True,
                structure_attack=True,
                feature_attack=False):
+        """
+        `method` is the way to estimate the loss for the candidates, either
+        "eig", the loss after the change of the eigenvalues of each flip, or
+        "grad", the gradient of the loss w.r.t. the candidate edges,
+        both use only the `K` eigenpairs and the candidates.
+        """
+        if method not in ("eig", "grad"):
+            raise ValueError(f"Invalid argument of `method`, allowed ('eig', 'grad'), but got {method}.")
 
         super().attack(target, num_budgets, direct_attack, structure_attack,
                        feature_attack)
@@ -41,25 +47,30 @@ class NodeEmbeddingAttack(TargetedAttacker):
         num_nodes = self.num_nodes
         adj = self.graph.adj_matrix
 
+        nodes = np.arange(num_nodes)
         if direct_attack:
             influence_nodes = [target]
             candidates = np.column_stack(
-                (np.tile(target,
-                         num_nodes - 1), list(self.nodes_set - set([target]))))
+                (np.tile(target, num_nodes - 1), nodes[nodes != target]))
         else:
             influence_nodes = adj[target].indices
             candidates = np.row_stack([
                 np.column_stack((np.tile(infl, num_nodes - 2),
-                                 list(self.nodes_set - set([target, infl]))))
+                                 nodes[(nodes != target) & (nodes != infl)]))
                 for infl in influence_nodes
             ])
         if not self.allow_singleton:
             candidates = gf.singleton_filter(candidates, adj)
 
         delta_w = 1. - 2 * adj[candidates[:, 0], candidates[:, 1]].A1
-        loss_for_candidates = estimate_loss_with_delta_eigenvals(
-            candidates, delta_w, self.vals_org, self.vecs_org, self.num_nodes,
-            dim, window_size)
+        if method == "eig":
+            loss_for_candidates = estimate_loss_with_delta_eigenvals(
+                candidates, delta_w, self.vals_org, self.vecs_org, self.num_nodes,
+                dim, window_size)
+        else:
+            loss_for_candidates = estimate_loss_with_perturbation_gradient(
+                candidates, adj, window_size, dim, num_neg=n_neg_samples,
+                flip_indicator=delta_w, vals_org=self.vals_org, vecs_org=self.vecs_org)
 
         self.adj_flips = candidates[loss_for_candidates.argsort()
                                     [-num_budgets:]]
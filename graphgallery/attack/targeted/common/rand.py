@@ -1,8 +1,8 @@
-import random
 import numpy as np
 from graphgallery.utils import tqdm
 from graphgallery.attack.targeted import Common
 from ..targeted_attacker import TargetedAttacker
+from ...flip_set import random_flips
 
 
 @Common.register()
@@ -13,7 +13,6 @@ class RAND(TargetedAttacker):
         return self
 
     def process(self, reset=True):
-        self.nodes_set = set(range(self.num_nodes))
         if reset:
             self.reset()
         return self
@@ -43,57 +42,34 @@ class RAND(TargetedAttacker):
                   desc='Peturbing Graph',
                   disable=disable) as pbar:
             while chosen < self.num_budgets:
-
+                num_proposals = self.num_budgets - chosen
                 # randomly choose to add or remove edges
-                if np.random.rand() <= threshold:
-                    delta = 1.0
-                    edge = self.add_edge(influence_nodes)
-                else:
-                    delta = -1.0
-                    edge = self.del_edge(influence_nodes)
-
-                if edge is not None:
-                    adj_flips[edge] = chosen
-                    chosen += 1
-                    u, v = edge
-                    self.modified_degree[u] += delta
-                    self.modified_degree[v] += delta
-                    pbar.update(1)
+                num_adds = int((np.random.rand(num_proposals) <= threshold).sum())
+                added = self.propose(influence_nodes, num_adds, add=True)
+                removed = self.propose(influence_nodes, num_proposals - num_adds, add=False)
+                edges = np.vstack([added, removed])
+                deltas = np.hstack([np.ones(len(added)), -np.ones(len(removed))])
+                order = np.random.permutation(len(edges))
+
+                for (u, v), delta in zip(edges[order].tolist(), deltas[order].tolist()):
+                    if chosen >= self.num_budgets:
+                        break
+
+                    if delta < 0 and not self.allow_singleton and (self.modified_degree[u] <= 1
+                                                                   or self.modified_degree[v] <= 1):
+                        continue
+
+                    # the proposals may be duplicated
+                    if adj_flips.add(u, v, chosen):
+                        chosen += 1
+                        self.modified_degree[u] += delta
+                        self.modified_degree[v] += delta
+                        pbar.update(1)
 
         return self
 
-    def add_edge(self, influence_nodes):
-        u = random.choice(influence_nodes)
-        neighbors = self.graph.adj_matrix[u].indices.tolist()
-        potential_nodes = list(self.nodes_set - set(neighbors) -
-                               set([self.target, u]))
-
-        if len(potential_nodes) == 0:
-            return None
-
-        v = random.choice(potential_nodes)
-
-        if not self.is_modified(u, v):
-            return (u, v)
-        else:
-            return None
-
-    def del_edge(self, influence_nodes):
-
-        u = random.choice(influence_nodes)
-        neighbors = self.graph.adj_matrix[u].indices.tolist()
-        potential_nodes = list(set(neighbors) - set([self.target, u]))
-
-        if len(potential_nodes) == 0:
-            return None
-
-        v = random.choice(potential_nodes)
-
-        if not self.allow_singleton and (self.modified_degree[u] <= 1
-                                         or self.modified_degree[v] <= 1):
-            return None
-
-        if not self.is_modified(u, v):
-            return (u, v)
-        else:
-            return None
+    def propose(self, influence_nodes, size, add=True):
+        """Propose `size` random edges at once to add (`add=True`) or remove,
+        some of them are rejected so fewer edges may be returned."""
+        return random_flips(self.graph.adj_matrix, influence_nodes, size, add=add,
+                            flips=self.adj_flips, exclude=[self.target])
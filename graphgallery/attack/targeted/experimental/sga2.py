@@ -59,7 +59,6 @@ class SGA(TargetedAttacker):
         super().reset()
         # for the added self-loop
         self.selfloop_degree = (self.degree + 1.).astype(self.floatx)
-        self.adj_flips = {}
         self.pos_dict = None
         self.wrong_label = None
 
@@ -2,6 +2,7 @@ import numpy as np
 import graphgallery as gg
 from graphgallery import functional as gf
 from ..flip_attacker import FlipAttacker
+from ..flip_set import FlipSet
 
 
 class TargetedAttacker(FlipAttacker):
@@ -19,8 +20,8 @@ class TargetedAttacker(FlipAttacker):
         self.feature_attack = None
         self.direct_attack = None
 
-        self.nattr_flips = gf.BunchDict()
-        self.adj_flips = gf.BunchDict()
+        self.nattr_flips = FlipSet()
+        self.adj_flips = FlipSet(symmetric=True)
         self.is_reseted = True
         return self
 
@@ -2,3 +2,4 @@ from .fgsm import FGSM
 from .integrated_gradient_attack import IG
 from .iterative_gradient_attack import IGA
 from .sga import SGA
+from .batch_sga import BatchSGA
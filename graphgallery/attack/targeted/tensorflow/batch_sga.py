@@ -0,0 +1,75 @@
+from graphgallery import functional as gf
+from graphgallery.utils import tqdm
+from .sga import SGA
+
+__all__ = ["BatchSGA"]
+
+
+class BatchSGA:
+    """Run `SGA` on many targets with a single attacker.
+
+    The linearized weights `XW` of the surrogate, the compiled
+    propagation and the ego subgraphs of the targets (in an LRU cache)
+    are shared by all targets, and each target is attacked on its
+    relabeled subgraph, so the cost of each target is independent
+    of the size of the whole graph.
+
+    Example
+    -------
+    >>> batch = BatchSGA(graph, surrogate)
+    >>> flips = batch.attack(targets, direct_attack=True)
+    >>> flips[target].adj_flips
+    """
+
+    def __init__(self, graph, surrogate, device="cpu", seed=None, cache_size=1024):
+        """
+        Parameters
+        ----------
+        graph: Graph
+            The graph to be attacked.
+        surrogate: graphgallery.gallery.SGC
+            The trained surrogate model.
+        device: string
+            The device where the attacker running on.
+        seed: int, optional
+            The random seed of the attacker.
+        cache_size: int
+            The maximum number of cached ego subgraphs.
+        """
+        self.attacker = SGA(graph, device=device, seed=seed).process(surrogate,
+                                                                     cache_size=cache_size)
+
+    def attack(self, targets, num_budgets=None, disable=False, **kwargs):
+        """Attack each of the targets independently.
+
+        Parameters
+        ----------
+        targets: list of int
+            The target nodes.
+        num_budgets: int, float or None
+            The budget for each target, see `SGA.attack`.
+        disable: bool
+            Whether to disable the progress bar.
+        kwargs: other keyword arguments passed into `SGA.attack`.
+
+        Returns
+        -------
+        dict, mapping each target to a `BunchDict` with
+        `adj_flips`, i.e., the list of flipped edges.
+        """
+        attacker = self.attacker
+        # the logits of all targets by a single prediction
+        logits = attacker.surrogate.predict(targets)
+        results = {}
+        for target, logit in zip(tqdm(targets, desc='Attacking targets', disable=disable), logits):
+            target = int(target)
+            attacker.reset()
+            attacker.attack(target, num_budgets=num_budgets, logit=logit,
+                            disable=True, **kwargs)
+            results[target] = gf.BunchDict(adj_flips=list(attacker.adj_flips))
+        return results
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(cache_size={self.attacker.cache_size})"
+
+    __str__ = __repr__
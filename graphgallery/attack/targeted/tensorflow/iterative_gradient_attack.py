@@ -31,8 +31,6 @@ class IGA(TargetedAttacker):
     def reset(self):
         super().reset()
         self.target_index = None
-        self.adj_flips = []
-        self.nattr_flips = []
 
         with tf.device(self.device):
             self.modified_adj = tf.Variable(self.graph.adj_matrix.A,
@@ -1,5 +1,6 @@
 import numpy as np
 import tensorflow as tf
+from collections import OrderedDict
 from tensorflow.keras.losses import sparse_categorical_crossentropy
 
 import graphgallery as gg
@@ -12,7 +13,17 @@ from ..targeted_attacker import TargetedAttacker
 
 @TensorFlow.register()
 class SGA(TargetedAttacker):
-    def process(self, surrogate, reset=True):
+    def process(self, surrogate, cache_size=1024, reset=True):
+        """
+        Parameters
+        ----------
+        surrogate: graphgallery.gallery.SGC
+            The trained surrogate model.
+        cache_size: int
+            The maximum number of ego subgraphs cached for the attacked targets,
+            so that attacking the same targets again (e.g., with different budgets)
+            does not recompute them, by default 1024.
+        """
         assert isinstance(surrogate, gg.gallery.SGC), surrogate
 
         hops = surrogate.cfg.process.K  # NOTE: Be compatible with graphgallery
@@ -31,6 +42,9 @@ class SGA(TargetedAttacker):
             self.hops = hops
             self.loss_fn = sparse_categorical_crossentropy
             self.surrogate = surrogate
+
+        self.cache_size = cache_size
+        self.ego_cache = OrderedDict()
         if reset:
             self.reset()
         return self
@@ -39,7 +53,6 @@ class SGA(TargetedAttacker):
         super().reset()
         # for the added self-loop
         self.selfloop_degree = (self.degree + 1.).astype(self.floatx)
-        self.adj_flips = {}
         self.wrong_label = None
         return self
 
@@ -71,30 +84,36 @@ class SGA(TargetedAttacker):
                            desc='Peturbing Graph',
                            disable=disable):
                 edge_grad, non_edge_grad = self.compute_gradient(norm=False)
-                edge_grad *= (-2 * self.edge_weights + 1)
-                non_edge_grad *= (-2 * self.non_edge_weights + 1)
-                gradients = tf.concat([edge_grad, non_edge_grad], axis=0)
-                sorted_indices = tf.argsort(gradients, direction="DESCENDING")
-
-                for index in sorted_indices:
-                    if index < offset:
-                        u, v = self.edge_index[:, index]
-                        add = False
-                        if not self.allow_singleton and (
-                                self.selfloop_degree[u] <= 2
-                                or self.selfloop_degree[v] <= 2):
-                            continue
-                    else:
-                        index -= offset
-                        u, v = self.non_edge_index[:, index]
-                        add = True
-
-                    if not self.is_modified(u, v):
-                        self.adj_flips[(u, v)] = it
-                        self.update_subgraph(u, v, index, add=add)
-                        break
+                edge_grad = edge_grad.numpy() * (-2 * self.edge_weights + 1)
+                non_edge_grad = non_edge_grad.numpy() * (-2 * self.non_edge_weights + 1)
+                gradients = np.hstack([edge_grad, non_edge_grad])
+                valid = self.valid_candidates()
+                if not valid.any():
+                    continue
+
+                index = np.argmax(np.where(valid, gradients, -np.inf))
+                u, v = self.candidates[:, index]
+                if index < offset:
+                    add = False
+                else:
+                    index -= offset
+                    add = True
+
+                self.adj_flips[(u, v)] = it
+                self.update_subgraph(u, v, index, add=add)
         return self
 
+    def valid_candidates(self):
+        """The mask of candidate flips that are not modified,
+        and that do not lead to singleton nodes if not allowed."""
+        valid = self.candidate_mask & ~self.flipped
+        if not self.allow_singleton:
+            u, v = self.edge_index
+            degree = self.selfloop_degree
+            num_edges = u.shape[0]
+            valid[:num_edges] &= (degree[u] > 2) & (degree[v] > 2)
+        return valid
+
     def subgraph_preprocessing(self, reduced_nodes=None):
         target = self.target
         wrong_label = self.wrong_label
@@ -126,15 +145,15 @@ class SGA(TargetedAttacker):
             self.construct_sub_adj(influence_nodes, wrong_label_nodes,
                                    sub_nodes, sub_edges)
 
-    @tf.function
+    @tf.function(experimental_relax_shapes=True)
     def SGC_conv(self, XW, adj):
         return self.SGC([XW, adj])
 
     def compute_gradient(self, eps=5.0, norm=False):
 
-        edge_weights = self.edge_weights
-        non_edge_weights = self.non_edge_weights
-        self_loop_weights = self.self_loop_weights
+        edge_weights = tf.constant(self.edge_weights)
+        non_edge_weights = tf.constant(self.non_edge_weights)
+        self_loop_weights = tf.constant(self.self_loop_weights)
 
         if norm:
             edge_weights = normalize_GCN(self.edge_index, edge_weights,
@@ -155,17 +174,17 @@ class SGA(TargetedAttacker):
             ],
                 axis=0)
 
-            if norm:
-                adj = tf.sparse.SparseTensor(self.indices.T, weights,
-                                             self.graph.adj_matrix.shape)
-            else:
-                weights_norm = normalize_GCN(self.indices, weights,
-                                             self.selfloop_degree)
-                adj = tf.sparse.SparseTensor(self.indices.T, weights_norm,
-                                             self.graph.adj_matrix.shape)
-
-            output = self.SGC_conv(self.XW, adj)
-            logit = output[self.target] + self.b
+            num_nodes = self.nodes.shape[0]
+            if not norm:
+                weights = normalize_GCN(self.indices, weights,
+                                        self.selfloop_degree[self.nodes])
+            # the subgraph with relabeled nodes, so that the cost is
+            # independent of the size of the whole graph
+            adj = tf.sparse.SparseTensor(self.indices.T, weights,
+                                         (num_nodes, num_nodes))
+
+            output = self.SGC_conv(self.sub_XW, adj)
+            logit = output[self.sub_target] + self.b
             # model calibration
             logit = tf.nn.softmax(logit / eps)
             loss = self.loss_fn(self.target_label, logit) - self.loss_fn(
@@ -175,7 +194,14 @@ class SGA(TargetedAttacker):
         return gradients
 
     def ego_subgraph(self):
-        return gf.ego_graph(self.graph.adj_matrix, self.target, self.hops)
+        target = self.target
+        subgraph = self.ego_cache.pop(target, None)
+        if subgraph is None:
+            subgraph = gf.ego_graph(self.graph.adj_matrix, target, self.hops)
+        self.ego_cache[target] = subgraph
+        while len(self.ego_cache) > self.cache_size:
+            self.ego_cache.popitem(last=False)
+        return subgraph
 
     def construct_sub_adj(self, influence_nodes, wrong_label_nodes, sub_nodes,
                           sub_edges):
@@ -198,19 +224,33 @@ class SGA(TargetedAttacker):
         self_loop_weights = np.ones(nodes.shape[0], dtype=self.floatx)
         self_loop = np.row_stack([nodes, nodes])
 
-        self.indices = np.hstack([
+        indices = np.hstack([
             sub_edges, sub_edges[[1, 0]], potential_edges,
             potential_edges[[1, 0]], self_loop
         ])
-        self.edge_weights = tf.Variable(edge_weights, dtype=self.floatx)
-        self.non_edge_weights = tf.Variable(non_edge_weights,
-                                            dtype=self.floatx)
-        self.self_loop_weights = gf.astensor(self_loop_weights,
-                                             dtype=self.floatx)
+        # relabel the nodes of the subgraph as 0, 1, ..., len(nodes) - 1
+        self.indices = np.searchsorted(nodes, indices).astype('int64')
+        self.nodes = nodes
+        self.sub_target = np.searchsorted(nodes, self.target)
+        with tf.device(self.device):
+            self.sub_XW = tf.gather(self.XW, nodes)
+        self.edge_weights = edge_weights
+        self.non_edge_weights = non_edge_weights
+        self.self_loop_weights = self_loop_weights
         self.edge_index = sub_edges
         self.non_edge_index = potential_edges
         self.self_loop = self_loop
 
+        # all the candidate flips, i.e., the edges followed by the non-edges
+        self.candidates = np.hstack([sub_edges, potential_edges])
+        u, v = self.candidates
+        if self.direct_attack:
+            self.candidate_mask = (u != v) & ((u == self.target) | (v == self.target))
+        else:
+            self.candidate_mask = (u != v) & (u != self.target) & (v != self.target)
+        self.candidate_keys = np.minimum(u, v) * self.num_nodes + np.maximum(u, v)
+        self.flipped = np.zeros(u.shape[0], dtype=bool)
+
     def top_k_wrong_labels_nodes(self, k):
         with tf.device(self.device):
             _, non_edge_grad = self.compute_gradient(norm=True)
@@ -221,14 +261,16 @@ class SGA(TargetedAttacker):
 
     def update_subgraph(self, u, v, index, add=True):
         if add:
-            self.non_edge_weights[index].assign(1.0)
+            self.non_edge_weights[index] = 1.0
             degree_delta = 1.0
         else:
-            self.edge_weights[index].assign(0.0)
+            self.edge_weights[index] = 0.0
             degree_delta = -1.0
 
         self.selfloop_degree[u] += degree_delta
         self.selfloop_degree[v] += degree_delta
+        key = min(u, v) * self.num_nodes + max(u, v)
+        self.flipped |= self.candidate_keys == key
 
 
 def normalize_GCN(indices, weights, degree):
@@ -1,6 +1,5 @@
 import numpy as np
 import scipy.sparse as sp
-import scipy.linalg as spl
 from numba import njit
 
 from graphgallery import functional as gf
@@ -16,15 +15,12 @@ class NodeEmbeddingAttack(UntargetedAttacker):
     def process(self, K=100, reset=True):
         deg_matrix = sp.diags(self.degree, dtype="float64")
         adj = self.graph.adj_matrix.astype("float64")
-        # generalized eigenvalues/eigenvectors
-        # whether to use sparse form
-        if K:
-            self.vals_org, self.vecs_org = sp.linalg.eigsh(adj,
-                                                           k=K,
-                                                           M=deg_matrix)
-        else:
-            self.vals_org, self.vecs_org = spl.eigh(adj.toarray(),
-                                                    deg_matrix.A)
+        # generalized eigenvalues/eigenvectors, the sparse form is always used
+        # since the dense one takes O(N^2) memory, `K=None` means 100 eigenpairs
+        K = min(K or 100, self.num_nodes - 1)
+        self.vals_org, self.vecs_org = sp.linalg.eigsh(adj,
+                                                       k=K,
+                                                       M=deg_matrix)
         if reset:
             self.reset()
         return self
@@ -35,12 +31,21 @@ class NodeEmbeddingAttack(UntargetedAttacker):
                window_size=5,
                addition=False,
                removel=True,
+               method="eig",
                structure_attack=True,
                feature_attack=False):
+        """
+        `method` is the way to estimate the loss for the candidates, either
+        "eig", the loss after the change of the eigenvalues of each flip, or
+        "grad", the gradient of the loss w.r.t. the candidate edges,
+        both use only the `K` eigenpairs and the candidates.
+        """
 
         if not (addition or removel):
             raise RuntimeError(
                 'Either edge addition or removel setting should be used.')
+        if method not in ("eig", "grad"):
+            raise ValueError(f"Invalid argument of `method`, allowed ('eig', 'grad'), but got {method}.")
 
         super().attack(num_budgets, structure_attack, feature_attack)
         num_budgets = self.num_budgets
@@ -61,9 +66,14 @@ class NodeEmbeddingAttack(UntargetedAttacker):
 
         delta_w = 1. - 2 * adj[candidates[:, 0], candidates[:, 1]].A1
 
-        loss_for_candidates = estimate_loss_with_delta_eigenvals(
-            candidates, delta_w, self.vals_org, self.vecs_org, self.num_nodes,
-            dim, window_size)
+        if method == "eig":
+            loss_for_candidates = estimate_loss_with_delta_eigenvals(
+                candidates, delta_w, self.vals_org, self.vecs_org, self.num_nodes,
+                dim, window_size)
+        else:
+            loss_for_candidates = estimate_loss_with_perturbation_gradient(
+                candidates, adj, window_size, dim, flip_indicator=delta_w,
+                vals_org=self.vals_org, vecs_org=self.vecs_org)
 
         self.dim = dim
         self.adj_flips = candidates[loss_for_candidates.argsort()
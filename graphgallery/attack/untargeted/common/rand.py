@@ -1,14 +1,13 @@
-import random
 import numpy as np
 from graphgallery.utils import tqdm
 from graphgallery.attack.untargeted import Common
 from ..untargeted_attacker import UntargetedAttacker
+from ...flip_set import random_flips
 
 
 @Common.register()
 class RAND(UntargetedAttacker):
     def process(self, reset=True):
-        self.nodes_set = set(range(self.num_nodes))
         if reset:
             self.reset()
         return self
@@ -26,61 +25,42 @@ class RAND(UntargetedAttacker):
 
         super().attack(num_budgets, structure_attack, feature_attack)
 
-        influence_nodes = list(self.nodes_set)
-        adj_flips = self.adj_flips
+        influence_nodes = np.arange(self.num_nodes)
         random_list = np.random.choice(2, self.num_budgets) * 2 - 1
+        num_adds = int((random_list > 0).sum())
 
-        for remove_or_insert in tqdm(random_list,
-                                     desc='Peturbing Graph',
-                                     disable=disable):
-            if remove_or_insert > 0:
-                edge = self.add_edge(influence_nodes)
-                while edge is None:
-                    edge = self.add_edge(influence_nodes)
-
-            else:
-                edge = self.del_edge(influence_nodes)
-                while edge is None:
-                    edge = self.del_edge(influence_nodes)
-
-            adj_flips[edge] = 1.0
-            u, v = edge
-            self.modified_degree[u] += remove_or_insert
-            self.modified_degree[v] += remove_or_insert
+        with tqdm(total=self.num_budgets,
+                  desc='Peturbing Graph',
+                  disable=disable) as pbar:
+            self.sample_flips(influence_nodes, num_adds, add=True, pbar=pbar)
+            self.sample_flips(influence_nodes, self.num_budgets - num_adds, add=False, pbar=pbar)
         return self
 
-    def add_edge(self, influence_nodes):
-        u = random.choice(influence_nodes)
-        # assume that the graph has not self-loops
-        neighbors = self.graph.adj_matrix[u].indices.tolist()
-        potential_nodes = list(self.nodes_set - set(neighbors))
-
-        if len(potential_nodes) == 0:
-            return None
-
-        v = random.choice(potential_nodes)
-
-        if not self.is_modified(u, v):
-            return (u, v)
-        else:
-            return None
-
-    def del_edge(self, influence_nodes):
-        u = random.choice(influence_nodes)
+    def sample_flips(self, influence_nodes, num_flips, add=True, pbar=None):
+        adj_flips = self.adj_flips
+        delta = 1.0 if add else -1.0
+        chosen = 0
+        while chosen < num_flips:
+            edges = self.propose(influence_nodes, num_flips - chosen, add=add)
+            for u, v in edges.tolist():
+                if chosen >= num_flips:
+                    break
+
+                if not add and not self.allow_singleton and (self.modified_degree[u] <= 1
+                                                             or self.modified_degree[v] <= 1):
+                    continue
+
+                # the proposals may be duplicated
+                if adj_flips.add(u, v):
+                    chosen += 1
+                    self.modified_degree[u] += delta
+                    self.modified_degree[v] += delta
+                    if pbar is not None:
+                        pbar.update(1)
+
+    def propose(self, influence_nodes, size, add=True):
+        """Propose `size` random edges at once to add (`add=True`) or remove,
+        some of them are rejected so fewer edges may be returned."""
         # assume that the graph has not self-loops
-        neighbors = self.graph.adj_matrix[u].indices.tolist()
-        potential_nodes = neighbors
-
-        if len(potential_nodes) == 0:
-            return None
-
-        v = random.choice(potential_nodes)
-
-        if not self.allow_singleton and (self.modified_degree[u] <= 1
-                                         or self.modified_degree[v] <= 1):
-            return None
-
-        if not self.is_modified(u, v):
-            return (u, v)
-        else:
-            return None
+        return random_flips(self.graph.adj_matrix, influence_nodes, size, add=add,
+                            flips=self.adj_flips)
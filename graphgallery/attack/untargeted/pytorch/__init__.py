@@ -1,2 +1,4 @@
 from .metattack import Metattack
 from .pgd import PGD
+from .sparse_metattack import SparseMetattack
+from .sparse_pgd import SparsePGD
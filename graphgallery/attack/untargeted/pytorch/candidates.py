@@ -0,0 +1,83 @@
+"""Utilities for attacks whose perturbations live on a block of
+candidate node pairs instead of a dense N x N matrix.
+
+A node pair (u, v) with u < v is identified by its linear index in
+the (strict) upper triangle of the N x N adjacency matrix, i.e.,
+an integer in [0, N * (N - 1) / 2).
+"""
+import math
+import scipy.sparse as sp
+import torch
+
+__all__ = ["num_pairs", "index_to_pair", "pair_to_index",
+           "triu_index", "sample_pairs", "isin_sorted"]
+
+
+def num_pairs(num_nodes):
+    return num_nodes * (num_nodes - 1) // 2
+
+
+def index_to_pair(index, num_nodes):
+    """Convert linear indices of the upper triangle to (row, col) with row < col."""
+    n = num_nodes
+    index = index.double()
+    row = n - 2 - torch.floor(torch.sqrt(-8 * index + 4 * n * (n - 1) - 7) / 2.0 - 0.5)
+    col = index + row + 1 - n * (n - 1) / 2 + (n - row) * ((n - row) - 1) / 2
+    return row.long(), col.long()
+
+
+def pair_to_index(row, col, num_nodes):
+    """Convert (row, col) with row < col to linear indices of the upper triangle."""
+    return row * (2 * num_nodes - row - 1) // 2 + col - row - 1
+
+
+def triu_index(adj_matrix: sp.csr_matrix, device="cpu"):
+    """The sorted linear indices of the edges in the upper triangle of `adj_matrix`."""
+    triu = sp.triu(adj_matrix, k=1).tocoo()
+    row = torch.as_tensor(triu.row, dtype=torch.long, device=device)
+    col = torch.as_tensor(triu.col, dtype=torch.long, device=device)
+    return pair_to_index(row, col, adj_matrix.shape[0]).sort()[0]
+
+
+def sample_pairs(num_nodes, size, exclude=None, device="cpu", max_trials=10):
+    """Uniformly sample (at most) `size` unique node pairs,
+    returned as sorted linear indices of the upper triangle.
+
+    Parameters
+    ----------
+    num_nodes: int
+        The number of nodes.
+    size: int
+        The number of node pairs to sample.
+    exclude: torch.Tensor, optional
+        Sorted linear indices that must not be sampled.
+    device: str or torch.device
+        The device of the output.
+    max_trials: int
+        The maximum rounds of sampling, in case of duplicated samples.
+    """
+    total = num_pairs(num_nodes)
+    num_excluded = 0 if exclude is None else exclude.numel()
+    size = min(size, total - num_excluded)
+    index = torch.empty(0, dtype=torch.long, device=device)
+    for _ in range(max_trials):
+        if index.numel() >= size:
+            break
+        # oversample a bit to compensate for the duplicated and excluded ones
+        num_samples = math.ceil((size - index.numel()) * 1.1) + 1
+        new = torch.randint(total, (num_samples,), device=device)
+        if exclude is not None and num_excluded:
+            new = new[~isin_sorted(new, exclude)]
+        index = torch.cat([index, new]).unique()
+
+    if index.numel() > size:
+        index = index[torch.randperm(index.numel(), device=device)[:size]].sort()[0]
+    return index
+
+
+def isin_sorted(elements, sorted_elements):
+    """Whether each of `elements` is in the 1D sorted tensor `sorted_elements`."""
+    if sorted_elements.numel() == 0:
+        return torch.zeros_like(elements, dtype=torch.bool)
+    pos = torch.searchsorted(sorted_elements, elements).clamp_(max=sorted_elements.numel() - 1)
+    return sorted_elements[pos] == elements
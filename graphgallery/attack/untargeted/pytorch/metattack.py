@@ -15,7 +15,7 @@ from torch.nn.parameter import Parameter
 
 import graphgallery as gg
 from graphgallery import functional as gf
-from graphgallery.utils import tqdm
+from graphgallery.utils import tqdm, timer
 from graphgallery.nn.init.pytorch import glorot_uniform, zeros
 # from graphadv.utils.graph_utils import likelihood_ratio_filter
 from graphgallery.attack.untargeted import PyTorch
@@ -48,9 +48,7 @@ class BaseMeta(UntargetedAttacker):
         self.self_training_labels = gf.astensor(self_training_labels,
                                                 dtype=self.intx,
                                                 device=self.device)
-        self.adj_tensor = gf.astensor(self.graph.adj_matrix.A,
-                                      dtype=self.floatx,
-                                      device=self.device)
+        self.process_adj()
         self.x_tensor = gf.astensor(self.graph.node_attr,
                                     dtype=self.floatx,
                                     device=self.device)
@@ -65,10 +63,13 @@ class BaseMeta(UntargetedAttacker):
             self.reset()
         return self
 
+    def process_adj(self):
+        self.adj_tensor = gf.astensor(self.graph.adj_matrix.A,
+                                      dtype=self.floatx,
+                                      device=self.device)
+
     def reset(self):
         super().reset()
-        self.adj_flips = []
-        self.nattr_flips = []
         self.adj_changes = Parameter(torch.zeros_like(self.adj_tensor)).to(self.device)
         self.x_changes = Parameter(torch.zeros_like(self.x_tensor)).to(self.device)
         return self
@@ -158,12 +159,34 @@ class Metattack(BaseMeta):
                 momentum=0.9,
                 lambda_=0.,
                 use_relu=True,
+                warm_start=False,
+                warm_epochs=None,
+                truncation=None,
                 reset=True):
+        """
+        Parameters
+        ----------
+        warm_start: bool
+            Whether to continue the inner training from the weights of
+            the previous perturbation step, instead of training from
+            scratch at each step, by default False.
+        warm_epochs: int, optional
+            The number of inner training epochs of the warm-started steps,
+            by default None, i.e., `epochs`. Only used when `warm_start=True`.
+        truncation: int, optional
+            The number of the last inner training epochs the meta-gradients
+            are backpropagated through, by default None, i.e., all the epochs.
+        """
 
         self.lr = lr
         self.epochs = epochs
         self.momentum = momentum
         self.lambda_ = lambda_
+        self.warm_start = warm_start
+        self.warm_epochs = epochs if warm_epochs is None else warm_epochs
+        self.truncation = truncation
+        self.inner_trained = False
+        self.timings = gf.BunchDict()
 
         if lambda_ not in (0., 0.5, 1.):
             raise ValueError(
@@ -198,23 +221,37 @@ class Metattack(BaseMeta):
             glorot_uniform(w)
             zeros(wv)
 
+        self._detach()
+
+    def _detach(self):
         for ix in range(len(self.weights)):
             self.weights[ix] = self.weights[ix].detach()
             self.w_velocities[ix] = self.w_velocities[ix].detach()
             self.weights[ix].requires_grad = True
 
     def inner_train(self, x, adj):
-        self._initialize()
+        if self.warm_start and self.inner_trained:
+            # continue from the weights of the previous perturbation step
+            self._detach()
+            epochs = self.warm_epochs
+        else:
+            self._initialize()
+            epochs = self.epochs
+
+        self.inner_trained = True
         train_nodes = self.train_nodes
         train_labels = self.labels_train
+        # the first `epochs - truncation` epochs are not recorded by autograd
+        truncation = epochs if self.truncation is None else min(self.truncation, epochs)
 
-        for it in range(self.epochs):
+        for it in range(epochs):
+            create_graph = it >= epochs - truncation
             output = self.forward(x, adj)
             loss = self.loss_fn(output[train_nodes], train_labels)
 
             weight_grads = torch.autograd.grad(loss,
                                                self.weights,
-                                               create_graph=True)
+                                               create_graph=create_graph)
 
             self.w_velocities = [
                 self.momentum * v + g
@@ -225,6 +262,9 @@ class Metattack(BaseMeta):
                 w - self.lr * v for w, v in zip(self.weights, self.w_velocities)
             ]
 
+            if not create_graph:
+                self._detach()
+
     def meta_grad(self, x, adj, calibration=1.0):
 
         output = self.forward(x, adj) / calibration
@@ -243,13 +283,29 @@ class Metattack(BaseMeta):
 
         return x_grad, adj_grad
 
+    def timer(self, phase):
+        """Accumulate the elapsed seconds of `phase` into `self.timings`."""
+        sync = torch.cuda.synchronize if "cuda" in str(self.device) else None
+        return timer(self.timings, phase, sync=sync)
+
     def attack(self,
                num_budgets=0.05,
                structure_attack=True,
                feature_attack=False,
                ll_constraint=False,
                ll_cutoff=0.004,
+               flips_per_step=1,
                disable=False):
+        """
+        Parameters
+        ----------
+        flips_per_step: int
+            The number of flips selected greedily from
+            each meta-gradient evaluation, by default 1.
+
+        The elapsed seconds of each phase ('perturb', 'inner_train',
+        'meta_grad' and 'score') are recorded in `self.timings`.
+        """
 
         super().attack(num_budgets, structure_attack, feature_attack)
 
@@ -270,44 +326,112 @@ class Metattack(BaseMeta):
         adj_flips, nattr_flips = self.adj_flips, self.nattr_flips
 
         self.inner_train(modified_nx, modified_adj)
-
-        for it in tqdm(range(self.num_budgets),
-                       desc='Peturbing Graph',
-                       disable=disable):
-
-            if structure_attack:
-                modified_adj = self.get_perturbed_adj(adj_tensor, adj_changes)
-
-            if feature_attack:
-                modified_nx = self.get_perturbed_x(x_tensor, x_changes)
-
-            adj_norm = gf.normalize_adj_tensor(modified_adj)
-
-            self.inner_train(modified_nx, adj_norm)
-
-            x_grad, adj_grad = self.meta_grad(modified_nx, adj_norm)
-
-            x_meta_score = torch.tensor(0.0)
-            adj_meta_score = torch.tensor(0.0)
-
-            if structure_attack:
-                adj_meta_score = self.structure_score(modified_adj, adj_grad,
-                                                      ll_constraint, ll_cutoff)
-            if feature_attack:
-                x_meta_score = self.feature_score(modified_nx, x_grad)
-
-            if adj_meta_score.max() >= x_meta_score.max():
-                adj_meta_argmax = torch.argmax(adj_meta_score)
-                row, col = unravel_index(adj_meta_argmax, self.num_nodes)
-                self.adj_changes.data[row][col] += -2 * modified_adj[row][col] + 1
-                self.adj_changes.data[col][row] += -2 * modified_adj[row][col] + 1
-                adj_flips.append((row, col))
-
+        self.inner_trained = False
+        self.timings = gf.BunchDict()
+
+        num_flips = 0
+        with tqdm(total=self.num_budgets,
+                  desc='Peturbing Graph',
+                  disable=disable) as pbar:
+            while num_flips < self.num_budgets:
+
+                with self.timer('perturb'):
+                    if structure_attack:
+                        modified_adj = self.get_perturbed_adj(adj_tensor, adj_changes)
+
+                    if feature_attack:
+                        modified_nx = self.get_perturbed_x(x_tensor, x_changes)
+
+                    adj_norm = gf.normalize_adj_tensor(modified_adj)
+
+                with self.timer('inner_train'):
+                    self.inner_train(modified_nx, adj_norm)
+
+                with self.timer('meta_grad'):
+                    x_grad, adj_grad = self.meta_grad(modified_nx, adj_norm)
+
+                with self.timer('score'):
+                    adj_meta_score = x_meta_score = None
+
+                    if structure_attack:
+                        adj_meta_score = self.structure_score(modified_adj, adj_grad,
+                                                              ll_constraint, ll_cutoff)
+                    if feature_attack:
+                        x_meta_score = self.feature_score(modified_nx, x_grad)
+
+                    k = min(flips_per_step, self.num_budgets - num_flips)
+                    flips = self.select_flips(modified_adj, adj_meta_score, x_meta_score, k)
+
+                for is_adj, row, col in flips:
+                    if is_adj:
+                        self.adj_changes.data[row][col] += -2 * modified_adj[row][col] + 1
+                        self.adj_changes.data[col][row] += -2 * modified_adj[row][col] + 1
+                        adj_flips.append((row, col))
+                    else:
+                        self.x_changes.data[row][col] += -2 * modified_nx[row][col] + 1
+                        nattr_flips.append((row, col))
+
+                num_flips += len(flips)
+                pbar.update(len(flips))
+
+                if not flips:
+                    # no more valid flips
+                    break
+
+    def select_flips(self, modified_adj, adj_meta_score, x_meta_score, k):
+        """Greedily select the top-`k` flips from the meta scores,
+        skipping the edge flips that would lead to singleton nodes
+        after the previously selected flips.
+
+        Returns
+        -------
+        list of (is_adj, row, col)
+        """
+        if k == 1:
+            # equivalent to the original one-flip-per-step Metattack
+            adj_max = adj_meta_score.max() if adj_meta_score is not None else None
+            x_max = x_meta_score.max() if x_meta_score is not None else None
+            if x_max is None or (adj_max is not None and adj_max >= x_max):
+                row, col = unravel_index(torch.argmax(adj_meta_score), self.num_nodes)
+                return [(True, row, col)]
+            row, col = unravel_index(torch.argmax(x_meta_score), self.num_attrs)
+            return [(False, row, col)]
+
+        scores = []
+        if adj_meta_score is not None:
+            # the scores are symmetric, each edge is included twice
+            values, indices = torch.topk(adj_meta_score, min(4 * k, adj_meta_score.numel()))
+            scores.extend(zip(values.tolist(), [True] * len(values), indices.tolist()))
+        if x_meta_score is not None:
+            values, indices = torch.topk(x_meta_score, min(k, x_meta_score.numel()))
+            scores.extend(zip(values.tolist(), [False] * len(values), indices.tolist()))
+
+        # prefer edge flips in case of ties
+        scores.sort(key=lambda item: (-item[0], not item[1]))
+        degrees = modified_adj.sum(0).tolist()
+        selected, flips = set(), []
+        for _, is_adj, index in scores:
+            if len(flips) >= k:
+                break
+            if not is_adj:
+                flips.append((False, *unravel_index(index, self.num_attrs)))
+                continue
+
+            row, col = unravel_index(index, self.num_nodes)
+            edge = (min(row, col), max(row, col))
+            if edge in selected:
+                continue
+            if modified_adj[row][col] > 0:
+                if degrees[row] <= 1 or degrees[col] <= 1:
+                    continue
+                degrees[row] -= 1
+                degrees[col] -= 1
             else:
-                x_meta_argmax = torch.argmax(x_meta_score)
-                row, col = unravel_index(x_meta_argmax, self.num_attrs)
-                self.x_changes.data[row][col] += -2 * modified_nx[row][col] + 1
-                nattr_flips.append((row, col))
+                degrees[row] += 1
+                degrees[col] += 1
+            selected.add(edge)
+            flips.append((True, row, col))
+        return flips
 
 
 def unravel_index(index, shape):
@@ -8,6 +8,7 @@ from graphgallery import functional as gf
 from graphgallery.utils import tqdm
 from graphgallery.attack.untargeted import PyTorch
 from graphgallery.attack.untargeted.untargeted_attacker import UntargetedAttacker
+from .candidates import index_to_pair, triu_index, isin_sorted
 
 
 @PyTorch.register()
@@ -32,14 +33,11 @@ class PGD(UntargetedAttacker):
             victim_nodes = np.hstack([train_nodes, unlabeled_nodes])
             victim_labels = np.hstack([self.graph.node_label[train_nodes], self_training_labels])
 
-        adj_tensor = gf.astensor(self.graph.adj_matrix.A, device=self.device)
         self.victim_nodes = gf.astensor(victim_nodes, device=self.device)
         self.victim_labels = gf.astensor(victim_labels, device=self.device)
-        self.adj_tensor = adj_tensor
         self.x_tensor = gf.astensor(self.graph.node_attr, device=self.device)
-        self.complementary = (torch.ones_like(adj_tensor) - torch.eye(self.num_nodes).to(self.device) - 2. * adj_tensor)
+        self.process_adj()
         self.loss_fn = nn.CrossEntropyLoss()
-        self.adj_changes = nn.Parameter(torch.zeros_like(self.adj_tensor))
         self.surrogate = surrogate.model.to(self.device)
         self.surrogate.eval()
 
@@ -51,6 +49,24 @@ class PGD(UntargetedAttacker):
             self.reset()
         return self
 
+    def process_adj(self):
+        adj_tensor = gf.astensor(self.graph.adj_matrix.A, device=self.device)
+        self.adj_tensor = adj_tensor
+        self.complementary = (torch.ones_like(adj_tensor) - torch.eye(self.num_nodes).to(self.device) - 2. * adj_tensor)
+        self.adj_changes = nn.Parameter(torch.zeros_like(self.adj_tensor))
+        # only the upper triangle of `adj_changes` is used
+        self.triu_mask = torch.ones_like(adj_tensor, dtype=torch.bool).triu_(diagonal=1)
+        self.process_edges()
+
+    def process_edges(self):
+        """The sparse edges of the clean graph, used to build the sampled graphs."""
+        adj_matrix = self.graph.adj_matrix.tocsr(copy=False)
+        edge_index, edge_weight = gf.sparse_adj_to_edge(adj_matrix)
+        self.edge_index = torch.as_tensor(edge_index, dtype=torch.long, device=self.device)
+        self.edge_weight = gf.astensor(edge_weight, device=self.device)
+        # sorted linear indices of the edges in the upper triangle
+        self.edge_triu = triu_index(adj_matrix, device=self.device)
+
     def reset(self):
         super().reset()
         self.adj_changes.data.zero_()
@@ -63,6 +79,7 @@ class PGD(UntargetedAttacker):
     def attack(self,
                num_budgets=0.05,
                sample_epochs=20,
+               sample_batch_size=None,
                C=None,
                CW_loss=False,
                epochs=200,
@@ -87,8 +104,7 @@ class PGD(UntargetedAttacker):
             self.adj_changes.data.add_(lr * gradients)
             self.projection()
 
-        best_s = self.random_sample(sample_epochs, disable=disable)
-        self.adj_flips = np.transpose(np.where(best_s > 0.))
+        self.adj_flips = self.random_sample(sample_epochs, batch_size=sample_batch_size, disable=disable)
         return self
 
     def compute_gradients(self, victim_nodes):
@@ -98,10 +114,11 @@ class PGD(UntargetedAttacker):
         return gradients[0]
 
     def compute_loss(self, victim_nodes):
-        adj = self.get_perturbed_adj()
-        adj_norm = gf.normalize_adj_tensor(adj)
+        adj_norm = self.get_normalized_adj()
         logit = self.surrogate(self.x_tensor, adj_norm)[victim_nodes]
+        return self.loss_from_logit(logit)
 
+    def loss_from_logit(self, logit):
         if self.CW_loss:
             logit = F.log_softmax(logit, dim=1)
             best_wrong_class = (logit - 1000 * self.label_matrix).argmax(1)
@@ -120,62 +137,122 @@ class PGD(UntargetedAttacker):
         adj = self.complementary * adj_changes + self.adj_tensor
         return adj
 
+    def get_normalized_adj(self):
+        return gf.normalize_adj_tensor(self.get_perturbed_adj())
+
     def projection(self):
-        clipped_matrix = self.clip(self.adj_changes)
-        num_modified = clipped_matrix.sum()
-
-        if num_modified > self.num_budgets:
-            left = (self.adj_changes - 1.).min()
-            right = self.adj_changes.max()
-            miu = self.bisection(left, right, epsilon=1e-5)
-            clipped_matrix = self.clip(self.adj_changes - miu)
-        else:
-            pass
-
-        self.adj_changes.data.copy_(clipped_matrix)
-
-    def bisection(self, a, b, epsilon):
-        def func(x):
-            clipped_matrix = self.clip(self.adj_changes - x)
-            return clipped_matrix.sum() - self.num_budgets
-
-        miu = a
-        while (b - a) > epsilon:
-            miu = (a + b) / 2
-            # Check if middle point is root
-            if func(miu) == 0:
-                break
-            # Decide the side to repeat the steps
-            if func(miu) * func(a) < 0:
-                b = miu
-            else:
-                a = miu
-        return miu
+        changes = self.adj_changes.data[self.triu_mask]
+        self.adj_changes.data[self.triu_mask] = budget_projection(changes, self.num_budgets)
 
     def clip(self, matrix):
         clipped_matrix = torch.clamp(matrix, 0., 1.)
         return clipped_matrix
 
-    def random_sample(self, sample_epochs=20, disable=False):
-        best_loss = -10000
-        best_s = None
-        s = torch.triu(self.adj_changes, diagonal=1)
-        _one = torch.tensor(1.).to(self.device)
-        _zero = torch.tensor(0.).to(self.device)
+    def perturbation_probs(self):
+        """The perturbations of the node pairs as a vector,
+        i.e., the upper triangle of `adj_changes`, in row-major order."""
+        return self.adj_changes.data[self.triu_mask]
+
+    def flip_pairs(self, flips):
+        """The node pairs `(row, col)` of the positions `flips` in `perturbation_probs`,
+        with the signs `+1` for adding an edge and `-1` for removing an edge."""
+        row, col = index_to_pair(flips, self.num_nodes)
+        sign = 1. - 2. * isin_sorted(flips, self.edge_triu).float()
+        return row, col, sign
+
+    def random_sample(self, sample_epochs=20, batch_size=None, disable=False):
+        flips = self.sample_best(self.perturbation_probs(), sample_epochs,
+                                 batch_size=batch_size, disable=disable)
+        row, col, _ = self.flip_pairs(flips)
+        return torch.stack([row, col], dim=1).cpu().numpy()
+
+    @torch.no_grad()
+    def sample_best(self, probs, sample_epochs=20, batch_size=None, disable=False):
+        """Draw `sample_epochs` Bernoulli samples of the perturbations `probs`,
+        and return the flipped positions of the sample within the budget
+        with the largest loss.
+        Each sample is kept as its flipped positions only, and the samples are
+        evaluated by the surrogate in batches of `batch_size`
+        (by default all at once) as a block-diagonal graph."""
+        batch_size = batch_size or sample_epochs
+        best_loss, best_flips = -float('inf'), None
+        batch = []
         for it in tqdm(range(sample_epochs),
                        desc='Random Sampling',
                        disable=disable):
-            random_matrix = torch.zeros_like(s).uniform_(0, 1)
-            sampled = torch.where(s > random_matrix, _one, _zero)
-            if sampled.sum() > self.num_budgets:
-                continue
-
-            self.adj_changes.data.copy_(sampled)
-            loss = self.compute_loss(self.victim_nodes)
-
-            if best_loss < loss:
-                best_loss = loss
-                best_s = sampled
-                
-        assert best_s is not None, "Something wrong"
-        return best_s.detach().cpu().numpy()
+            flips = torch.bernoulli(probs).nonzero().view(-1)
+            if flips.numel() <= self.num_budgets:
+                batch.append(flips)
+
+            if batch and (len(batch) == batch_size or it == sample_epochs - 1):
+                losses = self.batch_loss(batch)
+                best = losses.argmax().item()
+                if best_loss < losses[best].item():
+                    best_loss, best_flips = losses[best].item(), batch[best]
+                batch = []
+
+        assert best_flips is not None, "Something wrong"
+        return best_flips
+
+    def batch_loss(self, batch):
+        """The losses of the graphs perturbed by each flips in `batch`,
+        evaluated with a single forward pass of the surrogate."""
+        N = self.num_nodes
+        edge_index, edge_weight = [], []
+        for i, flips in enumerate(batch):
+            edges, weights = gf.normalize_edge_tensor(*self.sample_edges(flips), num_nodes=N)
+            edge_index.append(edges + i * N)
+            edge_weight.append(weights)
+
+        B = len(batch)
+        adj = torch.sparse_coo_tensor(torch.cat(edge_index, dim=1),
+                                      torch.cat(edge_weight),
+                                      (B * N, B * N)).coalesce()
+        x = self.x_tensor.repeat(B, 1)
+        logits = self.surrogate(x, adj).view(B, N, -1)[:, self.victim_nodes]
+        return torch.stack([self.loss_from_logit(logit) for logit in logits])
+
+    def sample_edges(self, flips):
+        """The (unnormalized) edges of the clean graph with the node pairs
+        at positions `flips` flipped, where a removed edge is cancelled
+        by an edge with negative weight."""
+        row, col, sign = self.flip_pairs(flips)
+        edge_index = torch.cat([self.edge_index,
+                                torch.stack([row, col]),
+                                torch.stack([col, row])], dim=1)
+        edge_weight = torch.cat([self.edge_weight, sign, sign])
+        return edge_index, edge_weight
+
+
+def budget_projection(x, budget):
+    """Exact projection of `x` onto `{s: 0 <= s <= 1, sum(s) <= budget}`,
+    i.e., `clip(x - mu, 0, 1)`, where `mu = 0` if the budget is not exceeded,
+    otherwise `mu > 0` solves `sum(clip(x - mu, 0, 1)) = budget`.
+
+    The piecewise linear function `g(mu) = sum(clip(x - mu, 0, 1))` is evaluated
+    at all the breakpoints `x_i` and `x_i - 1` at once by the prefix sums of
+    the sorted entries, so that `mu` is found in a single O(n log n) pass
+    instead of bisection.
+    """
+    clipped = x.clamp(0., 1.)
+    if clipped.sum() <= budget:
+        return clipped
+
+    # only the positive entries are nonzero for `mu > 0`
+    a = x[x > 0].double().sort()[0]
+    n = a.numel()
+    prefix = torch.cat([a.new_zeros(1), a.cumsum(0)])
+    mu = torch.cat([a.new_zeros(1), a, a - 1.]).clamp_min(0.).unique()
+
+    # entries in (mu, mu + 1) contribute `x_i - mu`, entries >= mu + 1 contribute 1
+    lo = torch.searchsorted(a, mu, right=True)
+    hi = torch.searchsorted(a, mu + 1.)
+    g = (n - hi) + (prefix[hi] - prefix[lo]) - mu * (hi - lo)
+
+    # `g` is non-increasing, find the first breakpoint with `g <= budget`
+    k = torch.searchsorted(-g, torch.tensor([-float(budget)], dtype=g.dtype, device=g.device)).item()
+    k = min(max(k, 1), mu.numel() - 1)
+    g0, g1 = g[k - 1], g[k]
+    mu0, mu1 = mu[k - 1], mu[k]
+    miu = mu0 + (g0 - budget) * (mu1 - mu0) / (g0 - g1).clamp_min(1e-12)
+    return (x - miu.to(x.dtype)).clamp(0., 1.)
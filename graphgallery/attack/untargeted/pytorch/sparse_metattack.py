@@ -0,0 +1,168 @@
+import torch
+from torch.nn import functional as F
+from torch.nn.parameter import Parameter
+
+from graphgallery import functional as gf
+from graphgallery.utils import tqdm
+from graphgallery.attack.untargeted import PyTorch
+from ..untargeted_attacker import UntargetedAttacker
+from .metattack import Metattack
+from .candidates import index_to_pair, triu_index, sample_pairs, isin_sorted
+
+
+@PyTorch.register()
+class SparseMetattack(Metattack):
+    """Metattack whose meta-gradients are computed on a block of
+        `block_size` candidate node pairs, resampled at each perturbation step,
+        instead of the dense N x N perturbation matrix.
+        The perturbed graph is kept as an edge list, and the surrogate
+        propagates messages along the edges, so that the memory is
+        O(|E| + block_size) for each unrolled training step.
+
+        Only structure attack is supported.
+    """
+    _allow_feature_attack = False
+
+    def process_adj(self):
+        # sorted linear indices of the edges in the upper triangle
+        self.edge_triu = triu_index(self.graph.adj_matrix, device=self.device)
+        self.adj_tensor = None
+
+    def reset(self):
+        UntargetedAttacker.reset(self)
+        # the edges of the perturbed graph and the flipped node pairs
+        self.modified_triu = self.edge_triu.clone()
+        self.flipped_triu = self.edge_triu.new_empty(0)
+        self.adj_changes = None
+        self.x_changes = None
+        return self
+
+    def forward(self, x, adj):
+        edge_index, edge_weight = adj
+        h = x
+        for w in self.weights[:-1]:
+            h = propagate(h @ w, edge_index, edge_weight)
+            if self.use_relu:
+                h = F.relu(h)
+
+        return propagate(h @ self.weights[-1], edge_index, edge_weight)
+
+    def get_perturbed_adj(self, row, col, is_edge):
+        """The normalized edges of the perturbed graph, where the weights of the
+        candidate node pairs `(row, col)` are linear in `self.adj_changes`."""
+        N = self.num_nodes
+        edge_row, edge_col = index_to_pair(self.modified_triu, N)
+        # +1 for adding an edge and -1 for removing an edge
+        weight = (1. - 2. * is_edge.float()) * self.adj_changes
+        edge_index = torch.cat([torch.stack([edge_row, edge_col]),
+                                torch.stack([edge_col, edge_row]),
+                                torch.stack([row, col]),
+                                torch.stack([col, row])], dim=1)
+        edge_weight = torch.cat([weight.new_ones(2 * edge_row.numel()), weight, weight])
+        return gf.normalize_edge_tensor(edge_index, edge_weight, num_nodes=N)
+
+    def structure_score(self, row, col, is_edge, adj_grad):
+        # the signs of flips are already included in `adj_grad`
+        adj_meta_grad = adj_grad - adj_grad.min()
+        # Set entries to 0 that could lead to singleton nodes.
+        edge_row, edge_col = index_to_pair(self.modified_triu, self.num_nodes)
+        degrees = torch.bincount(torch.cat([edge_row, edge_col]), minlength=self.num_nodes)
+        singleton = is_edge & ((degrees[row] <= 1) | (degrees[col] <= 1))
+        adj_meta_grad[singleton] = 0.
+        return adj_meta_grad
+
+    def attack(self,
+               num_budgets=0.05,
+               block_size=10000,
+               flips_per_step=1,
+               structure_attack=True,
+               feature_attack=False,
+               disable=False):
+
+        UntargetedAttacker.attack(self, num_budgets, structure_attack, feature_attack)
+
+        x_tensor = self.x_tensor
+        adj_flips = self.adj_flips
+        self.inner_trained = False
+        self.timings = gf.BunchDict()
+
+        num_flips = 0
+        with tqdm(total=self.num_budgets,
+                  desc='Peturbing Graph',
+                  disable=disable) as pbar:
+            while num_flips < self.num_budgets:
+
+                with self.timer('perturb'):
+                    candidates = sample_pairs(self.num_nodes, block_size,
+                                              exclude=self.flipped_triu, device=self.device)
+                    row, col = index_to_pair(candidates, self.num_nodes)
+                    is_edge = isin_sorted(candidates, self.modified_triu)
+                    self.adj_changes = Parameter(torch.zeros(candidates.numel(), device=self.device))
+
+                    adj_norm = self.get_perturbed_adj(row, col, is_edge)
+
+                with self.timer('inner_train'):
+                    self.inner_train(x_tensor, adj_norm)
+
+                with self.timer('meta_grad'):
+                    _, adj_grad = self.meta_grad(x_tensor, adj_norm)
+
+                with self.timer('score'):
+                    adj_meta_score = self.structure_score(row, col, is_edge, adj_grad)
+                    k = min(flips_per_step, self.num_budgets - num_flips)
+                    flips = self._select_block_flips(row, col, is_edge, adj_meta_score, k)
+
+                for ix in flips:
+                    self.flip_edge(candidates[ix], is_edge[ix])
+                    adj_flips.append((row[ix].item(), col[ix].item()))
+
+                num_flips += len(flips)
+                pbar.update(len(flips))
+
+                if not flips:
+                    # no more valid flips
+                    break
+
+        self.adj_changes = None
+        return self
+
+    def _select_block_flips(self, row, col, is_edge, adj_meta_score, k):
+        """Greedily select the top-`k` candidates,
+        skipping the ones that would lead to singleton nodes
+        after the previously selected flips."""
+        if k == 1:
+            return [torch.argmax(adj_meta_score).item()]
+
+        edge_row, edge_col = index_to_pair(self.modified_triu, self.num_nodes)
+        degrees = torch.bincount(torch.cat([edge_row, edge_col]), minlength=self.num_nodes).tolist()
+        _, indices = torch.topk(adj_meta_score, min(2 * k, adj_meta_score.numel()))
+        flips = []
+        for ix in indices.tolist():
+            if len(flips) >= k:
+                break
+            u, v = row[ix].item(), col[ix].item()
+            if is_edge[ix]:
+                if degrees[u] <= 1 or degrees[v] <= 1:
+                    continue
+                degrees[u] -= 1
+                degrees[v] -= 1
+            else:
+                degrees[u] += 1
+                degrees[v] += 1
+            flips.append(ix)
+        return flips
+
+    def flip_edge(self, index, is_edge):
+        index = index.view(1)
+        if is_edge:
+            self.modified_triu = self.modified_triu[self.modified_triu != index]
+        else:
+            self.modified_triu = torch.cat([self.modified_triu, index]).sort()[0]
+        self.flipped_triu = torch.cat([self.flipped_triu, index]).sort()[0]
+
+
+def propagate(x, edge_index, edge_weight):
+    """Sum the messages `edge_weight * x[col]` into `row`,
+    which is differentiable (to any order) w.r.t. both `x` and `edge_weight`."""
+    row, col = edge_index
+    return torch.zeros_like(x).index_add(0, row, x[col] * edge_weight.unsqueeze(1))
@@ -0,0 +1,125 @@
+import numpy as np
+import torch
+import torch.nn as nn
+
+from graphgallery import functional as gf
+from graphgallery.utils import tqdm
+from graphgallery.attack.untargeted import PyTorch
+from graphgallery.attack.untargeted.untargeted_attacker import UntargetedAttacker
+from .pgd import PGD, budget_projection
+from .candidates import index_to_pair, sample_pairs, isin_sorted
+
+
+@PyTorch.register()
+class SparsePGD(PGD):
+    """PGD whose perturbations live on a block of `block_size` candidate
+        node pairs instead of a dense N x N matrix, so that the memory is
+        O(|E| + block_size) and the attack scales to large graphs.
+        During the first `search_epochs` epochs, the candidates whose
+        perturbations are projected to zero are replaced by newly sampled ones,
+        see `Robustness of Graph Neural Networks at Scale
+        <https://arxiv.org/abs/2110.14038>`
+
+        Like PGD, it cannot ensure that there is not singleton after attack.
+    """
+
+    def process_adj(self):
+        self.process_edges()
+        self.candidates = None
+        self.adj_changes = None
+
+    def reset(self):
+        UntargetedAttacker.reset(self)
+        self.candidates = None
+        self.adj_changes = None
+        return self
+
+    def attack(self,
+               num_budgets=0.05,
+               block_size=100000,
+               sample_epochs=20,
+               sample_batch_size=None,
+               C=None,
+               CW_loss=False,
+               epochs=200,
+               search_epochs=None,
+               structure_attack=True,
+               feature_attack=False,
+               disable=False):
+
+        UntargetedAttacker.attack(self, num_budgets, structure_attack, feature_attack)
+
+        self.CW_loss = CW_loss
+        if not C:
+            if CW_loss:
+                C = 0.1
+            else:
+                C = 200
+
+        if search_epochs is None:
+            search_epochs = epochs // 2
+
+        self.block_size = block_size
+        self.sample_block()
+
+        for epoch in tqdm(range(epochs),
+                          desc='PGD Training',
+                          disable=disable):
+            gradients = self.compute_gradients(self.victim_nodes)
+            lr = C / np.sqrt(epoch + 1)
+            self.adj_changes.data.add_(lr * gradients)
+            self.projection()
+            if epoch < search_epochs:
+                self.resample_block()
+
+        self.adj_flips = self.random_sample(sample_epochs, batch_size=sample_batch_size, disable=disable)
+        return self
+
+    def sample_block(self):
+        candidates = sample_pairs(self.num_nodes, self.block_size, device=self.device)
+        self.set_block(candidates, torch.zeros(candidates.numel(), device=self.device))
+
+    def resample_block(self):
+        """Keep the candidates with nonzero perturbations and resample the others."""
+        keep = self.adj_changes.data > 0
+        candidates = self.candidates[keep]
+        changes = self.adj_changes.data[keep]
+        new_candidates = sample_pairs(self.num_nodes, self.block_size - candidates.numel(),
+                                      exclude=candidates, device=self.device)
+        candidates = torch.cat([candidates, new_candidates])
+        changes = torch.cat([changes, changes.new_zeros(new_candidates.numel())])
+        candidates, order = candidates.sort()
+        self.set_block(candidates, changes[order])
+
+    def set_block(self, candidates, changes):
+        self.candidates = candidates
+        self.adj_changes = nn.Parameter(changes)
+        self.cand_row, self.cand_col = index_to_pair(candidates, self.num_nodes)
+        # +1 for adding an edge and -1 for removing an edge
+        self.cand_sign = 1. - 2. * isin_sorted(candidates, self.edge_triu).float()
+
+    def get_perturbed_adj(self):
+        weight = self.cand_sign * self.adj_changes
+        row, col = self.cand_row, self.cand_col
+        edge_index = torch.cat([self.edge_index,
+                                torch.stack([row, col]),
+                                torch.stack([col, row])], dim=1)
+        edge_weight = torch.cat([self.edge_weight, weight, weight])
+        return edge_index, edge_weight
+
+    def get_normalized_adj(self):
+        edge_index, edge_weight = self.get_perturbed_adj()
+        edge_index, edge_weight = gf.normalize_edge_tensor(edge_index,
+                                                           edge_weight,
+                                                           num_nodes=self.num_nodes)
+        return torch.sparse_coo_tensor(edge_index, edge_weight,
+                                       (self.num_nodes, self.num_nodes)).coalesce()
+
+    def projection(self):
+        self.adj_changes.data.copy_(budget_projection(self.adj_changes.data, self.num_budgets))
+
+    def perturbation_probs(self):
+        return self.adj_changes.data
+
+    def flip_pairs(self, flips):
+        return self.cand_row[flips], self.cand_col[flips], self.cand_sign[flips]
@@ -31,8 +31,6 @@ class FGSM(UntargetedAttacker):
 
     def reset(self):
         super().reset()
-        self.adj_flips = []
-        self.nattr_flips = []
 
         with tf.device(self.device):
             self.modified_adj = tf.Variable(self.graph.adj_matrix.A,
@@ -49,8 +49,6 @@ class BaseMeta(UntargetedAttacker):
 
     def reset(self):
         super().reset()
-        self.adj_flips = []
-        self.nattr_flips = []
 
         with tf.device(self.device):
             self.adj_changes.assign(tf.zeros_like(self.adj_tensor))
@@ -1,7 +1,9 @@
+import warnings
 import numpy as np
 import graphgallery as gg
 from graphgallery import functional as gf
 from ..flip_attacker import FlipAttacker
+from ..flip_set import FlipSet
 
 
 class UntargetedAttacker(FlipAttacker):
@@ -13,8 +15,8 @@ class UntargetedAttacker(FlipAttacker):
         self.structure_attack = None
         self.feature_attack = None
 
-        self.nattr_flips = gf.BunchDict()
-        self.adj_flips = gf.BunchDict()
+        self.nattr_flips = FlipSet()
+        self.adj_flips = FlipSet(symmetric=True)
         self.is_reseted = True
         return self
 
@@ -50,7 +52,7 @@ class UntargetedAttacker(FlipAttacker):
         self.is_reseted = False
 
     def is_modified(self, u, v):
-        if not isinstance(self.adj_flips, (dict, set)):
+        if not isinstance(self.adj_flips, (dict, set, FlipSet)):
             warnings.warn(
                 f'Time consuming to check if edge ({u}, {v}) in `adj_flips`, whose type is {type(self.adj_flips)}.',
                 UserWarning,
@@ -1,18 +1,31 @@
 """The functions in this file are mainly used for attacks"""
 
 import numpy as np
-import tensorflow as tf
 import scipy.sparse as sp
-from numba import njit
+from numba import njit, prange
 
 
 def estimate_loss_with_perturbation_gradient(candidates,
                                              adj_matrix,
                                              window_size,
                                              dim,
-                                             num_neg=1):
+                                             num_neg=1,
+                                             flip_indicator=None,
+                                             vals_org=None,
+                                             vecs_org=None,
+                                             K=100):
     """Computes the estimated loss using the gradient defined with eigenvalue perturbation.
 
+    The loss `sqrt(sum_{k > dim} sigma_k^2)` of the DeepWalk matrix is expressed with
+    the generalized eigenvalues `A u = lambda D u`, i.e.,
+    `sigma_k = vol(G) / (b * T * d_min) * |sum_{r=1}^{T} lambda_k^r|`,
+    and its gradient w.r.t. the weight of each candidate edge `(i, j)` is obtained
+    by the first-order eigenvalue perturbation
+    `d lambda_k = 2 u_ki u_kj - lambda_k (u_ki^2 + u_kj^2)`.
+    Only the `K` eigenpairs of the sparse graph and the candidates are used,
+    i.e., O(|candidates| * K) time and memory instead of the dense
+    N x N matrix powers and their gradients.
+
     :param candidates: np.ndarray, shape [?, 2]
         Candidate set of edge flips
     :param adj_matrix: sp.spmatrix
@@ -23,48 +36,57 @@ def estimate_loss_with_perturbation_gradient(candidates,
         Size of the embedding
     :param num_neg: int
         Number of negative samples
-    :return:
+    :param flip_indicator: np.ndarray, shape [?], optional
+        Vector indicating whether we are adding an edge (+1) or removing an edge (-1),
+        if given, the gradients are multiplied by it to estimate the change of the loss
+    :param vals_org: np.ndarray, shape [K], optional
+        The generalized eigenvalues of the clean graph
+    :param vecs_org: np.ndarray, shape [n, K], optional
+        The generalized eigenvectors of the clean graph
+    :param K: int
+        Number of eigenpairs to compute if `vals_org` and `vecs_org` are not given
+    :return: np.ndarray, shape [?]
+        The estimated gradient for each candidate flip, where the negative ones are set to -1
     """
-    adj_matrix = tf.convert_to_tensor(adj_matrix.toarray())
-
-    with tf.GradientTape() as tape:
-        tape.watch(adj_matrix)
-        deg = tf.reduce_sum(adj_matrix, axis=1)
-        volume = tf.reduce_sum(adj_matrix)
-
-        transition_matrix = adj_matrix / deg[:, None]
-
-        sum_of_powers = transition_matrix
-        last = transition_matrix
-        for i in range(1, window_size):
-            last = tf.matmul(last, transition_matrix)
-            sum_of_powers += last
-
-        M = sum_of_powers / deg * volume / (num_neg * window_size)
-        logM = tf.math.log(tf.maximum(M, 1.0))
-
-        norm_logM = tf.square(tf.norm(logM, ord=2))
-        sp_logM = sp.csr_matrix(logM.numpy())
-        _, eigenvecs = sp.linalg.eigsh(sp_logM, dim)
-
-        eigenvecs = tf.convert_to_tensor(eigenvecs)
-        eigen_vals = tf.reduce_sum(eigenvecs * tf.matmul(logM, eigenvecs), 0)
-        loss = tf.sqrt(norm_logM - tf.reduce_sum(tf.square(eigen_vals)))
-
-    adj_matrix_grad = tape.gradient(loss, adj_matrix).numpy()
-    row, col = candidates.T
-    sig_est_grad = adj_matrix_grad[row, col] + adj_matrix_grad[col, row]
+    adj_matrix = sp.csr_matrix(adj_matrix, dtype=np.float64)
+    num_nodes = adj_matrix.shape[0]
+    deg = adj_matrix.sum(1).A1
+
+    if vals_org is None or vecs_org is None:
+        vals_org, vecs_org = sp.linalg.eigsh(adj_matrix,
+                                             k=min(K, num_nodes - 1),
+                                             M=sp.diags(deg))
+
+    scale = deg.sum() / (num_neg * window_size * deg[deg > 0].min())
+    vals_sum_powers = sum_of_powers(vals_org, window_size)
+    # derivative of `sum_{r=1}^{T} lambda^r` w.r.t. lambda
+    vals_grad_powers = sum_of_powers_grad(vals_org, window_size)
+
+    # the eigenvalues that are not captured by the embedding
+    discarded = np.argsort(vals_sum_powers**2)[:num_nodes - dim]
+    loss = scale * np.sqrt(np.sum(vals_sum_powers[discarded]**2))
+    loss_grad_vals = np.zeros_like(vals_org)
+    loss_grad_vals[discarded] = scale**2 * vals_sum_powers[discarded] * \
+        vals_grad_powers[discarded] / max(loss, 1e-12)
+
+    row, col = np.asarray(candidates).T
+    vecs_i, vecs_j = vecs_org[row], vecs_org[col]
+    vals_grad_adj = 2 * vecs_i * vecs_j - vals_org * (vecs_i**2 + vecs_j**2)
+    sig_est_grad = vals_grad_adj @ loss_grad_vals
+    if flip_indicator is not None:
+        sig_est_grad *= flip_indicator
     ignore = sig_est_grad < 0
     sig_est_grad[ignore] = -1
 
     return sig_est_grad
 
 
-@njit
 def estimate_loss_with_delta_eigenvals(candidates, flip_indicator, vals_org,
                                        vecs_org, num_nodes, dim, window_size):
     """Computes the estimated loss using the change in the eigenvalues for every candidate edge flip.
 
+    The candidates are evaluated in parallel.
+
     :param candidates: np.ndarray, shape [?,2]
         Candidate set of edge flips,
     :param flip_indicator: np.ndarray, shape [?]
@@ -82,10 +104,20 @@ def estimate_loss_with_delta_eigenvals(candidates, flip_indicator, vals_org,
     :return: np.ndarray, shape [?]
         Estimated loss for each candidate flip
     """
+    return _delta_eigenvals_loss(np.ascontiguousarray(candidates, dtype=np.int64),
+                                 np.ascontiguousarray(flip_indicator, dtype=np.float64),
+                                 np.ascontiguousarray(vals_org, dtype=np.float64),
+                                 np.ascontiguousarray(vecs_org, dtype=np.float64),
+                                 num_nodes, dim, window_size)
 
+
+@njit(parallel=True)
+def _delta_eigenvals_loss(candidates, flip_indicator, vals_org,
+                          vecs_org, num_nodes, dim, window_size):
     loss_est = np.zeros(candidates.shape[0])
-    for x in range(candidates.shape[0]):
-        i, j = candidates[x]
+    for x in prange(candidates.shape[0]):
+        i = candidates[x, 0]
+        j = candidates[x, 1]
         vals_est = vals_org + flip_indicator[x] * (
             2 * vecs_org[i] * vecs_org[j] - vals_org *
             (vecs_org[i]**2 + vecs_org[j]**2))
@@ -101,7 +133,7 @@ def estimate_loss_with_delta_eigenvals(candidates, flip_indicator, vals_org,
 
 @njit
 def sum_of_powers(x, power):
-    """For each x_i, computes \sum_{r=1}^{pow) x_i^r (elementwise sum of powers).
+    r"""For each x_i, computes \sum_{r=1}^{pow) x_i^r (elementwise sum of powers).
 
     :param x: shape [?]
         Any vector
@@ -110,9 +142,31 @@ def sum_of_powers(x, power):
     :return: shape [?]
         Vector where each element is the sum of powers from 1 to pow.
     """
-    n = x.shape[0]
-    sum_powers = np.zeros((power, n))
-    for i, i_power in enumerate(range(1, power + 1)):
-        sum_powers[i] = np.power(x, i_power)
+    sum_powers = np.zeros_like(x)
+    last = np.ones_like(x)
+    for _ in range(power):
+        last = last * x
+        sum_powers += last
+
+    return sum_powers
+
+
+@njit
+def sum_of_powers_grad(x, power):
+    r"""For each x_i, computes \sum_{r=1}^{pow) r * x_i^(r-1),
+    the derivative of `sum_of_powers(x, pow)`.
+
+    :param x: shape [?]
+        Any vector
+    :param pow: int
+        The largest power to consider
+    :return: shape [?]
+        Vector where each element is the derivative of the sum of powers.
+    """
+    grad = np.zeros_like(x)
+    last = np.ones_like(x)
+    for r in range(1, power + 1):
+        grad += r * last
+        last = last * x
 
-    return sum_powers.sum(0)
\ No newline at end of file
+    return grad
@@ -9,7 +9,8 @@ from .modules import BackendModule, TensorFlowBackend, PyTorchBackend, PyGBacken
 __all__ = [
     'allowed_backends', 'backend_dict', 'backend', 'set_backend',
     'set_to_default_backend', 'boolx', 'intx', 'set_intx', 'floatx',
-    'set_floatx', 'epsilon', 'set_epsilon', 'file_ext', 'set_file_ext'
+    'set_floatx', 'epsilon', 'set_epsilon', 'file_ext', 'set_file_ext',
+    'sparse_attr', 'set_sparse_attr'
 ]
 
 # used to store the models or weights for `TensorFlow` and `PyTorch`
@@ -56,6 +57,8 @@ _INTX = 'int32'
 _FLOATX = 'float32'
 # The type of bool to use throughout a network
 _BOOLX = 'bool'
+# Whether to keep the sparse attribute matrices sparse
+_SPARSE_ATTR = False
 
 epsilon = K.epsilon
 set_epsilon = K.set_epsilon
@@ -122,6 +125,47 @@ def set_floatx(dtype: str) -> str:
     return _FLOATX
 
 
+def sparse_attr() -> bool:
+    """Returns whether the sparse attribute matrices,
+    e.g., the bag-of-words node attributes, are kept sparse
+    instead of being converted to dense arrays.
+
+    Returns:
+    --------
+    Boolean, whether to keep the sparse attribute matrices sparse.
+
+    Example:
+    --------
+    >>> graphgallery.sparse_attr()
+    False
+    """
+    return _SPARSE_ATTR
+
+
+def set_sparse_attr(flag: bool) -> bool:
+    """Sets whether to keep the sparse attribute matrices sparse.
+
+    When it is set to `True`, the sparse node attribute matrix of a graph
+    is stored as a CSR matrix, which is converted to a SparseTensor by
+    `graphgallery.functional.astensor`. It only affects the graphs
+    created afterwards.
+
+    Parameters:
+    --------
+    flag: Boolean, whether to keep the sparse attribute matrices sparse.
+
+    Example:
+    --------
+    >>> graphgallery.sparse_attr()
+    False
+    >>> graphgallery.set_sparse_attr(True)
+    True
+    """
+    global _SPARSE_ATTR
+    _SPARSE_ATTR = bool(flag)
+    return _SPARSE_ATTR
+
+
 def intx() -> str:
     """Returns the default integer type, as a string.
 
@@ -2,6 +2,7 @@ import warnings
 import numpy as np
 import scipy.sparse as sp
 from typing import Union, Optional, List, Tuple, Any
+import graphgallery as gg
 from graphgallery import functional as gf
 
 from ..data_type import is_multiobjects
@@ -53,7 +54,10 @@ def _check_adj_matrix(adj_matrix, copy=False):
 
 def _check_attr_matrix(attr_matrix, copy=False):
     if sp.isspmatrix(attr_matrix):
-        attr_matrix = attr_matrix.astype(np.float32, copy=False).toarray()
+        if gg.sparse_attr():
+            attr_matrix = attr_matrix.tocsr(copy=False).astype(np.float32, copy=copy)
+        else:
+            attr_matrix = attr_matrix.astype(np.float32, copy=False).toarray()
     elif isinstance(attr_matrix, np.ndarray):
         attr_matrix = attr_matrix.astype(np.float32, copy=copy)
     else:
@@ -119,7 +123,8 @@ _KEYS = ('adj_matrix', 'node_attr', 'node_label', 'node_graph_label',
          'mapping', 'metadata')
 
 # adj_matrix should be CSR matrix
-# attribute matrices: node_attr, edge_attr, graph_attr should be 2D numpy array
+# attribute matrices: node_attr, edge_attr, graph_attr should be 2D numpy array,
+# or CSR matrix if `graphgallery.sparse_attr()` is True
 # label matrices: node_label, node_graph_label, edge_label, graph_label should be 1D or 2D numpy array
 # edge_index should be (2, N) numpy array
 # edge_weight should be (N,) numpy array
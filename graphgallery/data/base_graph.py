@@ -5,7 +5,7 @@ from functools import partial
 from copy import copy as _copy, deepcopy as _deepcopy
 
 from .apply import check_and_convert, sparse_apply
-from .io import load_npz
+from .io import load_npz, save_graph_dir, load_graph_dir
 
 
 class BaseGraph:
@@ -150,6 +150,48 @@ class BaseGraph:
 
         return filepath
 
+    @classmethod
+    def from_dir(cls, folder: str, mmap_mode='r'):
+        """load the graph from a directory saved by `to_dir`
+
+        Parameters
+        ----------
+        folder : str
+            the directory where the graph is saved.
+        mmap_mode : str, optional
+            the `mmap_mode` for `np.load`, by default 'r', i.e.,
+            the arrays are opened as read-only memory maps, which
+            makes loading near-instant and the pages are shared
+            across processes. Use 'c' (copy-on-write) if the arrays
+            would be modified inplace, or None to read them into memory.
+        """
+        loader = load_graph_dir(folder, mmap_mode=mmap_mode)
+        loader.pop("__class__", None)
+        loader.pop("multiple", None)
+        return cls(copy=False, **loader)
+
+    def to_dir(self, folder: str):
+        """save the graph to a directory with one uncompressed `.npy` file
+        for each array, and each component of the sparse matrices in CSR format,
+        which can be memory-mapped by `from_dir`.
+
+        Parameters
+        ----------
+        folder : str
+            the directory where the graph will be saved.
+
+        Returns
+        -------
+        str
+            the directory where the graph is saved.
+        """
+        data_dict = {k: v for k, v in self.items() if v is not None}
+        data_dict["__class__"] = str(self.__class__.__name__)
+        data_dict["multiple"] = self.multiple
+        folder = save_graph_dir(folder, data_dict)
+        print(f"Saving to {folder}", file=sys.stderr)
+        return folder
+
     def update(self, *, apply_fn=None, copy=False, **collects):
         """Update the items in the graph
 
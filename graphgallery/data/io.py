@@ -3,10 +3,12 @@ import os
 import tarfile
 import errno
 import json
+import pickle
 import zipfile
 import os.path as osp
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 from tensorflow.keras.utils import get_file
 
@@ -14,8 +16,11 @@ from tensorflow.keras.utils import get_file
 __all__ = [
     'download_file', 'files_exist', 'makedirs', 'makedirs_from_filepath',
     'extractall', 'remove', 'load_npz', 'read_csv', 'read_json',
+    'save_graph_dir', 'load_graph_dir', 'is_graph_dir',
 ]
 
+_MANIFEST = "manifest.json"
+
 
 def download_file(raw_paths, urls):
     if isinstance(raw_paths, str):
@@ -113,6 +118,132 @@ def load_npz(filepath):
         raise ValueError(f"{filepath} doesn't exist.")
 
 
+def is_graph_dir(folder) -> bool:
+    """Whether `folder` is a graph directory saved by `save_graph_dir`."""
+    return bool(folder) and osp.isfile(osp.join(folder, _MANIFEST))
+
+
+def save_graph_dir(folder, data_dict, convert=None):
+    """Save a dict of arrays to `folder` as raw uncompressed `.npy` files,
+    one for each dense array and each CSR component (`data`, `indices`, `indptr`),
+    so that they can be memory-mapped by `load_graph_dir`.
+    Lists and tuples of arrays are saved item by item,
+    and other objects (e.g., `mapping`, `metadata`) are pickled.
+
+    Parameters
+    ----------
+    folder : str
+        the directory to save.
+    data_dict : dict
+        the objects to save.
+    convert : callable, optional
+        a function mapping an object to `(array, spec)` to save it as `array`
+        with the extra json `spec` in the manifest, or to None to save it as is,
+        e.g., to save the tensors as arrays. By default None.
+    """
+    folder = osp.abspath(osp.expanduser(folder))
+    makedirs(folder)
+    manifest = {k: _save_item(folder, k, v, convert) for k, v in data_dict.items()}
+    # write the manifest at last, so a partially saved folder is never recognized
+    with open(osp.join(folder, _MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    return folder
+
+
+def load_graph_dir(folder, mmap_mode='r', restore=None):
+    """Load a dict of arrays saved by `save_graph_dir`.
+
+    Parameters
+    ----------
+    folder : str
+        the graph directory.
+    mmap_mode : str, optional
+        the `mmap_mode` for `np.load`, by default 'r', i.e., the arrays
+        are read-only and share the pages across processes.
+        Use 'c' for copy-on-write arrays or None to read them into memory.
+    restore : callable, optional
+        a function `restore(array, spec)` applied to each array
+        saved with an extra `spec` by `convert` in `save_graph_dir`.
+    """
+    folder = osp.abspath(osp.expanduser(folder))
+    if not is_graph_dir(folder):
+        raise ValueError(f"{folder} is not a graph directory.")
+    with open(osp.join(folder, _MANIFEST), "r") as f:
+        manifest = json.load(f)
+    return {k: _load_item(folder, spec, mmap_mode, restore) for k, spec in manifest.items()}
+
+
+def _save_item(folder, name, value, convert=None):
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return {"type": "value", "value": value}
+
+    converted = convert(value) if convert is not None else None
+    if converted is not None:
+        array, extra = converted
+        spec = _save_item(folder, name, array)
+        spec["extra"] = extra
+        return spec
+
+    if sp.isspmatrix(value):
+        value = value.tocsr()
+        files = []
+        for part in ("data", "indices", "indptr"):
+            filename = f"{name}.{part}.npy"
+            np.save(osp.join(folder, filename), getattr(value, part))
+            files.append(filename)
+        return {"type": "csr", "files": files, "shape": list(value.shape)}
+
+    if isinstance(value, np.ndarray) and value.dtype.kind not in {'O', 'U'}:
+        filename = f"{name}.npy"
+        np.save(osp.join(folder, filename), value)
+        return {"type": "ndarray", "file": filename}
+
+    if _is_sequence(value) and _has_array(value, convert):
+        # e.g., multiple graphs
+        return {"type": "list" if isinstance(value, list) else "tuple",
+                "items": [_save_item(folder, f"{name}.{i}", v, convert) for i, v in enumerate(value)]}
+
+    filename = f"{name}.pkl"
+    with open(osp.join(folder, filename), "wb") as f:
+        pickle.dump(value, f)
+    return {"type": "pickle", "file": filename}
+
+
+def _is_sequence(value):
+    return isinstance(value, (list, tuple)) or \
+        (isinstance(value, np.ndarray) and value.dtype.kind == 'O')
+
+
+def _has_array(value, convert=None):
+    if _is_sequence(value):
+        return any(_has_array(v, convert) for v in value)
+    return sp.isspmatrix(value) or isinstance(value, np.ndarray) or \
+        (convert is not None and convert(value) is not None)
+
+
+def _load_item(folder, spec, mmap_mode, restore=None):
+    kind = spec["type"]
+    if kind == "value":
+        return spec["value"]
+    elif kind == "ndarray":
+        value = np.load(osp.join(folder, spec["file"]), mmap_mode=mmap_mode)
+    elif kind == "csr":
+        data, indices, indptr = (np.load(osp.join(folder, f), mmap_mode=mmap_mode) for f in spec["files"])
+        value = sp.csr_matrix((data, indices, indptr), shape=tuple(spec["shape"]), copy=False)
+    elif kind in ("list", "tuple"):
+        value = [_load_item(folder, s, mmap_mode, restore) for s in spec["items"]]
+        return tuple(value) if kind == "tuple" else value
+    elif kind == "pickle":
+        with open(osp.join(folder, spec["file"]), "rb") as f:
+            return pickle.load(f)
+    else:
+        raise ValueError(f"Unrecognized graph directory item '{kind}'.")
+
+    if "extra" in spec and restore is not None:
+        value = restore(value, spec["extra"])
+    return value
+
+
 def read_csv(reader, dtype=np.int32):
     if isinstance(reader, str):
         reader = osp.abspath(osp.expanduser(reader))
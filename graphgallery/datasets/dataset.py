@@ -1,5 +1,7 @@
 import glob
+import hashlib
 import os.path as osp
+import pickle as pkl
 
 from typing import Union, Optional, List, Tuple, Callable
 from tabulate import tabulate
@@ -34,6 +36,11 @@ class Dataset:
         self.split_cache = None
         self.splits = gf.BunchDict()
         self.transform = gf.get(transform)
+        # whether to save the transformed graph to `transformed_path`
+        # and load it from there next time
+        self.persist_transform = False
+        self._transformed = None
+        self._transformed_key = None
 
     @property
     def g(self):
@@ -42,8 +49,48 @@ class Dataset:
 
     @property
     def graph(self):
-        """alias of graph"""
-        return self.transform(self._graph)
+        """the transformed graph, which is computed once and cached
+        until `_graph` or `transform` is changed."""
+        key = (self._graph, self.transform)
+        if self._transformed_key is None or any(a is not b for a, b in zip(key, self._transformed_key)):
+            self._transformed = self._transform_graph()
+            self._transformed_key = key
+        return self._transformed
+
+    def clear_transform_cache(self):
+        """clear the cached transformed graph, e.g., after modifying `_graph` inplace."""
+        self._transformed = None
+        self._transformed_key = None
+
+    def _transform_graph(self):
+        path = self.transformed_path if self.persist_transform else None
+        if path and osp.isfile(path):
+            if self.verbose:
+                print(f"Transformed dataset '{self.name}' has already existed, loading it...")
+            with open(path, 'rb') as f:
+                return pkl.load(f)
+
+        graph = self.transform(self._graph)
+        if path:
+            with open(path, 'wb') as f:
+                pkl.dump(graph, f)
+        return graph
+
+    @property
+    def transformed_path(self):
+        """the path of the persisted transformed graph, or None if
+        the dataset or the transform does not support persistence."""
+        return None
+
+    def transform_key(self):
+        """a stable hash of `transform`, or None if it
+        cannot be pickled or it is a `NullTransform`."""
+        if isinstance(self.transform, gf.NullTransform):
+            return None
+        try:
+            return hashlib.sha1(pkl.dumps(self.transform)).hexdigest()[:16]
+        except (pkl.PicklingError, AttributeError, TypeError):
+            return None
 
     @staticmethod
     def available_datasets():
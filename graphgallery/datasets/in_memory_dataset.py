@@ -2,7 +2,7 @@ import os.path as osp
 import pickle as pkl
 
 from .dataset import Dataset
-from ..data.io import makedirs, files_exist, download_file, extractall, remove
+from ..data.io import makedirs, files_exist, download_file, extractall, remove, is_graph_dir, load_graph_dir
 
 
 class InMemoryDataset(Dataset):
@@ -28,7 +28,7 @@ class InMemoryDataset(Dataset):
 
     def download(self):
 
-        if files_exist(self.raw_paths) or files_exist(self.process_path):
+        if is_graph_dir(self.graph_dir) or files_exist(self.raw_paths) or files_exist(self.process_path):
             if self.verbose:
                 print(f"Dataset '{self.name}' has already existed, loading it...")
             return
@@ -58,7 +58,11 @@ class InMemoryDataset(Dataset):
 
     def process(self):
 
-        if files_exist(self.process_path):
+        if is_graph_dir(self.graph_dir):
+            if self.verbose:
+                print(f"Processed dataset '{self.name}' has already existed, memory-mapping it...")
+            cache = self._load_graph_dir()
+        elif files_exist(self.process_path):
             if self.verbose:
                 print(f"Processed dataset '{self.name}' has already existed, loading it...")
             with open(self.process_path, 'rb') as f:
@@ -70,12 +74,34 @@ class InMemoryDataset(Dataset):
             if self.verbose:
                 print("Processing completed.")
 
-        self._graph = cache.pop('graph')
+        self._graph = self._processed_graph = cache.pop('graph')
         self.split_cache = cache
 
     def _process(self):
         raise NotImplementedError
 
+    def to_dir(self):
+        """Save the processed graph to `graph_dir` with one uncompressed
+        `.npy` file per array (see `BaseGraph.to_dir`). Once saved,
+        the dataset is loaded from `graph_dir` with memory-mapped arrays,
+        which is near-instant and shares the pages across processes.
+        """
+        self._processed_graph.to_dir(self.graph_dir)
+        with open(osp.join(self.graph_dir, "split_cache.pkl"), 'wb') as f:
+            pkl.dump(self.split_cache, f)
+        return self.graph_dir
+
+    def _load_graph_dir(self):
+        # to avoid circular imports
+        from .. import data
+        with open(osp.join(self.graph_dir, "split_cache.pkl"), 'rb') as f:
+            cache = pkl.load(f) or {}
+        loader = load_graph_dir(self.graph_dir)
+        graph_cls = getattr(data, loader.pop("__class__", "Graph"))
+        loader.pop("multiple", None)
+        cache['graph'] = graph_cls(copy=False, **loader)
+        return cache
+
     @property
     def url(self):
         return self._url
@@ -100,6 +126,10 @@ class InMemoryDataset(Dataset):
     def process_filename(self):
         return None
 
+    @property
+    def graph_dir(self):
+        return osp.join(self.process_dir, f"{self.name}_graph")
+
     @property
     def process_path(self):
         process_filename = self.process_filename
@@ -108,6 +138,17 @@ class InMemoryDataset(Dataset):
         else:
             return None
 
+    @property
+    def transformed_path(self):
+        process_path = self.process_path
+        # the graph may be replaced, e.g., by `split_nodes_by_sample`
+        if not process_path or self._graph is not getattr(self, "_processed_graph", None):
+            return None
+        key = self.transform_key()
+        if key is None:
+            return None
+        return f"{osp.splitext(process_path)[0]}_transformed_{key}.pkl"
+
     @property
     def raw_paths(self):
         raise NotImplementedError
@@ -13,4 +13,4 @@ from .transforms import *
 from .decorators import *
 from .get_transform import *
 from .tensor import *
-from .random import random_seed
+from .random import random_seed, get_rng
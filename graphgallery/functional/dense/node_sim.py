@@ -12,18 +12,28 @@ import scipy.sparse as sp
 from sklearn.metrics.pairwise import cosine_similarity
 from itertools import product
 
-
-def knn_graph(x, k=20):
-    X = np.zeros_like(x)
-    X[x != 0] = 1
-    sims = cosine_similarity(X)
-    sims[np.diag_indices(len(sims))] = 0.
-
-    for i, sim in enumerate(sims):
-        indices_argsort = np.argsort(sim)
-        sims[i, indices_argsort[: -k]] = 0.
-
-    adj_knn = sp.csr_matrix(sims)
+from ..sparse.topk import sparse_topk
+
+
+def knn_graph(x, k=20, batch_size=1024):
+    """The k-nearest-neighbor graph of the binarized attributes `x`
+    with cosine similarity, where the similarities are computed
+    in batches of `batch_size` rows and sparsified by `sparse_topk`."""
+    if sp.isspmatrix(x):
+        X = (x != 0).astype(np.float32)
+    else:
+        X = np.zeros_like(x)
+        X[x != 0] = 1
+
+    N = X.shape[0]
+    blocks = []
+    for start in range(0, N, batch_size):
+        end = min(start + batch_size, N)
+        sims = cosine_similarity(X[start:end], X)
+        sims[np.arange(end - start), np.arange(start, end)] = 0.
+        blocks.append(sparse_topk(sp.csr_matrix(sims), K=k))
+
+    adj_knn = sp.vstack(blocks, format='csr')
     return adj_knn
 
 
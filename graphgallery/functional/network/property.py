@@ -54,6 +54,8 @@ def is_binary(A) -> bool:
     assert A is not None
     if is_multiobjects(A):
         return all(is_binary(adj) for adj in A)
+    if sp.isspmatrix(A):
+        return np.all(np.unique(A.data) == 1)
     return np.all(np.unique(A) == (0, 1))
 
 
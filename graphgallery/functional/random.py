@@ -4,7 +4,7 @@ import numpy as np
 import graphgallery as gg
 import tensorflow as tf
 
-__all__ = ["random_seed"]
+__all__ = ["random_seed", "get_rng"]
 
 
 def random_seed(seed=None, backend=None):
@@ -17,3 +17,16 @@ def random_seed(seed=None, backend=None):
         torch.manual_seed(seed)
         torch.cuda.manual_seed(seed)
 #         torch.cuda.manual_seed_all(seed)
+
+
+def get_rng(random_state=None) -> np.random.Generator:
+    """Return a `np.random.Generator` from `random_state`.
+
+    If `random_state` is None, the generator is seeded from the global
+    NumPy random state, so that `random_seed` still makes it reproducible.
+    """
+    if isinstance(random_state, np.random.Generator):
+        return random_state
+    if random_state is None:
+        random_state = np.random.randint(2**31)
+    return np.random.default_rng(random_state)
@@ -2,7 +2,7 @@ from .normalize_adj import NormalizeAdj, normalize_adj
 from .add_selfloops import AddSelfloops, add_selfloops, eliminate_selfloops
 from .wavelet import WaveletBasis, wavelet_basis
 from .chebyshef import ChebyBasis, cheby_basis
-from .neighbor_sampler import NeighborSampler, neighbor_sampler
+from .neighbor_sampler import NeighborSampler, neighbor_sampler, sample_neighbors
 from .gdc import GDC, gdc
 from .to_edge import sparse_adj_to_edge, SparseAdjToEdge
 from .augment_adj import augment_adj
@@ -12,3 +12,4 @@ from .flip import *
 from .ppr import ppr, PPR
 from .clip import sparse_clip
 from .topk import sparse_topk
+from .propagate import PropagatedFeatureStore, propagate_attr, propagated_feature_store
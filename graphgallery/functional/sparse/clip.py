@@ -1,12 +1,9 @@
-import numpy as np
+from .topk import sparse_topk
 
 
 __all__ = ["sparse_clip"]
 
 
 def sparse_clip(matrix, threshold: float):
-    matrix = matrix.tocsr(copy=False).copy()
-    thres = np.vectorize(lambda x: x if x >= threshold else 0.)
-    matrix.data = thres(matrix.data)
-    matrix.eliminate_zeros()
-    return matrix
+    """Remove the entries of the sparse matrix that are less than `threshold`."""
+    return sparse_topk(matrix, threshold=threshold)
@@ -1,3 +1,4 @@
+import numpy as np
 import scipy.sparse as sp
 from sklearn.preprocessing import normalize
 from scipy.linalg import expm
@@ -8,6 +9,7 @@ from ..decorators import multiple
 from ..get_transform import Transform
 from .topk import sparse_topk
 from .clip import sparse_clip
+from .ppr import ppr_push
 
 
 @Transform.register()
@@ -17,13 +19,17 @@ class GDC(BaseTransform):
                  t: float = None,
                  eps: float = None,
                  K: int = 128,
-                 which: str = 'PPR'):
+                 which: str = 'PPR',
+                 approximate: bool = False,
+                 approx_eps: float = 1e-4):
         super().__init__()
         self.alpha = alpha
         self.t = t
         self.eps = eps
         self.K = K
         self.which = which
+        self.approximate = approximate
+        self.approx_eps = approx_eps
 
     def __call__(self, adj_matrix):
         return gdc(adj_matrix,
@@ -31,10 +37,13 @@ class GDC(BaseTransform):
                    t=self.t,
                    eps=self.eps,
                    K=self.K,
-                   which=self.which)
+                   which=self.which,
+                   approximate=self.approximate,
+                   approx_eps=self.approx_eps)
 
     def extra_repr(self):
-        return f"alpha={self.alpha}, t={self.t}, eps={self.eps}, K={self.K}, which={self.which}"
+        return f"alpha={self.alpha}, t={self.t}, eps={self.eps}, K={self.K}, which={self.which}, " \
+            f"approximate={self.approximate}, approx_eps={self.approx_eps}"
 
 
 @multiple()
@@ -43,7 +52,38 @@ def gdc(adj_matrix: sp.csr_matrix,
         t: float = None,
         eps: float = None,
         K: int = 128,
-        which: str = 'PPR') -> sp.csr_matrix:
+        which: str = 'PPR',
+        approximate: bool = False,
+        approx_eps: float = 1e-4) -> sp.csr_matrix:
+    """Graph Diffusion Convolution (GDC).
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix.
+    alpha : float, optional
+        the teleport probability for PPR-based diffusion, by default 0.3
+    t : float, optional
+        the diffusion time for Heat-based diffusion, by default None
+    eps : float, optional
+        the threshold to sparsify the diffusion matrix, by default None
+    K : int, optional
+        the number of entries kept in each row of the diffusion matrix, by default 128
+    which : str, optional
+        the diffusion kernel, 'PPR' or 'Heat', by default 'PPR'
+    approximate : bool, optional
+        whether to compute the diffusion matrix approximately
+        without dense matrices, by default False.
+        'PPR' uses the push-based algorithm (see `ppr`),
+        'Heat' uses the truncated Taylor expansion,
+        which are able to scale to very large graphs.
+    approx_eps : float, optional
+        the tolerance of the approximation, by default 1e-4
+
+    Returns
+    -------
+    sp.csr_matrix, the column-normalized diffusion matrix.
+    """
 
     if not (eps or K):
         raise RuntimeError('Either `eps` or `K` should be specified!')
@@ -55,7 +95,13 @@ def gdc(adj_matrix: sp.csr_matrix,
     # Symmetric transition matrix
     T_sym = normalize_adj(adj_matrix)
 
-    if which == 'PPR':
+    if approximate and which == 'PPR':
+        assert alpha, '`alpha` should be specified for PPR-based diffusion.'
+        S = ppr_push(adj_matrix, alpha=alpha, eps=approx_eps, K=K)
+    elif approximate and which == 'Heat':
+        assert t, '`t` should be specified for Heat-based diffusion.'
+        S = heat_taylor(T_sym, t=t, eps=approx_eps, K=K)
+    elif which == 'PPR':
         # PPR-based diffusion
         assert alpha, '`alpha` should be specified for PPR-based diffusion.'
         S = alpha * sp.linalg.inv((sp.eye(N, format='csr') - (1 - alpha) * T_sym).tocsc())
@@ -78,3 +124,46 @@ def gdc(adj_matrix: sp.csr_matrix,
     T_S = normalize(S, norm='l1', axis=0)
 
     return T_S.tocsr(copy=False)
+
+
+def heat_taylor(T_sym: sp.csr_matrix,
+                t: float,
+                eps: float = 1e-4,
+                K: int = None,
+                batch_size: int = 4096) -> sp.csr_matrix:
+    """Approximate the heat kernel `exp(-t * (I - T_sym))` with
+    the truncated Taylor expansion `e^{-t} * sum_k t^k / k! * T_sym^k`.
+
+    The expansion is truncated once the remaining Poisson mass is below `eps`,
+    entries below `eps` are dropped after each step, and the rows are computed
+    in batches of `batch_size` so that the memory is bounded.
+
+    Returns
+    -------
+    sp.csr_matrix of shape [N, N], with at most K entries in each row if K is specified.
+    """
+    N = T_sym.shape[0]
+    T_sym = T_sym.tocsr(copy=False)
+
+    # number of terms such that the Poisson tail is less than `eps`
+    coef = np.exp(-t)
+    coefs = [coef]
+    while 1.0 - sum(coefs) > eps and len(coefs) < 100:
+        coef = coef * t / len(coefs)
+        coefs.append(coef)
+
+    blocks = []
+    for start in range(0, N, batch_size):
+        end = min(start + batch_size, N)
+        term = sp.eye(end - start, N, k=start, dtype=T_sym.dtype, format='csr')
+        S = coefs[0] * term
+        for coef in coefs[1:]:
+            term = term @ T_sym
+            term.data[coef * np.abs(term.data) < eps] = 0.
+            term.eliminate_zeros()
+            S = S + coef * term
+        if K:
+            S = sparse_topk(S, K=K)
+        blocks.append(S)
+
+    return sp.vstack(blocks, format='csr')
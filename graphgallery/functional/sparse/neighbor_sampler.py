@@ -1,10 +1,14 @@
+import numba as nb
 import numpy as np
 import scipy.sparse as sp
 
 from ..transforms import BaseTransform
 from ..get_transform import Transform
+from ..random import get_rng
 from graphgallery import intx
 
+__all__ = ["NeighborSampler", "neighbor_sampler", "sample_neighbors"]
+
 
 @Transform.register()
 class NeighborSampler(BaseTransform):
@@ -24,28 +28,82 @@ class NeighborSampler(BaseTransform):
 
 
 def neighbor_sampler(adj_matrix: sp.csr_matrix, max_degree: int = 25,
-                     selfloop: bool = False):
+                     selfloop: bool = False, random_state=None):
+    """Build a fixed-size neighbor table of shape [N + 1, max_degree],
+    where the last row and the missing neighbors are padded with `N`.
+    """
     adj_matrix = adj_matrix.tocsr(copy=False)
     N = adj_matrix.shape[0]
-    neighbors_matrix = N * np.ones((N + 1, max_degree), dtype=intx())
-    for nodeid in range(N):
-        neighbors = adj_matrix[nodeid].indices
+    nodes = np.arange(N + 1)
+    neighbors_matrix = sample_neighbors(adj_matrix, nodes, max_degree,
+                                        random_state=random_state)
+    return neighbors_matrix.astype(intx(), copy=False)
 
-#         if not selfloop:
-#             neighbors = np.setdiff1d(neighbors, [nodeid])
-#         else:
-#             neighbors = np.intersect1d(neighbors, [nodeid])
 
-        size = neighbors.size
-        if size == 0:
-            continue
+def sample_neighbors(adj_matrix, nodes, num_samples: int, random_state=None) -> np.ndarray:
+    """Sample a fixed number of neighbors for each node in `nodes`.
+
+    Neighbors are sampled without replacement if a node has at least
+    `num_samples` neighbors, otherwise with replacement. Isolated nodes
+    and the padded (dummy) node `N` get `N` as their neighbors.
 
-        if size > max_degree:
-            neighbors = np.random.choice(neighbors, max_degree, replace=False)
-        elif size < max_degree:
-            neighbors = np.random.choice(neighbors, max_degree, replace=True)
+    Only the rows of `nodes` are touched, so the cost depends on the
+    batch size rather than the graph size.
 
-        neighbors_matrix[nodeid] = neighbors
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix or np.ndarray
+        the CSR adjacency matrix of shape [N, N], or a neighbor table
+        of shape [N + 1, max_degree] built by `neighbor_sampler`.
+    nodes : np.ndarray
+        the (possibly padded) nodes to sample neighbors for.
+    num_samples : int
+        the number of neighbors sampled for each node.
+    random_state : int, np.random.Generator, optional
+        the random state, by default None
 
-    np.random.shuffle(neighbors_matrix.T)
-    return neighbors_matrix
+    Returns
+    -------
+    np.ndarray of shape [len(nodes), num_samples]
+    """
+    rng = get_rng(random_state)
+    nodes = np.asarray(nodes, dtype=np.int64).ravel()
+    if isinstance(adj_matrix, np.ndarray):
+        # a precomputed neighbor table, shuffle the sampled rows only
+        rows = adj_matrix[nodes]
+        order = rng.random(rows.shape).argsort(1)[:, :num_samples]
+        return np.take_along_axis(rows, order, axis=1)
+
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    seed = rng.integers(2**31)
+    return _sample_neighbors_csr(adj_matrix.indptr, adj_matrix.indices,
+                                 nodes, num_samples, seed)
+
+
+@nb.njit
+def _sample_neighbors_csr(indptr, indices, nodes, num_samples, seed):
+    np.random.seed(seed)
+    N = len(indptr) - 1
+    out = np.full((len(nodes), num_samples), N, dtype=np.int64)
+    buffer = np.empty(0, dtype=indices.dtype)
+    for i in range(len(nodes)):
+        u = nodes[i]
+        if u >= N:
+            continue
+        start = indptr[u]
+        degree = indptr[u + 1] - start
+        if degree == 0:
+            continue
+        if degree < num_samples:
+            for j in range(num_samples):
+                out[i, j] = indices[start + np.random.randint(degree)]
+        else:
+            # partial Fisher-Yates shuffle on a copy of the neighbors
+            if buffer.size < degree:
+                buffer = np.empty(degree, dtype=indices.dtype)
+            buffer[:degree] = indices[start:start + degree]
+            for j in range(num_samples):
+                k = j + np.random.randint(degree - j)
+                buffer[j], buffer[k] = buffer[k], buffer[j]
+                out[i, j] = buffer[j]
+    return out
@@ -1,3 +1,4 @@
+import numba as nb
 import numpy as np
 import scipy.sparse as sp
 import graphgallery as gg
@@ -86,6 +87,9 @@ def normalize_adj(adj_matrix, rate=-0.5, fill_weight=1.0, symmetric=True):
     graphgallery.functional.NormalizeAdj          
 
     """
+    if sp.isspmatrix(adj_matrix):
+        return _normalize_sparse_adj(adj_matrix, rate, fill_weight=fill_weight, symmetric=symmetric)
+
     def _normalize_adj(adj, r):
 
         # here a new copy of adj is created
@@ -100,18 +104,11 @@ def normalize_adj(adj_matrix, rate=-0.5, fill_weight=1.0, symmetric=True):
         degree = adj.sum(1).A1
         degree_power = np.power(degree, r)
 
-        if sp.isspmatrix(adj):
-            adj = adj.tocoo(copy=False)
-            adj.data = degree_power[adj.row] * adj.data
-            if symmetric:
-                adj.data *= degree_power[adj.col]
-            adj = adj.tocsr(copy=False)
-        else:
-            degree_power_matrix = sp.diags(degree_power)
-            adj = degree_power_matrix @ adj
-            if symmetric:
-                adj = adj @ degree_power_matrix
-            adj = adj.A
+        degree_power_matrix = sp.diags(degree_power)
+        adj = degree_power_matrix @ adj
+        if symmetric:
+            adj = adj @ degree_power_matrix
+        adj = adj.A
         return adj
 
     if gg.is_listlike(rate):
@@ -120,4 +117,100 @@ def normalize_adj(adj_matrix, rate=-0.5, fill_weight=1.0, symmetric=True):
         return _normalize_adj(adj_matrix, rate)
 
 
+def _normalize_sparse_adj(adj, rate, fill_weight=1.0, symmetric=True):
+    """Normalize a sparse adjacency matrix in CSR form without
+    materializing `adj + fill_weight * I` or a COO copy.
+    The self-loops are inserted while copying `indices` and `data` once,
+    and the degree computation is shared for multiple `rate`.
+    If `fill_weight` is 0, the `indices` and `indptr` of the outputs are
+    shared with `adj`, and only a new `data` array is allocated for each rate.
+    """
+    adj = adj.tocsr(copy=False)
+    dtype = np.result_type(adj.dtype, np.float32)
+    data = adj.data.astype(dtype, copy=False)
+
+    if fill_weight:
+        indptr, indices, data = _insert_selfloops(adj.indptr, adj.indices, data, dtype.type(fill_weight))
+    else:
+        indptr, indices = adj.indptr, adj.indices
+
+    degree = _row_sum(indptr, data)
+
+    def _normalize(r):
+        if r is None:
+            out = data.copy() if data is adj.data else data
+        else:
+            degree_power = np.power(degree, r, dtype=dtype)
+            out = _scale(indptr, indices, data, degree_power, symmetric)
+        return sp.csr_matrix((out, indices, indptr), shape=adj.shape, copy=False)
+
+    if gg.is_listlike(rate):
+        return tuple(_normalize(r) for r in rate)
+    else:
+        return _normalize(rate)
+
+
+@nb.njit
+def _insert_selfloops(indptr, indices, data, fill_weight):
+    N = len(indptr) - 1
+    new_indptr = np.empty_like(indptr)
+    new_indptr[0] = 0
+    for i in range(N):
+        has_loop = False
+        for j in range(indptr[i], indptr[i + 1]):
+            if indices[j] == i:
+                has_loop = True
+                break
+        new_indptr[i + 1] = new_indptr[i] + indptr[i + 1] - indptr[i] + (0 if has_loop else 1)
+
+    new_indices = np.empty(new_indptr[-1], dtype=indices.dtype)
+    new_data = np.empty(new_indptr[-1], dtype=data.dtype)
+    for i in range(N):
+        k = new_indptr[i]
+        inserted = False
+        for j in range(indptr[i], indptr[i + 1]):
+            col = indices[j]
+            if col == i:
+                new_indices[k] = col
+                new_data[k] = data[j] + fill_weight
+                inserted = True
+            else:
+                # keep the column indices sorted if they were
+                if not inserted and col > i and new_indptr[i + 1] - new_indptr[i] > indptr[i + 1] - indptr[i]:
+                    new_indices[k] = i
+                    new_data[k] = fill_weight
+                    inserted = True
+                    k += 1
+                new_indices[k] = col
+                new_data[k] = data[j]
+            k += 1
+        if not inserted:
+            new_indices[k] = i
+            new_data[k] = fill_weight
+    return new_indptr, new_indices, new_data
+
+
+@nb.njit(parallel=True)
+def _row_sum(indptr, data):
+    N = len(indptr) - 1
+    out = np.zeros(N, dtype=data.dtype)
+    for i in nb.prange(N):
+        for j in range(indptr[i], indptr[i + 1]):
+            out[i] += data[j]
+    return out
+
+
+@nb.njit(parallel=True)
+def _scale(indptr, indices, data, degree_power, symmetric):
+    N = len(indptr) - 1
+    out = np.empty_like(data)
+    for i in nb.prange(N):
+        for j in range(indptr[i], indptr[i + 1]):
+            v = degree_power[i] * data[j]
+            if symmetric:
+                v *= degree_power[indices[j]]
+            out[j] = v
+    return out
+
+
 normalized_laplacian_matrix = normalize_adj
@@ -1,5 +1,10 @@
+import numba as nb
 import numpy as np
 import scipy.sparse as sp
+
+from numba import types
+from numba.typed import Dict
+
 from .normalize_adj import normalize_adj
 from ..transforms import BaseTransform
 from ..decorators import multiple
@@ -9,21 +14,147 @@ from ..get_transform import Transform
 @Transform.register()
 class PPR(BaseTransform):
     def __init__(self,
-                 alpha: float = 0.1):
+                 alpha: float = 0.1,
+                 approximate: bool = False,
+                 eps: float = 1e-4,
+                 K: int = None):
         super().__init__()
         self.alpha = alpha
+        self.approximate = approximate
+        self.eps = eps
+        self.K = K
 
     def __call__(self, adj_matrix):
         return ppr(adj_matrix,
-                   alpha=self.alpha)
+                   alpha=self.alpha,
+                   approximate=self.approximate,
+                   eps=self.eps,
+                   K=self.K)
 
     def extra_repr(self):
-        return f"alpha={self.alpha}"
+        return f"alpha={self.alpha}, approximate={self.approximate}, eps={self.eps}, K={self.K}"
 
 
 @multiple()
-def ppr(adj_matrix: sp.csr_matrix, alpha: float = 0.1) -> np.ndarray:
+def ppr(adj_matrix: sp.csr_matrix,
+        alpha: float = 0.1,
+        approximate: bool = False,
+        eps: float = 1e-4,
+        K: int = None):
+    """Personalized PageRank (PPR) matrix
+    `alpha * (I - (1 - alpha) * D^{-1/2} (A + I) D^{-1/2})^{-1}`.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the adjacency matrix.
+    alpha : float, optional
+        the teleport (restart) probability, by default 0.1
+    approximate : bool, optional
+        whether to use the push-based approximation
+        (Andersen et al., 2006) instead of the dense matrix inversion,
+        by default False.
+        It takes O(1 / (alpha * eps)) time and memory for each node,
+        and is able to scale to very large graphs.
+    eps : float, optional
+        the residual tolerance for the push-based approximation,
+        only used when `approximate=True`, by default 1e-4
+    K : int, optional
+        if specified, only the top-K entries of each row are kept,
+        only used when `approximate=True`, by default None
+
+    Returns
+    -------
+    np.ndarray of shape [N, N] if `approximate=False`,
+    otherwise sp.csr_matrix of shape [N, N].
+    """
+    if approximate:
+        return ppr_push(adj_matrix, alpha=alpha, eps=eps, K=K)
+
     num_nodes = adj_matrix.shape[0]
     M = normalize_adj(adj_matrix)
     A_inner = sp.eye(num_nodes, format='csr') - (1 - alpha) * M
     return alpha * np.linalg.inv(A_inner.toarray())
+
+
+def ppr_push(adj_matrix: sp.csr_matrix,
+             alpha: float = 0.1,
+             eps: float = 1e-4,
+             K: int = None) -> sp.csr_matrix:
+    """Approximate the symmetric PPR matrix with the (parallel) forward push algorithm.
+
+    The random-walk PPR vector of each node is computed with local pushes
+    on `A + I`, and then rescaled as `sqrt(d_i) * ppr[i, j] / sqrt(d_j)`
+    to match the symmetric normalization used in `ppr`.
+
+    Returns
+    -------
+    sp.csr_matrix of shape [N, N], with at most K entries in each row.
+    """
+    # the same as `normalize_adj`, self-loops are added
+    adj_matrix = adj_matrix.tocsr(copy=False) + sp.eye(adj_matrix.shape[0], dtype=adj_matrix.dtype, format='csr')
+    degree = adj_matrix.sum(1).A1.astype(np.float64)
+    cols, vals = _ppr_push_parallel(adj_matrix.indptr,
+                                    adj_matrix.indices,
+                                    adj_matrix.data.astype(np.float64),
+                                    degree,
+                                    alpha, eps,
+                                    K if K else -1)
+    indptr = np.zeros(len(cols) + 1, dtype=np.int64)
+    np.cumsum([c.size for c in cols], out=indptr[1:])
+    indices = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    data = np.concatenate(vals).astype(np.float32) if vals else np.empty(0, dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=adj_matrix.shape)
+
+
+@nb.njit(nogil=True)
+def _ppr_push_node(source, indptr, indices, weights, degree, alpha, eps):
+    p = Dict.empty(key_type=types.int64, value_type=types.float64)
+    r = Dict.empty(key_type=types.int64, value_type=types.float64)
+    queued = Dict.empty(key_type=types.int64, value_type=types.boolean)
+    source = np.int64(source)
+    r[source] = 1.0
+    queue = [source]
+    queued[source] = True
+    while len(queue) > 0:
+        u = queue.pop()
+        queued.pop(u)
+        res = r[u]
+        r[u] = 0.
+        p[u] = p.get(u, 0.) + alpha * res
+        push = (1. - alpha) * res / degree[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = np.int64(indices[k])
+            rv = r.get(v, 0.) + push * weights[k]
+            r[v] = rv
+            if rv >= eps * degree[v] and v not in queued:
+                queued[v] = True
+                queue.append(v)
+
+    cols = np.empty(len(p), dtype=np.int64)
+    vals = np.empty(len(p), dtype=np.float64)
+    i = 0
+    for k, v in p.items():
+        cols[i] = k
+        vals[i] = v
+        i += 1
+    return cols, vals
+
+
+@nb.njit(parallel=True)
+def _ppr_push_parallel(indptr, indices, weights, degree, alpha, eps, K):
+    N = len(indptr) - 1
+    all_cols = [np.zeros(0, dtype=np.int64)] * N
+    all_vals = [np.zeros(0, dtype=np.float64)] * N
+    sqrt_degree = np.sqrt(degree)
+    for i in nb.prange(N):
+        cols, vals = _ppr_push_node(i, indptr, indices, weights, degree, alpha, eps)
+        # rescale to symmetric normalization
+        vals = vals * sqrt_degree[i] / sqrt_degree[cols]
+        order = np.argsort(cols)
+        if K > 0 and vals.size > K:
+            order = np.argsort(-vals)[:K]
+            order = order[np.argsort(cols[order])]
+        all_cols[i] = cols[order]
+        all_vals[i] = vals[order]
+    return all_cols, all_vals
@@ -0,0 +1,139 @@
+import hashlib
+import numpy as np
+import scipy.sparse as sp
+from collections import OrderedDict
+
+__all__ = ["PropagatedFeatureStore", "propagate_attr",
+           "propagated_feature_store"]
+
+
+class PropagatedFeatureStore:
+    """Cache of the propagated node attributes `adj^k @ x` for k = 0, ..., K,
+    shared by decoupled (propagation-first) models such as SGC and FastGCN.
+
+    The entries are keyed by the contents of `adj` and `x`, so that different
+    trainers built on the same (transformed) graph reuse the computed hops,
+    and a deeper hop is computed from the deepest cached one.
+    The least recently used entries are discarded once the cached hops
+    take more than `max_bytes`.
+
+    Example
+    -------
+    >>> store = PropagatedFeatureStore()
+    >>> x2 = store.get(adj, x, K=2) # compute adj @ x, adj^2 @ x
+    >>> x1 = store.get(adj, x, K=1) # no computation
+    >>> x3 = store.get(adj, x, K=3) # only one more multiplication
+    """
+
+    def __init__(self, max_bytes: int = 2**30):
+        """
+        Parameters
+        ----------
+        max_bytes : int, optional
+            the maximum total size in bytes of the cached hops,
+            by default 2**30, i.e., 1 GiB
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+
+    def hops(self, adj_matrix: sp.csr_matrix, x, K: int = 2) -> list:
+        """Return the list `[x, adj @ x, ..., adj^K @ x]`."""
+        assert K >= 0, K
+        key = (_fingerprint(adj_matrix), _fingerprint(x))
+        hops = self._entries.pop(key, None)
+        if hops is None:
+            hops = [_densify(x)]
+        else:
+            self.nbytes -= _nbytes(hops)
+
+        if len(hops) <= K:
+            hops.extend(_propagate(adj_matrix, hops[-1], K + 1 - len(hops)))
+
+        self._entries[key] = hops
+        self.nbytes += _nbytes(hops)
+        while self.nbytes > self.max_bytes:
+            _, discarded = self._entries.popitem(last=False)
+            self.nbytes -= _nbytes(discarded)
+        return hops[:K + 1]
+
+    def get(self, adj_matrix: sp.csr_matrix, x, K: int = 2) -> np.ndarray:
+        """Return `adj^K @ x`."""
+        return self.hops(adj_matrix, x, K=K)[K]
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(entries={len(self)}, nbytes={self.nbytes}, max_bytes={self.max_bytes})"
+
+    __str__ = __repr__
+
+
+# the default store shared by the trainers that opt in with `cache=True`
+propagated_feature_store = PropagatedFeatureStore()
+
+
+def propagate_attr(adj_matrix: sp.csr_matrix, x, K: int = 2, cache: bool = False) -> np.ndarray:
+    """Compute the propagated node attributes `adj^K @ x`.
+
+    Parameters
+    ----------
+    adj_matrix : sp.csr_matrix
+        the (normalized) adjacency matrix.
+    x : np.ndarray or sp.spmatrix
+        the node attribute matrix.
+    K : int, optional
+        the number of propagation steps, by default 2
+    cache : bool, optional
+        whether to use the default `propagated_feature_store` so that
+        all hops are cached and reused across trainers, by default False.
+        The store is process-global, call `propagated_feature_store.clear()`
+        to release the memory.
+
+    Returns
+    -------
+    np.ndarray of shape [num_nodes, num_node_attrs]
+    """
+    if cache:
+        return propagated_feature_store.get(adj_matrix, x, K=K)
+    return _propagate(adj_matrix, _densify(x), K)[-1] if K > 0 else _densify(x)
+
+
+def _propagate(adj_matrix, x, K):
+    """Return `[adj @ x, ..., adj^K @ x]`."""
+    adj_matrix = adj_matrix.tocsr(copy=False)
+    out = []
+    for _ in range(K):
+        x = adj_matrix @ x
+        out.append(x)
+    return out
+
+
+def _nbytes(hops):
+    return sum(h.nbytes for h in hops)
+
+
+def _densify(x):
+    if sp.isspmatrix(x):
+        return x.toarray()
+    return np.asarray(x)
+
+
+def _fingerprint(x) -> str:
+    h = hashlib.sha1()
+    if sp.isspmatrix(x):
+        x = x.tocsr(copy=False)
+        h.update(f"csr{x.shape}".encode())
+        arrays = (x.data, x.indices, x.indptr)
+    else:
+        x = np.asarray(x)
+        h.update(f"{x.dtype}{x.shape}".encode())
+        arrays = (x,)
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr).data)
+    return h.hexdigest()
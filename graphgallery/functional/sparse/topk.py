@@ -5,21 +5,113 @@ import scipy.sparse as sp
 __all__ = ["sparse_topk"]
 
 
+def sparse_topk(matrix, K=None, axis=1, threshold=None):
+    """Sparsify the sparse matrix by keeping the `K` largest entries
+    of each row (`axis=1`) or column (`axis=0`), and/or the entries
+    that are not less than `threshold`.
+
+    The rows are processed in parallel with partial selection,
+    and the compacted CSR matrix is written directly.
+    Zero entries are always removed.
+
+    Parameters
+    ----------
+    matrix : sp.spmatrix
+        The input sparse matrix.
+    K : int, optional
+        The number of entries to keep in each row (column),
+        by default None, i.e., keep all entries.
+    axis : int, optional
+        1 for row-wise and 0 for column-wise selection, by default 1.
+    threshold : float, optional
+        The entries less than `threshold` are removed
+        before selecting the top-`K` entries, by default None.
+
+    Returns
+    -------
+    sp.csr_matrix
+        The sparsified matrix with the same shape.
+    """
+    if axis not in (0, 1):
+        raise ValueError(f"Invalid argument of `axis`, allowed (0, 1), but got {axis}.")
+    if axis == 0:
+        return sparse_topk(matrix.T, K=K, axis=1, threshold=threshold).T.tocsr()
+
+    matrix = matrix.tocsr(copy=False)
+    use_threshold = threshold is not None
+    indptr, indices, data = row_topk_csr(matrix.indptr,
+                                         matrix.indices,
+                                         matrix.data,
+                                         -1 if K is None else int(K),
+                                         float(threshold) if use_threshold else 0.,
+                                         use_threshold)
+    return sp.csr_matrix((data, indices, indptr), shape=matrix.shape)
+
+
 @nb.njit
-def row_topk_csr(data, indptr, K):
+def _is_kept(value, threshold, use_threshold):
+    return value != 0 and (not use_threshold or value >= threshold)
+
+
+@nb.njit(parallel=True)
+def row_topk_csr(indptr, indices, data, K, threshold, use_threshold):
     N = len(indptr) - 1
+    # number of candidates (nonzero entries not less than threshold) of each row
+    num_candidates = np.zeros(N, dtype=np.int64)
+    for i in nb.prange(N):
+        count = 0
+        for j in range(indptr[i], indptr[i + 1]):
+            if _is_kept(data[j], threshold, use_threshold):
+                count += 1
+        num_candidates[i] = count
+
+    num_kept = num_candidates.copy()
+    if K >= 0:
+        num_kept = np.minimum(num_kept, K)
+    new_indptr = np.zeros(N + 1, dtype=indptr.dtype)
+    new_indptr[1:] = np.cumsum(num_kept)
+    new_indices = np.empty(new_indptr[N], dtype=indices.dtype)
+    new_data = np.empty(new_indptr[N], dtype=data.dtype)
+
     for i in nb.prange(N):
-        d = data[indptr[i]:indptr[i + 1]]
+        k = new_indptr[i]
+        keep = num_kept[i]
+        if keep == 0:
+            continue
+
+        if keep == num_candidates[i]:
+            for j in range(indptr[i], indptr[i + 1]):
+                if _is_kept(data[j], threshold, use_threshold):
+                    new_indices[k] = indices[j]
+                    new_data[k] = data[j]
+                    k += 1
+            continue
 
-        if d.size > K:
-            bottom_inds = np.argsort(d)[:(d.size - K)]
-            data[indptr[i]:indptr[i + 1]][bottom_inds] = 0.
-    return data
+        # the `keep`-th largest value by partial selection
+        values = np.empty(num_candidates[i], dtype=data.dtype)
+        c = 0
+        for j in range(indptr[i], indptr[i + 1]):
+            if _is_kept(data[j], threshold, use_threshold):
+                values[c] = data[j]
+                c += 1
+        pivot = num_candidates[i] - keep
+        kth = np.partition(values, pivot)[pivot]
 
+        # entries larger than `kth` are kept, and the ties in order
+        ties = keep
+        for v in values:
+            if v > kth:
+                ties -= 1
+        for j in range(indptr[i], indptr[i + 1]):
+            v = data[j]
+            if not _is_kept(v, threshold, use_threshold) or v < kth:
+                continue
+            if v == kth:
+                if ties == 0:
+                    continue
+                ties -= 1
+            new_indices[k] = indices[j]
+            new_data[k] = v
+            k += 1
 
-def sparse_topk(adj_matrix, K, axis=1):
-    assert axis == 1, "not implemented"
-    data = row_topk_csr(adj_matrix.data.copy(), adj_matrix.indptr, K)
-    adj_matrix = sp.csr_matrix((data, adj_matrix.indices.copy(), adj_matrix.indptr.copy()), shape=adj_matrix.shape)
-    adj_matrix.eliminate_zeros()
-    return adj_matrix
+    return new_indptr, new_indices, new_data
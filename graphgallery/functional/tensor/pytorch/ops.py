@@ -101,8 +101,28 @@ def add_selfloops_edge(edge_index,
                        edge_weight,
                        num_nodes=None,
                        fill_weight=1.0):
-    # TODO
-    ...
+    """
+    edge_index: shape [2, M]
+    edge_weight: shape [M,]
+    """
+    if num_nodes is None:
+        num_nodes = int(edge_index.max()) + 1
+
+    if edge_weight is None:
+        edge_weight = torch.ones(edge_index.shape[1],
+                                 dtype=getattr(torch, gg.floatx()),
+                                 device=edge_index.device)
+
+    range_arr = torch.arange(num_nodes, dtype=edge_index.dtype, device=edge_index.device)
+    diagnal_edge_index = torch.stack([range_arr, range_arr])
+    updated_edge_index = torch.cat([edge_index, diagnal_edge_index], dim=1)
+
+    diagnal_edge_weight = torch.full((num_nodes,), fill_weight,
+                                     dtype=edge_weight.dtype,
+                                     device=edge_weight.device)
+    updated_edge_weight = torch.cat([edge_weight, diagnal_edge_weight])
+
+    return updated_edge_index, updated_edge_weight
 
 
 def normalize_edge_tensor(edge_index,
@@ -110,5 +130,29 @@ def normalize_edge_tensor(edge_index,
                           num_nodes=None,
                           fill_weight=1.0,
                           rate=-0.5):
-    # TODO
-    ...
+    """
+    edge_index: shape [2, M]
+    edge_weight: shape [M,]
+
+    Duplicated edges are allowed, whose weights are summed up.
+    Only out-of-place operations are used, so that the normalized
+    weights are differentiable (to any order) w.r.t. `edge_weight`.
+    """
+    if num_nodes is None:
+        num_nodes = int(edge_index.max()) + 1
+
+    edge_index, edge_weight = add_selfloops_edge(edge_index,
+                                                 edge_weight,
+                                                 num_nodes=num_nodes,
+                                                 fill_weight=fill_weight)
+
+    row, col = edge_index
+    deg = edge_weight.new_zeros(num_nodes).index_add(0, row, edge_weight)
+    deg_inv_sqrt = deg.pow(rate)
+    # check if exists NAN
+    deg_inv_sqrt = torch.where(torch.isfinite(deg_inv_sqrt),
+                               deg_inv_sqrt, torch.zeros_like(deg_inv_sqrt))
+
+    edge_weight_norm = deg_inv_sqrt[row] * edge_weight * deg_inv_sqrt[col]
+
+    return edge_index, edge_weight_norm
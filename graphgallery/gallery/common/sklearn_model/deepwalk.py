@@ -1,12 +1,12 @@
 import numpy as np
 
 import gensim
-from numba import njit
 from gensim.models import Word2Vec
 from distutils.version import LooseVersion
 
 from sklearn.linear_model import LogisticRegression
 from graphgallery import functional as gf
+from graphgallery.gallery.utils.walker import deepwalk_random_walk, WalkCorpus
 from graphgallery.gallery import Common
 from .sklearn_model import SklearnModel
 
@@ -24,13 +24,15 @@ class Deepwalk(SklearnModel):
                      attr_transform=None,
                      graph_transform=None,
                      walk_length=80,
-                     walks_per_node=10):
+                     walks_per_node=10,
+                     memmap=None):
         graph = gf.get(graph_transform)(self.graph)
         adj_matrix = gf.get(adj_transform)(graph.adj_matrix)
-        walks = self.deepwalk_random_walk(adj_matrix.indices,
-                                          adj_matrix.indptr,
-                                          walk_length=walk_length,
-                                          walks_per_node=walks_per_node)
+        walks = deepwalk_random_walk(adj_matrix,
+                                     walk_length=walk_length,
+                                     walks_per_node=walks_per_node,
+                                     memmap=memmap,
+                                     seed=self.seed)
 
         self.register_cache(walks=walks)
 
@@ -44,8 +46,7 @@ class Deepwalk(SklearnModel):
 
         assert name == "Word2Vec"
 
-        walks = self.cache.walks
-        sentences = [list(map(str, walk)) for walk in walks]
+        sentences = WalkCorpus(self.cache.walks)
         if LooseVersion(gensim.__version__) <= LooseVersion("4.0.0"):
             model = Word2Vec(sentences,
                              size=embedding_dim,
@@ -80,29 +81,6 @@ class Deepwalk(SklearnModel):
                                         random_state=cfg.random_state)
         return classifier
 
-    @staticmethod
-    @njit
-    def deepwalk_random_walk(indices,
-                             indptr,
-                             walk_length=80,
-                             walks_per_node=10):
-
-        N = len(indptr) - 1
-
-        for _ in range(walks_per_node):
-            for n in range(N):
-                single_walk = [n]
-                current_node = n
-                for _ in range(walk_length - 1):
-                    neighbors = indices[
-                        indptr[current_node]:indptr[current_node + 1]]
-                    if neighbors.size == 0:
-                        break
-                    current_node = np.random.choice(neighbors)
-                    single_walk.append(current_node)
-
-                yield single_walk
-
     @property
     def embeddings(self, norm=True):
         if LooseVersion(gensim.__version__) <= LooseVersion("4.0.0"):
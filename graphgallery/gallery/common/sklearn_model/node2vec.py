@@ -1,5 +1,4 @@
 import numpy as np
-import networkx as nx
 
 import gensim
 
@@ -7,7 +6,7 @@ from gensim.models import Word2Vec
 from distutils.version import LooseVersion
 from sklearn.linear_model import LogisticRegression
 
-from graphgallery.gallery.utils.walker import RandomWalker, alias_sample
+from graphgallery.gallery.utils.walker import node2vec_random_walk, WalkCorpus
 from graphgallery.gallery import Common
 from graphgallery import functional as gf
 from .sklearn_model import SklearnModel
@@ -30,17 +29,18 @@ class Node2vec(SklearnModel):
                      p=0.5,
                      q=0.5,
                      walk_length=80,
-                     walks_per_node=10):
-
-        graph = gf.get(graph_transform)(self.graph).nxgraph()
-        walker = RandomWalker(graph, p=p, q=q)
-        walker.preprocess_transition_probs()
-
-        walks = self.node2vec_random_walk(graph,
-                                          walker.alias_nodes,
-                                          walker.alias_edges,
-                                          walk_length=walk_length,
-                                          walks_per_node=walks_per_node)
+                     walks_per_node=10,
+                     memmap=None):
+
+        graph = gf.get(graph_transform)(self.graph)
+        adj_matrix = gf.get(adj_transform)(graph.adj_matrix)
+        walks = node2vec_random_walk(adj_matrix,
+                                     p=p,
+                                     q=q,
+                                     walk_length=walk_length,
+                                     walks_per_node=walks_per_node,
+                                     memmap=memmap,
+                                     seed=self.seed)
 
         self.register_cache(walks=walks)
 
@@ -54,8 +54,7 @@ class Node2vec(SklearnModel):
 
         assert name == "Word2Vec"
 
-        walks = self.cache.walks
-        sentences = [list(map(str, walk)) for walk in walks]
+        sentences = WalkCorpus(self.cache.walks)
         if LooseVersion(gensim.__version__) <= LooseVersion("4.0.0"):
             model = Word2Vec(sentences,
                              size=embedding_dim,
@@ -91,34 +90,6 @@ class Node2vec(SklearnModel):
                                         random_state=cfg.random_state)
         return classifier
 
-    @staticmethod
-    def node2vec_random_walk(G,
-                             alias_nodes,
-                             alias_edges,
-                             walk_length=80,
-                             walks_per_node=10):
-        for _ in range(walks_per_node):
-            for n in G.nodes():
-                single_walk = [n]
-                current_node = n
-                for _ in range(walk_length - 1):
-                    neighbors = list(G.neighbors(current_node))
-                    if len(neighbors) > 0:
-                        if len(single_walk) == 1:
-                            current_node = neighbors[alias_sample(
-                                alias_nodes[current_node][0],
-                                alias_nodes[current_node][1])]
-                        else:
-                            prev = single_walk[-2]
-                            edge = (prev, current_node)
-                            current_node = neighbors[alias_sample(
-                                alias_edges[edge][0], alias_edges[edge][1])]
-                    else:
-                        break
-
-                    single_walk.append(current_node)
-                yield single_walk
-
     @property
     def embeddings(self):
         if LooseVersion(gensim.__version__) <= LooseVersion("4.0.0"):
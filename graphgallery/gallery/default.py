@@ -22,6 +22,14 @@ def default_cfg(model):
     cfg.process.attr_transform = None
     cfg.process.label_transform = None
 
+    # content-addressed on-disk cache for the results of `process`
+    cfg.process.Cache = gg.CfgNode()
+    cfg.process.Cache.enabled = False
+    cfg.process.Cache.root = osp.join(".", "process_cache")
+    # maximum size (in bytes) of the cache, `None` means unlimited
+    cfg.process.Cache.max_size = 10 * 1024**3
+    cfg.process.Cache.mmap = True
+
     cfg.model = gg.CfgNode()
     cfg.model.build_from_model = False
 
@@ -52,10 +60,23 @@ def default_cfg(model):
     cfg.train.ModelCheckpoint.save_best_only = True
     cfg.train.ModelCheckpoint.save_weights_only = True
     cfg.train.ModelCheckpoint.vervose = 0
+    # keep the best weights in memory instead of writing them to `path` on every improvement,
+    # only works with `save_weights_only=True`,
+    # the weights are saved to `path` once after training if `remove_weights=False`
+    cfg.train.ModelCheckpoint.in_memory = True
 
     cfg.train.Progbar = gg.CfgNode()
     cfg.train.Progbar.width = 20
 
+    # build the next batches in background threads
+    # See `graphgallery.sequence.PrefetchSequence`
+    cfg.train.Prefetch = gg.CfgNode()
+    cfg.train.Prefetch.enabled = False
+    cfg.train.Prefetch.buffer_size = 2
+    cfg.train.Prefetch.num_workers = 1
+    # `None` means using the seed of the model
+    cfg.train.Prefetch.seed = None
+
     cfg.train.TerminateOnNaN = gg.CfgNode()
     cfg.train.TerminateOnNaN.enabled = False
 
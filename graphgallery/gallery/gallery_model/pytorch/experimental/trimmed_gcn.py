@@ -16,7 +16,7 @@ class TrimmedGCN(Trainer):
         adj_matrix = gf.get(adj_transform)(graph.adj_matrix)
         node_attr = gf.get(attr_transform)(graph.node_attr)
 
-        X, A = gf.astensors(node_attr, adj_matrix.tolil().rows, device=self.device)
+        X, A = gf.astensors(node_attr, adj_matrix, device=self.device)
 
         # ``A`` and ``X`` are cached for later use
         self.register_cache(X=X, A=A)
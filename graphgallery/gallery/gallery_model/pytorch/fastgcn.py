@@ -26,12 +26,17 @@ class FastGCN(Trainer):
     def process_step(self,
                      adj_transform="normalize_adj",
                      attr_transform=None,
-                     graph_transform=None):
+                     graph_transform=None,
+                     cache_propagation=False):
 
         graph = gf.get(graph_transform)(self.graph)
         adj_matrix = gf.get(adj_transform)(graph.adj_matrix)
         node_attr = gf.get(attr_transform)(graph.node_attr)
-        node_attr = adj_matrix @ node_attr
+        if cache_propagation:
+            # the propagated attributes are cached and shared across trainers
+            node_attr = gf.propagate_attr(adj_matrix, node_attr, K=1, cache=True)
+        else:
+            node_attr = adj_matrix @ node_attr
 
         X, A = gf.astensor(node_attr, device=self.device), adj_matrix
 
@@ -57,6 +57,28 @@ class GCN(Trainer):
 
         return model
 
+    def replica_builder(self,
+                        seeds=[0],
+                        hids=[16],
+                        acts=['relu'],
+                        dropout=0.5,
+                        weight_decay=5e-4,
+                        lr=0.01,
+                        bias=False):
+
+        model = get_model("BatchedGCN", self.backend)
+        model = model(self.graph.num_node_attrs,
+                      self.graph.num_node_classes,
+                      seeds=seeds,
+                      hids=hids,
+                      acts=acts,
+                      dropout=dropout,
+                      weight_decay=weight_decay,
+                      lr=lr,
+                      bias=bias)
+
+        return model
+
     def train_sequence(self, index):
 
         labels = self.graph.node_label[index]
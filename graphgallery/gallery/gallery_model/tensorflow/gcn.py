@@ -56,7 +56,8 @@ class GCN(Trainer):
                       dropout=dropout,
                       weight_decay=weight_decay,
                       lr=lr,
-                      bias=bias)
+                      bias=bias,
+                      sparse_x=gf.is_sparse(self.cache.X))
         if use_tfn:
             model.use_tfn()
 
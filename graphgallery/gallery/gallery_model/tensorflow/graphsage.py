@@ -24,7 +24,7 @@ class GraphSAGE(Trainer):
         self.cfg.test.num_samples = num_samples_test
 
     def process_step(self,
-                     adj_transform="neighbor_sampler",
+                     adj_transform=None,
                      attr_transform=None,
                      graph_transform=None):
 
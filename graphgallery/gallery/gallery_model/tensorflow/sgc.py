@@ -21,23 +21,29 @@ class SGC(Trainer):
                      adj_transform="normalize_adj",
                      attr_transform=None,
                      graph_transform=None,
-                     K=2):
+                     K=2,
+                     cache_propagation=False):
 
         graph = gf.get(graph_transform)(self.graph)
         adj_matrix = gf.get(adj_transform)(graph.adj_matrix)
         node_attr = gf.get(attr_transform)(graph.node_attr)
 
-        X, A = gf.astensors(node_attr, adj_matrix, device=self.device)
-
-        # To avoid this tensorflow error in large dataset:
-        # InvalidArgumentError: Cannot use GPU when output.shape[1] * nnz(a) > 2^31 [Op:SparseTensorDenseMatMul]
-        if X.shape[1] * adj_matrix.nnz > 2**31:
-            device = "CPU"
+        if cache_propagation:
+            # the propagated attributes are cached and shared across trainers
+            node_attr = gf.propagate_attr(adj_matrix, node_attr, K=K, cache=True)
+            X, A = gf.astensors(node_attr, adj_matrix, device=self.device)
         else:
-            device = self.device
+            X, A = gf.astensors(node_attr, adj_matrix, device=self.device)
+
+            # To avoid this tensorflow error in large dataset:
+            # InvalidArgumentError: Cannot use GPU when output.shape[1] * nnz(a) > 2^31 [Op:SparseTensorDenseMatMul]
+            if X.shape[1] * adj_matrix.nnz > 2**31:
+                device = "CPU"
+            else:
+                device = self.device
 
-        with tf.device(device):
-            X = SGConvolution(K=K)([X, A])
+            with tf.device(device):
+                X = SGConvolution(K=K)([X, A])
 
         with tf.device(self.device):
             # ``A`` and ``X`` are cached for later use
@@ -11,6 +11,7 @@ from tensorflow.python.keras import callbacks as callbacks_module
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, TerminateOnNaN
 from tensorflow.keras.callbacks import History
 from graphgallery.utils import Progbar
+from graphgallery.sequence import PrefetchSequence
 
 import graphgallery as gg
 from graphgallery import functional as gf
@@ -18,6 +19,8 @@ from graphgallery.nn.functions import softmax
 from graphgallery.data.io import makedirs_from_filepath
 from graphgallery.utils.raise_error import raise_if_kwargs
 from graphgallery.gallery import Model
+from graphgallery.gallery.utils.process_cache import ProcessCache, UncacheableError
+from graphgallery.gallery.utils.callbacks import ModelSnapshot, ReplicaSnapshot
 
 from .default import default_cfg
 
@@ -91,10 +94,19 @@ class Trainer(Model):
             transform for attribute matrix.
         graph_transform: string, Callable function, or a tuple with function and dict arguments.
             transform for the entire graph, it is used before 'adj_transform' and 'attr_transform'.
+        Cache: dict, optional.
+            configurations of the on-disk cache for the processed inputs,
+            e.g., `Cache=dict(enabled=True, root="./process_cache")`.
+            See `graphgallery.gallery.utils.ProcessCache`.
         other arguments (if have) will be passed into your method 'process_step'.
         """
         cfg = self.cfg.process
-        _, kwargs = gf.wrapper(self.process_step)(**kwargs)
+        cfg.Cache.merge_from_dict(kwargs.pop("Cache", {}))
+
+        if cfg.Cache.enabled:
+            kwargs = self._cached_process(cfg.Cache, kwargs)
+        else:
+            _, kwargs = gf.wrapper(self.process_step)(**kwargs)
         cfg.merge_from_dict(kwargs)
 
         for k, v in cfg.items():
@@ -107,6 +119,29 @@ class Trainer(Model):
     def process_step(self, *args, **kwargs):
         raise NotImplementedError
 
+    def _cached_process(self, cache_cfg, kwargs):
+        store = ProcessCache(cache_cfg.root,
+                             max_size=cache_cfg.max_size,
+                             mmap=cache_cfg.mmap)
+        paras = store.resolve(self.process_step, kwargs)
+        try:
+            key = store.key(self, paras)
+        except UncacheableError as e:
+            warnings.warn(f"{e} The cache is disabled for this run.", UserWarning)
+            _, kwargs = gf.wrapper(self.process_step)(**kwargs)
+            return kwargs
+
+        cached = store.load(key, device=self.device, backend=self.backend)
+        if cached is not None:
+            self.register_cache(**cached)
+            return paras
+
+        before = dict(self.cache)
+        _, kwargs = gf.wrapper(self.process_step)(**kwargs)
+        # only the items registered by `process_step` are saved
+        store.save(key, {k: v for k, v in self.cache.items() if before.get(k) is not v})
+        return kwargs
+
     def build(self, **kwargs):
         """This method is used for build your model, which
         accepts only keyword arguments in your defined method 'builder'.
@@ -148,6 +183,51 @@ class Trainer(Model):
         self.cfg.model.merge_from_dict(kwargs)
         return self
 
+    def build_replicas(self, seeds, **kwargs):
+        """This method is used for build `len(seeds)` independent replicas
+        of your model, which are stacked into a single batched model sharing
+        the cached inputs, and trained in one pass with `train`.
+        It accepts only keyword arguments in your defined method 'replica_builder'.
+
+        Note:
+        -----
+        This method should be called after `process`.
+        The outputs of `predict` are of shape [N, num_replicas, num_classes].
+        `val_accuracy` and `val_loss` are averaged over the replicas, while
+        `EarlyStopping` and `ModelCheckpoint` monitor each replica by its own
+        metric (e.g., `val_accuracy_{i}`), so that each replica is stopped and
+        restored at its own best epoch, as if it were trained alone.
+
+        Parameters:
+        -----------
+        seeds: a list of integers,
+            the random seeds used to initialize each replica.
+        lr, weight_decay: float scalar or a list of them,
+            the hyperparameters for each replica.
+        other arguments (if have) will be passed into your method 'replica_builder'.
+
+        Example:
+        --------
+        >>> trainer = GCN(graph).process()
+        >>> trainer.build_replicas(seeds=range(10), lr=[0.01] * 5 + [0.05] * 5)
+        >>> trainer.train(splits.train_nodes, splits.val_nodes)
+        """
+        if not self.is_processed:
+            raise RuntimeError("Please call 'trainer.process()' first.")
+
+        seeds = list(seeds)
+        if self.backend == "tensorflow":
+            with tf.device(self.device):
+                self.model, kwargs = gf.wrapper(self.replica_builder)(seeds=seeds, **kwargs)
+        else:
+            model, kwargs = gf.wrapper(self.replica_builder)(seeds=seeds, **kwargs)
+            self.model = model.to(self.device)
+        self.cfg.model.merge_from_dict(kwargs)
+        return self
+
+    def replica_builder(self, *args, **kwargs):
+        raise NotImplementedError(f"{self.name} does not support batched replicas with '{self.backend}' backend.")
+
     def build_from_model(self, model):
         if not self.is_processed:
             raise RuntimeError("Please call 'trainer.process()' first.")
@@ -195,7 +275,8 @@ class Trainer(Model):
         callbacks = callbacks_module.CallbackList()
         history = History()
         callbacks.append(history)
-        cfg, callbacks = setup_callbacks(cfg, callbacks, validation)
+        num_replicas = getattr(model, "num_replicas", None)
+        cfg, callbacks = setup_callbacks(cfg, callbacks, validation, num_replicas=num_replicas)
         callbacks.set_model(model)
         model.stop_training = False
 
@@ -207,6 +288,12 @@ class Trainer(Model):
                                   verbose=verbose)
             print("Training...")
 
+        # the prefetchers created here are closed after training
+        prefetchers = []
+        train_data = self._prefetch(train_data, cfg.Prefetch, prefetchers)
+        if validation:
+            val_data = self._prefetch(val_data, cfg.Prefetch, prefetchers)
+
         logs = gf.BunchDict()
         callbacks.on_train_begin()
         try:
@@ -242,18 +329,43 @@ class Trainer(Model):
 
             callbacks.on_train_end()
             if ckpt_cfg.enabled:
-                if ckpt_cfg.save_weights_only:
+                if num_replicas:
+                    # the replicas have been restored by `ReplicaSnapshot`
+                    if not ckpt_cfg.remove_weights:
+                        makedirs_from_filepath(ckpt_cfg.path)
+                        model.save_weights(ckpt_cfg.path)
+                elif use_snapshot(ckpt_cfg):
+                    snapshot, = [c for c in callbacks.callbacks if isinstance(c, ModelSnapshot)]
+                    snapshot.restore()
+                    # persist to disk only when the weights are asked to be kept
+                    if not ckpt_cfg.remove_weights:
+                        makedirs_from_filepath(ckpt_cfg.path)
+                        model.save_weights(ckpt_cfg.path)
+                elif ckpt_cfg.save_weights_only:
                     model.load_weights(ckpt_cfg.path)
                 else:
                     self.model = model.load(ckpt_cfg.path)
 
         finally:
+            for prefetcher in prefetchers:
+                prefetcher.close()
             # to avoid unexpected termination of the model
-            if ckpt_cfg.enabled and ckpt_cfg.remove_weights:
+            if ckpt_cfg.enabled and ckpt_cfg.remove_weights and not (num_replicas or use_snapshot(ckpt_cfg)):
                 self.remove_weights()
 
         return history
 
+    def _prefetch(self, sequence, prefetch_cfg, prefetchers):
+        if not prefetch_cfg.enabled or isinstance(sequence, PrefetchSequence):
+            return sequence
+        seed = prefetch_cfg.seed if prefetch_cfg.seed is not None else self.seed
+        prefetcher = PrefetchSequence(sequence,
+                                      buffer_size=prefetch_cfg.buffer_size,
+                                      num_workers=prefetch_cfg.num_workers,
+                                      seed=seed)
+        prefetchers.append(prefetcher)
+        return prefetcher
+
     def test(self, data, **kwargs):
 
         if not self.model:
@@ -437,7 +549,12 @@ def remove_extra_tf_files(filepath):
         os.remove(path)
 
 
-def setup_callbacks(cfg, callbacks, validation):
+def use_snapshot(ckpt_cfg):
+    """Whether to keep the best weights in memory instead of on disk."""
+    return ckpt_cfg.get("in_memory", False) and ckpt_cfg.save_weights_only
+
+
+def setup_callbacks(cfg, callbacks, validation, num_replicas=None):
     ckpt_cfg = cfg.ModelCheckpoint
     es_cfg = cfg.EarlyStopping
     tb_cfg = cfg.TensorBoard
@@ -452,7 +569,22 @@ def setup_callbacks(cfg, callbacks, validation):
             warnings.warn(f"The metric 'val_{es_cfg.monitor}' is invalid without validation "
                           f"and has been automatically replaced with '{es_cfg.monitor}'.", UserWarning)
 
-    if es_cfg.enabled:
+    if num_replicas:
+        # batched replicas are stopped and restored one by one
+        if es_cfg.enabled:
+            callbacks.append(ReplicaSnapshot(monitor=es_cfg.monitor,
+                                             mode=es_cfg.mode,
+                                             patience=es_cfg.patience,
+                                             restore_best_weights=es_cfg.restore_best_weights,
+                                             verbose=es_cfg.verbose))
+        if ckpt_cfg.enabled:
+            if not ckpt_cfg.path.endswith(gg.file_ext()):
+                ckpt_cfg.path += gg.file_ext()
+            callbacks.append(ReplicaSnapshot(monitor=ckpt_cfg.monitor,
+                                             save_best_only=ckpt_cfg.save_best_only,
+                                             restore_best_weights=True,
+                                             verbose=ckpt_cfg.vervose))
+    elif es_cfg.enabled:
         es_callback = EarlyStopping(monitor=es_cfg.monitor,
                                     patience=es_cfg.patience,
                                     mode=es_cfg.mode,
@@ -461,15 +593,20 @@ def setup_callbacks(cfg, callbacks, validation):
                                     restore_best_weights=es_cfg.restore_best_weights)
         callbacks.append(es_callback)
 
-    if ckpt_cfg.enabled:
+    if ckpt_cfg.enabled and not num_replicas:
         if not ckpt_cfg.path.endswith(gg.file_ext()):
             ckpt_cfg.path += gg.file_ext()
-        makedirs_from_filepath(ckpt_cfg.path)
-        mc_callback = ModelCheckpoint(ckpt_cfg.path,
-                                      monitor=ckpt_cfg.monitor,
-                                      save_best_only=ckpt_cfg.save_best_only,
-                                      save_weights_only=ckpt_cfg.save_weights_only,
-                                      verbose=ckpt_cfg.vervose)
+        if use_snapshot(ckpt_cfg):
+            mc_callback = ModelSnapshot(monitor=ckpt_cfg.monitor,
+                                        save_best_only=ckpt_cfg.save_best_only,
+                                        verbose=ckpt_cfg.vervose)
+        else:
+            makedirs_from_filepath(ckpt_cfg.path)
+            mc_callback = ModelCheckpoint(ckpt_cfg.path,
+                                          monitor=ckpt_cfg.monitor,
+                                          save_best_only=ckpt_cfg.save_best_only,
+                                          save_weights_only=ckpt_cfg.save_weights_only,
+                                          verbose=ckpt_cfg.vervose)
         callbacks.append(mc_callback)
 
     if cfg.TerminateOnNaN.enabled:
@@ -0,0 +1,2 @@
+from .process_cache import ProcessCache
+from .callbacks import ModelSnapshot
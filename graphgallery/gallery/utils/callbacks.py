@@ -0,0 +1,148 @@
+import warnings
+import numpy as np
+from tensorflow.keras.callbacks import Callback
+
+__all__ = ["ModelSnapshot", "ReplicaSnapshot"]
+
+
+class ModelSnapshot(Callback):
+    """Keep the best weights of the model in memory, an in-memory
+    alternative to `tf.keras.callbacks.ModelCheckpoint` with
+    `save_weights_only=True`.
+
+    The weights are copied only when the monitored metric improves
+    (or every epoch if `save_best_only=False`), and they are restored
+    by `restore`. The model should implement `snapshot_weights`
+    and `restore_weights`, e.g., `TorchKeras` and `TFKeras`.
+    """
+
+    def __init__(self, monitor='val_accuracy', mode='auto', save_best_only=True, verbose=0):
+        super().__init__()
+        self.monitor = monitor
+        self.save_best_only = save_best_only
+        self.verbose = verbose
+        self.snapshot = None
+        self.best_epoch = None
+
+        if mode not in ('auto', 'min', 'max'):
+            warnings.warn(f"ModelSnapshot mode {mode} is unknown, fallback to auto mode.", RuntimeWarning)
+            mode = 'auto'
+        if mode == 'auto':
+            mode = 'max' if 'acc' in monitor or monitor.startswith('fmeasure') else 'min'
+        self.monitor_op = np.greater if mode == 'max' else np.less
+        self.best = -np.inf if mode == 'max' else np.inf
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        current = logs.get(self.monitor)
+        if not self.save_best_only:
+            self._take(epoch)
+        elif current is None:
+            warnings.warn(f"Can save best model only with {self.monitor} available, skipping.", RuntimeWarning)
+        elif self.monitor_op(float(current), self.best):
+            if self.verbose > 0:
+                print(f"\nEpoch {epoch + 1}: {self.monitor} improved from {self.best:.5f} to {float(current):.5f}")
+            self.best = float(current)
+            self._take(epoch)
+
+    def _take(self, epoch):
+        self.snapshot = self.model.snapshot_weights()
+        self.best_epoch = epoch
+
+    def restore(self):
+        """Restore the model with the snapshot, return False if no snapshot was taken."""
+        if self.snapshot is None:
+            return False
+        self.model.restore_weights(self.snapshot)
+        return True
+
+
+class ReplicaSnapshot(Callback):
+    """Keep the best weights of each replica of a batched model in memory,
+    the replicas are monitored by their own metrics `{monitor}_{i}`
+    (e.g., `val_accuracy_0`) instead of the averaged one.
+
+    If `patience` is given, the i-th replica is frozen once its metric has
+    not improved for `patience` epochs, as `EarlyStopping` does for a single
+    model, and the training is stopped when all replicas are frozen.
+    `restore` restores each replica with the weights of its own best epoch,
+    which is done at the end of training if `restore_best_weights=True`.
+    The model should implement `num_replicas`, `snapshot_replica`,
+    `restore_replica` and `freeze_replica`, e.g., `BatchedGCN`.
+    """
+
+    def __init__(self, monitor='val_accuracy', mode='auto', patience=None, save_best_only=True,
+                 restore_best_weights=False, verbose=0):
+        super().__init__()
+        self.monitor = monitor
+        self.patience = patience
+        self.restore_best_weights = restore_best_weights
+        self.save_best_only = save_best_only
+        self.verbose = verbose
+
+        if mode not in ('auto', 'min', 'max'):
+            warnings.warn(f"ReplicaSnapshot mode {mode} is unknown, fallback to auto mode.", RuntimeWarning)
+            mode = 'auto'
+        if mode == 'auto':
+            mode = 'max' if 'acc' in monitor or monitor.startswith('fmeasure') else 'min'
+        self.mode = mode
+        self.monitor_op = np.greater if mode == 'max' else np.less
+
+    def on_train_begin(self, logs=None):
+        R = self.model.num_replicas
+        self.best = [-np.inf if self.mode == 'max' else np.inf] * R
+        self.snapshots = [None] * R
+        self.best_epochs = [None] * R
+        self.wait = [0] * R
+        self.stopped = [False] * R
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        for r in range(self.model.num_replicas):
+            if self.stopped[r]:
+                continue
+            monitor = f"{self.monitor}_{r}"
+            current = logs.get(monitor)
+            if not self.save_best_only:
+                self._take(r, epoch)
+                continue
+            if current is None:
+                warnings.warn(f"Can save best replica only with {monitor} available, skipping.", RuntimeWarning)
+                continue
+            if self.monitor_op(float(current), self.best[r]):
+                if self.verbose > 0:
+                    print(f"\nEpoch {epoch + 1}: {monitor} improved from {self.best[r]:.5f} to {float(current):.5f}")
+                self.best[r] = float(current)
+                self.wait[r] = 0
+                self._take(r, epoch)
+            else:
+                self.wait[r] += 1
+                if self.patience is not None and self.wait[r] >= self.patience:
+                    if self.verbose > 0:
+                        print(f"\nEpoch {epoch + 1}: replica {r} stopped")
+                    self.stopped[r] = True
+                    self.model.freeze_replica(r)
+
+        if all(self.stopped):
+            self.model.stop_training = True
+
+    def on_train_end(self, logs=None):
+        # the frozen replicas are updated again in the next training
+        for r in range(self.model.num_replicas):
+            if self.stopped[r]:
+                self.model.freeze_replica(r, False)
+        if self.restore_best_weights:
+            self.restore()
+
+    def _take(self, r, epoch):
+        self.snapshots[r] = self.model.snapshot_replica(r)
+        self.best_epochs[r] = epoch
+
+    def restore(self):
+        """Restore each replica with its snapshot, return False if no snapshot was taken."""
+        restored = False
+        for r, snapshot in enumerate(self.snapshots):
+            if snapshot is not None:
+                self.model.restore_replica(r, snapshot)
+                restored = True
+        return restored
@@ -0,0 +1,216 @@
+import os
+import uuid
+import shutil
+import pickle
+import inspect
+import hashlib
+import os.path as osp
+import numpy as np
+import scipy.sparse as sp
+
+import graphgallery as gg
+from graphgallery import functional as gf
+from graphgallery.data.io import makedirs, save_graph_dir, load_graph_dir, is_graph_dir
+
+__all__ = ["ProcessCache", "UncacheableError"]
+
+
+class UncacheableError(ValueError):
+    """Raised when the inputs of `process` cannot be hashed deterministically."""
+
+
+class ProcessCache:
+    """Content-addressed on-disk cache for the results of `Trainer.process`.
+
+    Each entry is keyed by a hash of the graph arrays, the resolved
+    arguments of `process_step` (e.g., transforms), the trainer class and
+    the backend. The entries are saved in the same format as
+    `graphgallery.data.io.save_graph_dir`, i.e., arrays and tensors are stored
+    as raw `.npy` files (sparse matrices as `data/indices/indptr` in CSR format)
+    so that they can be opened with `np.load(mmap_mode='r')`. The least recently used entries are evicted
+    once the total size exceeds `max_size` bytes.
+
+    Note
+    ----
+    `process_step` is assumed to be deterministic given the graph and its
+    arguments, the random seed of the trainer is not a part of the key.
+
+    Example
+    -------
+    >>> trainer = GCN(graph)
+    >>> trainer.process(Cache=dict(enabled=True, root="./process_cache"))
+    """
+
+    def __init__(self, root: str = "process_cache", max_size: int = None, mmap: bool = True):
+        """
+        Parameters
+        ----------
+        root : str, optional
+            the directory where the cached entries are saved.
+        max_size : int, optional
+            the maximum size (in bytes) of all cached entries, by default None,
+            i.e., never evict entries.
+        mmap : bool, optional
+            whether to open the cached arrays with `mmap_mode='r'`, by default True.
+        """
+        self.root = osp.abspath(osp.expanduser(root))
+        self.max_size = max_size
+        self.mmap = mmap
+        makedirs(self.root)
+
+    @staticmethod
+    def resolve(func, kwargs: dict) -> dict:
+        """Resolve the arguments of `func`, including the default ones."""
+        bound = inspect.signature(func).bind(**kwargs)
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+    def key(self, trainer, paras: dict) -> str:
+        """Compute the content-addressed key for `trainer` processed with `paras`."""
+        h = hashlib.sha1()
+        cls = trainer.__class__
+        _update(h, f"{cls.__module__}.{cls.__qualname__}")
+        _update(h, getattr(trainer.backend, "name", str(trainer.backend)))
+        _update(h, f"{gg.floatx()}, {gg.intx()}, {gg.boolx()}")
+        for k, v in trainer.graph.items():
+            _update(h, k)
+            _hash_value(h, v)
+        for k in sorted(paras):
+            _update(h, k)
+            _update(h, _describe(paras[k]))
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        return osp.join(self.root, key)
+
+    def __contains__(self, key: str) -> bool:
+        return is_graph_dir(self.path(key))
+
+    def load(self, key: str, device=None, backend=None):
+        """Load the entry `key`, return None if it does not exist.
+
+        Tensors are converted to the backend tensors on `device`,
+        while the others are returned as (memory-mapped) arrays.
+        """
+        if key not in self:
+            return None
+        folder = self.path(key)
+        # mark as recently used
+        os.utime(folder)
+
+        def restore(array, spec):
+            return gf.astensor(array, dtype=spec["dtype"], device=device, backend=backend)
+
+        return load_graph_dir(folder, mmap_mode="r" if self.mmap else None, restore=restore)
+
+    def save(self, key: str, cache: dict) -> str:
+        """Save the dict `cache` as the entry `key`."""
+        folder = self.path(key)
+        tmp = f"{folder}.tmp-{uuid.uuid1().hex[:6]}"
+        try:
+            save_graph_dir(tmp, cache, convert=_tensor_to_array)
+            if osp.exists(folder):
+                # the same entry has been written by another process
+                shutil.rmtree(tmp)
+            else:
+                os.rename(tmp, folder)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+        return folder
+
+    def entries(self):
+        """Return the (key, size in bytes, last used time) of all entries,
+        sorted from the least recently used to the most."""
+        out = []
+        for key in os.listdir(self.root):
+            folder = self.path(key)
+            if ".tmp-" in key or not osp.isdir(folder):
+                continue
+            size = sum(osp.getsize(osp.join(folder, f)) for f in os.listdir(folder))
+            out.append((key, size, osp.getmtime(folder)))
+        return sorted(out, key=lambda x: x[-1])
+
+    def evict(self):
+        """Remove the least recently used entries until the total size
+        is no more than `max_size`."""
+        if self.max_size is None:
+            return
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        # always keep the most recently used entry
+        for key, size, _ in entries[:-1]:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove all cached entries."""
+        for key, *_ in self.entries():
+            shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(root={self.root}, max_size={self.max_size}, mmap={self.mmap})"
+
+    __str__ = __repr__
+
+
+def _update(h, s: str):
+    h.update(s.encode("utf-8"))
+    h.update(b"\x00")
+
+
+def _hash_value(h, value):
+    if value is None:
+        _update(h, "None")
+    elif sp.isspmatrix(value):
+        value = value.tocsr()
+        _update(h, f"csr{value.shape}")
+        for arr in (value.data, value.indices, value.indptr):
+            _hash_value(h, arr)
+    elif isinstance(value, np.ndarray) and value.dtype != "O":
+        _update(h, f"{value.dtype}{value.shape}")
+        h.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, (list, tuple)) or isinstance(value, np.ndarray):
+        _update(h, f"{type(value).__name__}{len(value)}")
+        for v in value:
+            _hash_value(h, v)
+    elif isinstance(value, dict):
+        _update(h, f"dict{len(value)}")
+        for k in sorted(value, key=str):
+            _update(h, str(k))
+            _hash_value(h, value[k])
+    else:
+        h.update(pickle.dumps(value))
+
+
+def _describe(obj) -> str:
+    """Return a deterministic description of the arguments of `process_step`."""
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return repr(obj)
+    if isinstance(obj, (list, tuple)):
+        return f"{type(obj).__name__}({', '.join(_describe(o) for o in obj)})"
+    if isinstance(obj, dict):
+        return "{" + ", ".join(f"{k!r}: {_describe(obj[k])}" for k in sorted(obj, key=str)) + "}"
+    if isinstance(obj, np.ndarray):
+        h = hashlib.sha1()
+        _hash_value(h, obj)
+        return h.hexdigest()
+    if isinstance(obj, gf.BaseTransform):
+        cls = obj.__class__
+        return f"{cls.__module__}.{cls.__qualname__}{_describe(vars(obj))}"
+    if callable(obj):
+        name = f"{getattr(obj, '__module__', None)}.{getattr(obj, '__qualname__', None)}"
+        if "<" not in name and "None" not in name:
+            return name
+    raise UncacheableError(f"Unable to hash {obj!r} deterministically.")
+
+
+def _tensor_to_array(value):
+    """Tensors are saved as arrays, and converted back to tensors when loading."""
+    if not gf.is_anytensor(value):
+        return None
+    array = gf.tensoras(value)
+    return array, {"dtype": str(array.dtype)}
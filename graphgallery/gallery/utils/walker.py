@@ -1,5 +1,7 @@
 import random
+import numba as nb
 import numpy as np
+import scipy.sparse as sp
 
 
 def create_alias_table(area_ratio):
@@ -54,62 +56,168 @@ def alias_sample(accept, alias):
         return alias[i]
 
 
-class RandomWalker:
-    def __init__(self, G, p=1, q=1):
-        """
-        :param G:
-        :param p: Return parameter,controls the likelihood of immediately revisiting a node in the walk.
-        :param q: In-out parameter,allows the search to differentiate between “inward” and “outward” nodes
-        """
-        self.G = G
-        self.p = p
-        self.q = q
-
-    def get_alias_edge(self, t, v):
-        """
-        compute unnormalized transition probability between nodes v and its neighbors give the previous visited node t.
-        :param t:
-        :param v:
-        :return:
-        """
-        G = self.G
-        p = self.p
-        q = self.q
-
-        unnormalized_probs = []
-        for x in G.neighbors(v):
-            weight = G[v][x].get('weight', 1.0)  # w_vx
-
-            if x == t:  # d_tx == 0
-                unnormalized_probs.append(weight / p)
-            elif G.has_edge(x, t):  # d_tx == 1
-                unnormalized_probs.append(weight)
-            else:  # d_tx > 1
-                unnormalized_probs.append(weight / q)
-
-        norm_const = sum(unnormalized_probs)
-        normalized_probs = [float(u_prob) / norm_const for u_prob in unnormalized_probs]
-
-        return create_alias_table(normalized_probs)
-
-    def preprocess_transition_probs(self):
-        """
-        Preprocessing of transition probabilities for guiding the random walks.
-        """
-        G = self.G
-
-        alias_nodes = {}
-        for node in G.nodes():
-            unnormalized_probs = [G[node][nbr].get('weight', 1.0)
-                                  for nbr in G.neighbors(node)]
-            norm_const = sum(unnormalized_probs)
-            normalized_probs = [float(u_prob) / norm_const for u_prob in unnormalized_probs]
-            alias_nodes[node] = create_alias_table(normalized_probs)
-
-        alias_edges = {}
-
-        for edge in G.edges():
-            alias_edges[edge] = self.get_alias_edge(edge[0], edge[1])
-
-        self.alias_nodes = alias_nodes
-        self.alias_edges = alias_edges
+class WalkCorpus:
+    """A restartable iterable over the walks in a (num_walks, walk_length) int array,
+    e.g., the output of `deepwalk_random_walk` or `node2vec_random_walk`,
+    which can be fed to `gensim.models.Word2Vec` as sentences.
+
+    The walks are streamed one at a time as lists of node ids (ints),
+    with the `-1` paddings removed, instead of materializing all the
+    walks as lists of strings.
+    """
+
+    def __init__(self, walks):
+        self.walks = walks
+
+    def __iter__(self):
+        for walk in self.walks:
+            yield walk[walk >= 0].tolist()
+
+    def __len__(self):
+        return len(self.walks)
+
+
+def allocate_walks(num_walks, walk_length, memmap=None):
+    """Preallocate the int32 array of shape (num_walks, walk_length) for the walks,
+    which is memory-mapped to the `.npy` file `memmap` if it is given."""
+    shape = (num_walks, walk_length)
+    if memmap is not None:
+        return np.lib.format.open_memmap(memmap, mode='w+', dtype=np.int32, shape=shape)
+    return np.empty(shape, dtype=np.int32)
+
+
+def deepwalk_random_walk(adj_matrix,
+                         walk_length=80,
+                         walks_per_node=10,
+                         memmap=None,
+                         seed=None):
+    """Uniform random walks of DeepWalk on the CSR graph,
+    generated in parallel over the start nodes.
+    If `seed` is given, the walk `w` is drawn with the seed `seed + w`,
+    so the walks do not depend on the number of threads.
+
+    :param adj_matrix: sp.csr_matrix, the adjacency matrix
+    :param walk_length: the length of each walk
+    :param walks_per_node: the number of walks starting from each node
+    :param memmap: the path of the `.npy` file to store the walks, optional
+    :param seed: the non-negative random seed, optional
+    :return: np.ndarray of shape (walks_per_node * num_nodes, walk_length), dtype int32,
+        the walk `i` starts from node `i % num_nodes`,
+        and is padded with `-1` if it reaches a node without neighbors.
+    """
+    adj_matrix = sp.csr_matrix(adj_matrix)
+    walks = allocate_walks(walks_per_node * adj_matrix.shape[0], walk_length, memmap=memmap)
+    _deepwalk_random_walk(adj_matrix.indptr.astype(np.int64),
+                          adj_matrix.indices.astype(np.int64),
+                          -1 if seed is None else int(seed),
+                          np.asarray(walks))
+    return walks
+
+
+@nb.njit(parallel=True)
+def _deepwalk_random_walk(indptr, indices, seed, walks):
+    N = indptr.size - 1
+    num_walks, walk_length = walks.shape
+    for w in nb.prange(num_walks):
+        if seed >= 0:
+            # the random state of numba is per thread
+            np.random.seed(seed + w)
+        node = w % N
+        walks[w, 0] = node
+        for step in range(1, walk_length):
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                walks[w, step:] = -1
+                break
+            node = indices[start + np.random.randint(end - start)]
+            walks[w, step] = node
+
+
+def node2vec_random_walk(adj_matrix,
+                         p=1.0,
+                         q=1.0,
+                         walk_length=80,
+                         walks_per_node=10,
+                         memmap=None,
+                         seed=None):
+    """Second-order (biased) random walks of Node2vec on the CSR graph.
+
+    The walks are generated in parallel over the start nodes.
+    Instead of precomputing alias tables for every edge, the next node `x`
+    is sampled from the first-order distribution `w_vx` and accepted with
+    probability `alpha(t, x) / max(1/p, 1, 1/q)`, where `t` is the previous node
+    and `alpha(t, x)` is `1/p`, `1` or `1/q` for `d_tx` = 0, 1 or 2.
+    It samples exactly the Node2vec transition probabilities with O(|E|) memory.
+    If `seed` is given, the walk `w` is drawn with the seed `seed + w`,
+    so the walks do not depend on the number of threads.
+
+    :param adj_matrix: sp.csr_matrix, the (weighted) adjacency matrix
+    :param p: Return parameter,controls the likelihood of immediately revisiting a node in the walk.
+    :param q: In-out parameter,allows the search to differentiate between “inward” and “outward” nodes
+    :param walk_length: the length of each walk
+    :param walks_per_node: the number of walks starting from each node
+    :param memmap: the path of the `.npy` file to store the walks, optional
+    :param seed: the non-negative random seed, optional
+    :return: np.ndarray of shape (walks_per_node * num_nodes, walk_length), dtype int32,
+        the walk `i` starts from node `i % num_nodes`,
+        and is padded with `-1` if it reaches a node without neighbors.
+    """
+    adj_matrix = sp.csr_matrix(adj_matrix, dtype=np.float64, copy=True)
+    adj_matrix.sort_indices()
+    indptr = adj_matrix.indptr.astype(np.int64)
+    indices = adj_matrix.indices.astype(np.int64)
+    # cumulative weights for first-order sampling by binary search
+    weights_cumsum = np.cumsum(adj_matrix.data)
+    walks = allocate_walks(walks_per_node * adj_matrix.shape[0], walk_length, memmap=memmap)
+    _node2vec_random_walk(indptr, indices, weights_cumsum, float(p), float(q),
+                          -1 if seed is None else int(seed), np.asarray(walks))
+    return walks
+
+
+@nb.njit(parallel=True)
+def _node2vec_random_walk(indptr, indices, weights_cumsum, p, q, seed, walks):
+    N = indptr.size - 1
+    num_walks, walk_length = walks.shape
+    max_prob = max(1. / p, 1., 1. / q)
+    for w in nb.prange(num_walks):
+        if seed >= 0:
+            # the random state of numba is per thread
+            np.random.seed(seed + w)
+        node = w % N
+        prev = -1
+        walks[w, 0] = node
+        for step in range(1, walk_length):
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                walks[w, step:] = -1
+                break
+            while True:
+                nbr = _sample_neighbor(indices, weights_cumsum, start, end)
+                if prev < 0:
+                    break
+                if nbr == prev:  # d_tx == 0
+                    prob = 1. / p
+                elif _has_edge(indptr, indices, nbr, prev):  # d_tx == 1
+                    prob = 1.
+                else:  # d_tx > 1
+                    prob = 1. / q
+                if np.random.random() * max_prob < prob:
+                    break
+            walks[w, step] = nbr
+            prev = node
+            node = nbr
+
+
+@nb.njit
+def _sample_neighbor(indices, weights_cumsum, start, end):
+    base = weights_cumsum[start - 1] if start > 0 else 0.
+    r = base + np.random.random() * (weights_cumsum[end - 1] - base)
+    pos = start + np.searchsorted(weights_cumsum[start:end], r, side='right')
+    return indices[min(pos, end - 1)]
+
+
+@nb.njit
+def _has_edge(indptr, indices, u, v):
+    start, end = indptr[u], indptr[u + 1]
+    pos = start + np.searchsorted(indices[start:end], v)
+    return pos < end and indices[pos] == v
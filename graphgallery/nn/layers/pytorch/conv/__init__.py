@@ -1,4 +1,4 @@
-from .gcn import GraphConvolution
+from .gcn import GraphConvolution, BatchedGraphConvolution
 from .gat import GraphAttention, SparseGraphAttention
 from .sgc import SGConvolution
 from .trainable_sgc import TrainableSGConvolution
@@ -1,3 +1,4 @@
+import torch
 import torch.nn as nn
 
 
@@ -15,10 +16,68 @@ class GraphConvolution(nn.Module):
         self.w.reset_parameters()
 
     def forward(self, x, adj=None):
-        out = self.w(x)
+        if x.is_sparse:
+            # sparse node attributes
+            out = torch.sparse.mm(x, self.w.weight.t())
+            if self.w.bias is not None:
+                out = out + self.w.bias
+        else:
+            out = self.w(x)
         if adj is not None:
             out = adj.mm(out)
         return out
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.in_features}, {self.out_features})"
+
+
+class BatchedGraphConvolution(nn.Module):
+    """Graph convolution of `num_replicas` independent weights,
+    which are evaluated with a single (sparse) matrix multiplication.
+
+    The input `x` is either shared by all replicas, with shape [N, in_features],
+    or one for each replica, with shape [N, num_replicas, in_features],
+    or a list of `num_replicas` sparse tensors with shape [N, in_features],
+    the output is of shape [N, num_replicas, out_features].
+    """
+
+    def __init__(self,
+                 in_features,
+                 out_features,
+                 num_replicas=1,
+                 bias=False):
+        super().__init__()
+        self.in_features = in_features
+        self.out_features = out_features
+        self.num_replicas = num_replicas
+        # the weights of each replica are separated parameters,
+        # so that they can be assigned different optimizer settings
+        self.w = nn.ModuleList([nn.Linear(in_features, out_features, bias=bias)
+                                for _ in range(num_replicas)])
+
+    def reset_parameters(self):
+        for w in self.w:
+            w.reset_parameters()
+
+    def forward(self, x, adj=None):
+        R, O = self.num_replicas, self.out_features
+        weight = torch.stack([w.weight for w in self.w])  # [R, O, I]
+        if isinstance(x, (list, tuple)):
+            # sparse node attributes, one for each replica
+            out = torch.cat([torch.sparse.mm(x_r, w.weight.t()) for x_r, w in zip(x, self.w)], dim=1)
+        elif x.is_sparse:
+            out = torch.sparse.mm(x, weight.view(R * O, -1).t())
+        elif x.dim() == 2:
+            out = x @ weight.view(R * O, -1).t()
+        else:
+            out = torch.einsum('nri,roi->nro', x, weight).reshape(-1, R * O)
+
+        if self.w[0].bias is not None:
+            out = out + torch.cat([w.bias for w in self.w])
+
+        if adj is not None:
+            out = adj.mm(out)
+        return out.view(-1, R, O)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.in_features}, {self.out_features}, num_replicas={self.num_replicas})"
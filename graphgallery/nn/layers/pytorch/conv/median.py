@@ -16,16 +16,50 @@ class MedianConvolution(nn.Module):
     def reset_parameters(self):
         self.w.reset_parameters()
 
-    def forward(self, x, nbrs):
+    def forward(self, x, adj):
         h = self.w(x)
-        aggregation = []
-        for nbr in nbrs:
-            message, _ = torch.median(h[nbr], dim=0)
-            aggregation.append(message)
-
-        output = torch.stack(aggregation)
+        row, col = adj.coalesce().indices()
+        message, deg, ptr = segment_sort(h[col], row, h.size(0))
+        # the (lower) median of each node is at position `(deg - 1) // 2` of its segment
+        index = ptr + (deg - 1).clamp_min(0) // 2
+        output = message[index.clamp_max(max(message.size(0) - 1, 0))]
+        # nodes without neighbors
+        output = output.masked_fill((deg == 0).unsqueeze(1), 0.)
 
         return output
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.in_features}, {self.out_features})"
+
+
+def segment_sort(message, row, num_nodes):
+    """Sort the messages of each node, i.e., the rows of `message` that share
+    the same `row`, independently for each feature, with two batched sorts
+    instead of a loop over nodes.
+
+    Parameters
+    ----------
+    message: torch.Tensor, shape [E, F]
+        The messages along the edges.
+    row: torch.Tensor, shape [E]
+        The (sorted) target nodes of the edges.
+    num_nodes: int
+        The number of nodes.
+
+    Returns
+    -------
+    message: torch.Tensor, shape [E, F]
+        The messages sorted within each segment of `row`.
+    deg: torch.Tensor, shape [num_nodes]
+        The degree (segment length) of each node.
+    ptr: torch.Tensor, shape [num_nodes]
+        The start position of each segment.
+    """
+    num_edges = message.size(0)
+    deg = torch.bincount(row, minlength=num_nodes)
+    ptr = deg.cumsum(0) - deg
+    # sort by value, then by the composite key (row, position in value order)
+    _, perm = message.sort(dim=0)
+    key = row[perm] * num_edges + torch.arange(num_edges, device=row.device).unsqueeze(1)
+    _, order = key.sort(dim=0)
+    return message.gather(0, perm.gather(0, order)), deg, ptr
@@ -2,6 +2,8 @@ import math
 import torch
 import torch.nn as nn
 
+from .median import segment_sort
+
 
 class TrimmedConvolution(nn.Module):
     def __init__(self,
@@ -19,18 +21,17 @@ class TrimmedConvolution(nn.Module):
     def reset_parameters(self):
         self.w.reset_parameters()
 
-    def forward(self, x, nbrs):
+    def forward(self, x, adj):
         h = self.w(x)
-        aggregation = []
-        for nbr in nbrs:
-            message, _ = torch.sort(h[nbr], dim=0)
-            remove = math.floor(message.size(0) * self.tperc)
-            if remove > 0:
-                message = message[remove:-remove]
-            message = torch.mean(message, dim=0)
-            aggregation.append(message)
-
-        output = torch.stack(aggregation)
+        row, col = adj.coalesce().indices()
+        message, deg, ptr = segment_sort(h[col], row, h.size(0))
+        # remove the `floor(deg * tperc)` smallest and largest messages of each node
+        remove = torch.floor(deg.float() * self.tperc).long()
+        position = torch.arange(row.size(0), device=row.device) - ptr[row]
+        keep = (position >= remove[row]) & (position < (deg - remove)[row])
+        message = message * keep.unsqueeze(1).to(message.dtype)
+        output = torch.zeros_like(h).index_add_(0, row, message)
+        output = output / (deg - 2 * remove).clamp_min(1).unsqueeze(1).to(output.dtype)
 
         return output
 
@@ -25,3 +25,51 @@ class MixedDropout(nn.Module):
             return self.sparse_dropout(x)
         else:
             return self.dense_dropout(x)
+
+
+class ReplicaDropout(nn.Module):
+    """Dropout for the inputs of batched replicas, where the masks of
+    each replica are drawn from its own generator seeded by `seeds[r]`,
+    so that a replica sees the same masks no matter how many replicas
+    are trained together.
+
+    The input `x` is either shared by all replicas, with shape [N, F] (dense or sparse),
+    or one for each replica, with shape [N, num_replicas, F].
+    The output is of shape [N, num_replicas, F],
+    or a list of `num_replicas` sparse tensors if `x` is sparse.
+    """
+
+    def __init__(self, p=0.5, seeds=[0]):
+        super().__init__()
+        self.p = p
+        self.seeds = list(seeds)
+        self.num_replicas = len(self.seeds)
+        self.generators = None
+
+    def _generators(self, device):
+        if self.generators is None or self.generators[0].device != device:
+            self.generators = [torch.Generator(device=device).manual_seed(seed) for seed in self.seeds]
+        return self.generators
+
+    def _keep(self, shape, generator, device):
+        return torch.rand(shape, generator=generator, device=device) >= self.p
+
+    def forward(self, x):
+        if not self.training or self.p == 0:
+            return x
+        generators = self._generators(x.device)
+        scale = 1. / (1. - self.p)
+        if x.is_sparse:
+            # sparse node attributes, the mask is applied to the nonzero entries
+            x = x.coalesce()
+            indices, values = x._indices(), x._values()
+            out = []
+            for g in generators:
+                keep = self._keep(values.shape, g, x.device)
+                out.append(torch.sparse.FloatTensor(indices[:, keep], values[keep] * scale, x.shape))
+            return out
+        if x.dim() == 2:
+            x = x.unsqueeze(1).expand(-1, self.num_replicas, -1)
+        shape = (x.size(0), x.size(2))
+        mask = torch.stack([self._keep(shape, g, x.device) for g in generators], dim=1)
+        return x * mask * scale
@@ -90,7 +90,11 @@ class GraphConvolution(Layer):
     def call(self, inputs):
 
         x, adj = inputs
-        h = tf.matmul(x, self.kernel)
+        if isinstance(x, tf.SparseTensor):
+            # sparse node attributes
+            h = tf.sparse.sparse_dense_matmul(x, self.kernel)
+        else:
+            h = tf.matmul(x, self.kernel)
         output = tf.sparse.sparse_dense_matmul(adj, h)
 
         if self.use_bias:
@@ -2,10 +2,6 @@ from tensorflow.keras import activations, constraints, initializers, regularizer
 from tensorflow.keras.layers import Layer
 
 import tensorflow as tf
-try:
-    import tensorflow_probability as tfp
-except ImportError:
-    tfp = None
 
 
 class MedianConvolution(Layer):
@@ -52,19 +48,22 @@ class MedianConvolution(Layer):
 
         super().build(input_shapes)
 
-    @tf.function
     def call(self, inputs):
 
-        x, neighbors = inputs
+        x, adj = inputs
         h = x @ self.kernel
 
-        aggregation = tf.TensorArray(tf.float32, size=0, dynamic_size=True, clear_after_read=False)
-        for neighbor in neighbors:
-            msg = tf.gather(h, neighbor)
-            agg = tfp.stats.percentile(msg, q=50., axis=0, interpolation='midpoint')
-            aggregation = aggregation.write(aggregation.size(), agg)
+        row, col = adj.indices[:, 0], adj.indices[:, 1]
+        message, deg, ptr = segment_sort(tf.gather(h, col), row, tf.shape(h)[0])
+        # the median with `midpoint` interpolation, i.e., the mean of
+        # the two middle messages of each node
+        last = tf.maximum(tf.shape(message, out_type=tf.int64)[0] - 1, 0)
+        lower = tf.gather(message, tf.minimum(ptr + tf.maximum(deg - 1, 0) // 2, last))
+        upper = tf.gather(message, tf.minimum(ptr + deg // 2, last))
+        output = (lower + upper) / 2.
+        # nodes without neighbors
+        output *= tf.cast(tf.expand_dims(deg > 0, 1), output.dtype)
 
-        output = aggregation.stack()
         if self.use_bias:
             output += self.bias
         return self.activation(output)
@@ -95,3 +94,39 @@ class MedianConvolution(Layer):
         attributes_shape = input_shapes[0]
         output_shape = (attributes_shape[0], self.units)
         return tf.TensorShape(output_shape)  # (num_nodes, output_dim)
+
+
+def segment_sort(message, row, num_nodes):
+    """Sort the messages of each node, i.e., the rows of `message` that share
+    the same `row`, independently for each feature, with two batched sorts
+    instead of a loop over nodes.
+
+    Parameters
+    ----------
+    message: tf.Tensor, shape [E, F]
+        The messages along the edges.
+    row: tf.Tensor, shape [E]
+        The (sorted) target nodes of the edges.
+    num_nodes: int
+        The number of nodes.
+
+    Returns
+    -------
+    message: tf.Tensor, shape [E, F]
+        The messages sorted within each segment of `row`.
+    deg: tf.Tensor, shape [num_nodes]
+        The degree (segment length) of each node.
+    ptr: tf.Tensor, shape [num_nodes]
+        The start position of each segment.
+    """
+    row = tf.cast(row, tf.int64)
+    num_edges = tf.shape(row, out_type=tf.int64)[0]
+    deg = tf.math.bincount(tf.cast(row, tf.int32), minlength=num_nodes, dtype=tf.int64)
+    ptr = tf.cumsum(deg, exclusive=True)
+    # sort by value, then by the composite key (row, position in value order),
+    # for each feature (transposed to the batch axis)
+    message_t = tf.transpose(message)
+    perm = tf.argsort(message_t, axis=1)
+    key = tf.gather(row, perm) * num_edges + tf.range(num_edges)
+    perm = tf.gather(perm, tf.argsort(key, axis=1), batch_dims=1)
+    return tf.transpose(tf.gather(message_t, perm, batch_dims=1)), deg, ptr
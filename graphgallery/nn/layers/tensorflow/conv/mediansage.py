@@ -118,7 +118,8 @@ class MedianAggregator(Layer):
         x, neigh_x = inputs
         neigh_x = tf.transpose(neigh_x, perm=[0, 2, 1])
         n = neigh_x.shape[-1]
-        n = n // 2 + tf.math.mod(n, 2)
+        # the (0-based) middle position, as in `MedianGCNAggregator`
+        n = n // 2
         neigh_x = tf.raw_ops.NthElement(input=neigh_x, n=n)
 
         x = x @ self.kernel_self
@@ -1,5 +1,6 @@
 from .gat import GAT
 from .gcn import GCN
+from .batched_gcn import BatchedGCN
 from .median import MedianGCN
 from .trimmed_gcn import TrimmedGCN
 from .fastgcn import FastGCN
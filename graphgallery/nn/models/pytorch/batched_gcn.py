@@ -0,0 +1,168 @@
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import optim
+
+import graphgallery as gg
+from graphgallery.nn.models import TorchKeras
+from graphgallery.nn.layers.pytorch import BatchedGraphConvolution, Sequential, activations, ReplicaDropout
+from graphgallery.nn.metrics.pytorch import Accuracy
+
+
+class BatchedGCN(TorchKeras):
+    """`len(seeds)` independent GCN replicas trained in a single pass.
+
+    The weights of the replicas are stacked so that each layer uses a single
+    sparse matrix multiplication with the shared adjacency matrix.
+    The outputs are of shape [N, num_replicas, out_features], and the
+    replicas may use different `lr` and `weight_decay`.
+
+    Each replica draws its dropout masks from its own generator seeded by
+    `seeds[i]`, so the i-th replica is trained exactly as a single replica
+    with `seeds=[seeds[i]]`.
+
+    Note
+    ----
+    The reported `loss` and `accuracy` are averaged over the replicas,
+    `loss_{i}` and `accuracy_{i}` are the ones of the i-th replica.
+    A replica can be snapshotted, restored and frozen alone, see
+    `gallery.utils.callbacks.ReplicaSnapshot`.
+    """
+
+    def __init__(self,
+                 in_features,
+                 out_features,
+                 *,
+                 seeds=[0],
+                 hids=[16],
+                 acts=['relu'],
+                 dropout=0.5,
+                 weight_decay=5e-4,
+                 lr=0.01,
+                 bias=False):
+        super().__init__()
+        R = len(seeds)
+        weight_decay = _per_replica(weight_decay, R, "weight_decay")
+        lr = _per_replica(lr, R, "lr")
+
+        # one dropout module shared by all layers,
+        # which keeps a random generator for each replica
+        dropout = ReplicaDropout(dropout, seeds=seeds)
+        conv = [dropout]
+        for hid, act in zip(hids, acts):
+            conv.append(BatchedGraphConvolution(in_features,
+                                                hid,
+                                                num_replicas=R,
+                                                bias=bias))
+            conv.append(activations.get(act))
+            conv.append(dropout)
+            in_features = hid
+        conv.append(BatchedGraphConvolution(in_features, out_features, num_replicas=R, bias=bias))
+        conv = Sequential(*conv)
+
+        # initialize each replica with its own seed
+        rng_state = torch.get_rng_state()
+        for r, seed in enumerate(seeds):
+            torch.manual_seed(seed)
+            for layer in conv:
+                if isinstance(layer, BatchedGraphConvolution):
+                    layer.w[r].reset_parameters()
+        torch.set_rng_state(rng_state)
+
+        self.conv = conv
+        self.seeds = list(seeds)
+        self.num_replicas = R
+        self.lr = lr
+
+        params = []
+        for r in range(R):
+            first, *others = self._replica_layers(r)
+            params.append(dict(params=first.parameters(),
+                               weight_decay=weight_decay[r], lr=lr[r]))
+            params.append(dict(params=[p for layer in others for p in layer.parameters()],
+                               weight_decay=0., lr=lr[r]))
+        self.compile(loss=nn.CrossEntropyLoss(),
+                     optimizer=optim.Adam(params),
+                     metrics=[Accuracy(name=f"accuracy_{r}") for r in range(R)])
+
+    def forward(self, x, adj):
+        return self.conv(x, adj)
+
+    def _replica_layers(self, r):
+        return [layer.w[r] for layer in self.conv if isinstance(layer, BatchedGraphConvolution)]
+
+    def snapshot_replica(self, r):
+        """Return an in-memory copy of the weights of the r-th replica,
+        which can be restored by `restore_replica`."""
+        return [{k: v.detach().clone() for k, v in layer.state_dict().items()}
+                for layer in self._replica_layers(r)]
+
+    def restore_replica(self, r, snapshot):
+        """Restore the weights of the r-th replica from `snapshot_replica`."""
+        for layer, state in zip(self._replica_layers(r), snapshot):
+            layer.load_state_dict(state)
+
+    def freeze_replica(self, r, frozen=True):
+        """Stop (or resume) updating the weights of the r-th replica,
+        the other replicas are not affected."""
+        for group in self.optimizer.param_groups[2 * r:2 * r + 2]:
+            group['lr'] = 0. if frozen else self.lr[r]
+
+    def train_step_on_batch(self,
+                            x,
+                            y=None,
+                            out_weight=None,
+                            device="cpu"):
+        self.train()
+        optimizer = self.optimizer
+        optimizer.zero_grad()
+        out = self(*x if isinstance(x, (list, tuple)) else [x])
+        if out_weight is not None:
+            out = out[out_weight]
+        losses = self._replica_losses(out, y)
+        # the sum of the losses of all replicas,
+        # so that each replica is updated by its own loss
+        losses.sum().backward()
+        optimizer.step()
+        return self._results(losses, y, out)
+
+    @torch.no_grad()
+    def test_step_on_batch(self,
+                           x,
+                           y=None,
+                           out_weight=None,
+                           device="cpu"):
+        self.eval()
+        out = self(*x if isinstance(x, (list, tuple)) else [x])
+        if out_weight is not None:
+            out = out[out_weight]
+        return self._results(self._replica_losses(out, y), y, out)
+
+    def _replica_losses(self, out, y):
+        # the mean cross entropy over the nodes of each replica, [num_replicas]
+        losses = F.cross_entropy(out.permute(0, 2, 1), y.unsqueeze(1).expand(-1, self.num_replicas), reduction='none')
+        return losses.mean(0)
+
+    def _results(self, losses, y, out):
+        y = y.cpu()
+        out = out.detach().cpu()
+        losses = losses.detach().cpu()
+        for r, metric in enumerate(self.metrics):
+            metric.update_state(y, out[:, r])
+        accs = [metric.result() for metric in self.metrics]
+        results = [losses.mean(), torch.stack(accs).mean()] + accs + list(losses)
+        return dict(zip(self.metrics_names, results))
+
+    @property
+    def metrics_names(self):
+        assert self.metrics is not None
+        return ['loss', 'accuracy'] + [metric.name for metric in self.metrics] + \
+            [f"loss_{r}" for r in range(self.num_replicas)]
+
+
+def _per_replica(value, num_replicas, name):
+    if gg.is_listlike(value):
+        if len(value) != num_replicas:
+            raise ValueError(f"`{name}` should be a scalar or a list with length {num_replicas}, but got {value}.")
+        return list(value)
+    return [value] * num_replicas
@@ -2,7 +2,7 @@ import torch.nn as nn
 from torch import optim
 
 from graphgallery.nn.models import TorchKeras
-from graphgallery.nn.layers.pytorch import GraphConvolution, Sequential, activations
+from graphgallery.nn.layers.pytorch import GraphConvolution, Sequential, activations, MixedDropout
 from graphgallery.nn.metrics.pytorch import Accuracy
 
 
@@ -19,7 +19,8 @@ class GCN(TorchKeras):
                  bias=False):
         super().__init__()
         conv = []
-        conv.append(nn.Dropout(dropout))
+        # the input node attributes may be sparse
+        conv.append(MixedDropout(dropout))
         for hid, act in zip(hids, acts):
             conv.append(GraphConvolution(in_features,
                                          hid,
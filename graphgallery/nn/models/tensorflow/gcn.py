@@ -18,10 +18,11 @@ class GCN(TFKeras):
                  dropout=0.5,
                  weight_decay=5e-4,
                  lr=0.01, bias=False,
+                 sparse_x=False,
                  experimental_run_tf_function=True):
 
         x = Input(batch_shape=[None, in_features],
-                  dtype=floatx(), name='node_attr')
+                  dtype=floatx(), sparse=sparse_x, name='node_attr')
         adj = Input(batch_shape=[None, None], dtype=floatx(),
                     sparse=True, name='adj_matrix')
 
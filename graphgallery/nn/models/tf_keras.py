@@ -124,6 +124,16 @@ class TFKeras(Model):
         except KeyError as e:
             super().load_weights(filepath[:-len(ext)])
 
+    def snapshot_weights(self):
+        """Return an in-memory copy of the model weights,
+        which can be restored by `restore_weights`."""
+        return tf.identity_n(self.weights)
+
+    def restore_weights(self, snapshot):
+        """Restore the model weights from `snapshot_weights`."""
+        for w, ws in zip(self.weights, snapshot):
+            w.assign(ws)
+
     def save(self, filepath, overwrite=True, save_format=None, **kwargs):
 
         ext = gg.file_ext()
@@ -153,6 +153,15 @@ class TorchKeras(nn.Module):
         checkpoint = torch.load(filepath)
         self.load_state_dict(checkpoint)
 
+    def snapshot_weights(self):
+        """Return an in-memory copy of the model weights,
+        which can be restored by `restore_weights`."""
+        return {k: v.detach().clone() for k, v in self.state_dict().items()}
+
+    def restore_weights(self, snapshot):
+        """Restore the model weights from `snapshot_weights`."""
+        self.load_state_dict(snapshot)
+
     def save(self, filepath, overwrite=True, save_format=None, **kwargs):
         ext = gg.file_ext()
 
@@ -3,3 +3,4 @@ from .minibatch_sequence import MiniBatchSequence, SAGEMiniBatchSequence, FastGC
 from .fullbatch_sequence import FullBatchSequence
 from .sample_sequence import SBVATSampleSequence
 from .null_sequence import NullSequence
+from .prefetch_sequence import PrefetchSequence
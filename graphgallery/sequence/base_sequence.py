@@ -25,6 +25,11 @@ class Sequence(tf_Sequence):
     def __getitem__(self, index):
         raise NotImplementedError
 
+    def get_batch(self, index, rng=None):
+        """Build the batch `index`. The sequences that draw random numbers
+        from their own `rng` use the `np.random.Generator` `rng` instead if it is given."""
+        return self[index]
+
     def on_epoch_begin(self):
         ...
 
@@ -3,6 +3,8 @@ import numpy as np
 import tensorflow as tf
 import scipy.sparse as sp
 
+from graphgallery import functional as gf
+
 from .base_sequence import Sequence
 
 
@@ -53,8 +55,18 @@ class SAGEMiniBatchSequence(Sequence):
         num_samples=[5, 5],
         shuffle=False,
         batch_size=512,
+        random_state=None,
         *args, **kwargs
     ):
+        """
+        Parameters
+        ----------
+        x : a list of (node_attr, adj_matrix, batch_nodes),
+            where `adj_matrix` is the CSR adjacency matrix or a neighbor
+            table built by `graphgallery.functional.neighbor_sampler`.
+        random_state : int or np.random.Generator, optional
+            the random state used for neighbor sampling, by default None.
+        """
         super().__init__(*args, **kwargs)
         self.node_attr, self.adj_matrix, self.batch_nodes = x
         self.y = y
@@ -63,6 +75,7 @@ class SAGEMiniBatchSequence(Sequence):
         self.batch_size = batch_size
         self.indices = np.arange(len(self.batch_nodes))
         self.num_samples = num_samples
+        self.rng = gf.get_rng(random_state)
 
         self.node_attr = self.astensor(self.node_attr)
 
@@ -70,6 +83,10 @@ class SAGEMiniBatchSequence(Sequence):
         return self.n_batches
 
     def __getitem__(self, index):
+        return self.get_batch(index)
+
+    def get_batch(self, index, rng=None):
+        rng = self.rng if rng is None else rng
         if self.shuffle:
             idx = self.indices[index *
                                self.batch_size:(index + 1) * self.batch_size]
@@ -78,17 +95,15 @@ class SAGEMiniBatchSequence(Sequence):
 
         nodes_input = [self.batch_nodes[idx]]
         for num_sample in self.num_samples:
-            neighbors = sample_neighbors(
-                self.adj_matrix, nodes_input[-1], num_sample).ravel()
+            # only the frontier of the current hop is sampled
+            neighbors = gf.sample_neighbors(self.adj_matrix, nodes_input[-1],
+                                            num_sample, random_state=rng).ravel()
             nodes_input.append(neighbors)
 
         y = self.y[idx] if self.y is not None else None
 
         return self.astensors([self.node_attr, *nodes_input], y)
 
-    def on_epoch_end(self):
-        pass
-
     def on_epoch_end(self):
         if self.shuffle:
             self._shuffle_batches()
@@ -97,12 +112,7 @@ class SAGEMiniBatchSequence(Sequence):
         """
          Shuffle all nodes at the end of each epoch
         """
-        random.shuffle(self.indices)
-
-
-def sample_neighbors(adj_matrix, nodes, num_neighbors):
-    np.random.shuffle(adj_matrix.T)
-    return adj_matrix[nodes, :num_neighbors]
+        self.rng.shuffle(self.indices)
 
 
 class FastGCNBatchSequence(Sequence):
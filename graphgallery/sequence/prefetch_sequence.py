@@ -0,0 +1,119 @@
+import numpy as np
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .base_sequence import Sequence
+
+
+class PrefetchSequence(Sequence):
+    """Wrap a sequence and build its next batches in a background thread pool.
+
+    The batches (already converted to tensors by the wrapped sequence) are
+    built ahead of time while the model is training on the current one,
+    and `on_epoch_end` of the wrapped sequence runs in the background as well,
+    so CPU-side sampling overlaps with model compute.
+
+    If `seed` is specified, each batch is built by `sequence.get_batch(index, rng)`
+    with its own generator seeded by `(seed, epoch, index)`, and `on_epoch_end`
+    runs with the sequence's `rng` seeded by `(seed, epoch)`, so the batches
+    do not depend on `num_workers` or the thread scheduling for the sequences
+    drawing from their own `rng` (e.g., `SAGEMiniBatchSequence`).
+    The global `np.random` and `random` states are never touched.
+
+    Example
+    -------
+    >>> sequence = SAGEMiniBatchSequence(...)
+    >>> sequence = PrefetchSequence(sequence, buffer_size=4, seed=42)
+    >>> for batch in sequence:
+    ...     ...
+    """
+
+    def __init__(self, sequence, buffer_size=2, num_workers=1, seed=None):
+        """
+        Parameters
+        ----------
+        sequence : Sequence
+            the wrapped sequence.
+        buffer_size : int, optional
+            the number of batches built ahead, by default 2
+        num_workers : int, optional
+            the number of worker threads, by default 1
+        seed : int, optional
+            the random seed used to build the batches, by default None
+        """
+        super().__init__(device=sequence.device)
+        assert buffer_size >= 1 and num_workers >= 1
+        self.sequence = sequence
+        self.buffer_size = buffer_size
+        self.num_workers = num_workers
+        self.seed = seed
+        self.epoch = 0
+        self._epoch_end = None
+        self._executor = ThreadPoolExecutor(max_workers=num_workers)
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __getitem__(self, index):
+        self._wait_epoch_end()
+        return self._build(index, self.epoch)
+
+    def __iter__(self):
+        self._wait_epoch_end()
+        num_batches = len(self)
+        pending = deque()
+        next_index = 0
+        try:
+            while next_index < min(self.buffer_size, num_batches):
+                pending.append(self._executor.submit(self._build, next_index, self.epoch))
+                next_index += 1
+            while pending:
+                batch = pending.popleft().result()
+                if next_index < num_batches:
+                    pending.append(self._executor.submit(self._build, next_index, self.epoch))
+                    next_index += 1
+                yield batch
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def on_epoch_begin(self):
+        self.sequence.on_epoch_begin()
+
+    def on_epoch_end(self):
+        self._wait_epoch_end()
+        self.epoch += 1
+        # no batch is being built here, so the sequence's own `rng` can be replaced
+        if self.seed is not None and isinstance(getattr(self.sequence, "rng", None), np.random.Generator):
+            self.sequence.rng = self._rng_of(self.epoch)
+        self._epoch_end = self._executor.submit(self.sequence.on_epoch_end)
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._wait_epoch_end()
+        self._executor.shutdown(wait=True)
+
+    def _wait_epoch_end(self):
+        if self._epoch_end is not None:
+            self._epoch_end.result()
+            self._epoch_end = None
+
+    def _build(self, index, epoch):
+        if self.seed is None:
+            return self.sequence.get_batch(index)
+        return self.sequence.get_batch(index, rng=self._rng_of(epoch, index))
+
+    def _rng_of(self, *keys):
+        return np.random.default_rng(np.random.SeedSequence([self.seed, *keys]))
+
+    def __del__(self):
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.sequence.__class__.__name__}, " \
+            f"buffer_size={self.buffer_size}, num_workers={self.num_workers}, seed={self.seed})"
+
+    __str__ = __repr__
@@ -1,4 +1,4 @@
-from .context_manager import nullcontext
+from .context_manager import nullcontext, timer
 from .raise_error import raise_if_kwargs
 from .tqdm import tqdm
 from .context_manager import nullcontext
@@ -1,4 +1,5 @@
 
+import time
 from typing import Any
 from contextlib import contextmanager
 
@@ -23,3 +24,36 @@ def nullcontext(enter_result=None):
         yields the inputs
     """
     yield enter_result
+
+
+@contextmanager
+def timer(records: dict, key: str, sync=None):
+    """Timer context manager.
+    The elapsed (wall-clock) seconds of the block are 
+    accumulated into `records[key]`.
+
+    Parameters
+    ----------
+    records : dict
+        the mapping of accumulated seconds
+    key : str
+        the name of the timed block
+    sync : callable, optional
+        called before reading the clock, e.g.,
+        `torch.cuda.synchronize` for asynchronous devices,
+        by default None
+
+    Yields
+    -------
+    dict
+        the input `records`
+    """
+    if sync is not None:
+        sync()
+    start = time.perf_counter()
+    try:
+        yield records
+    finally:
+        if sync is not None:
+            sync()
+        records[key] = records.get(key, 0.) + time.perf_counter() - start
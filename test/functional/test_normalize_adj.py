@@ -0,0 +1,39 @@
+import numpy as np
+import scipy.sparse as sp
+from graphgallery.functional import normalize_adj
+
+
+def reference(adj, rate, fill_weight, symmetric):
+    adj = adj.toarray() + fill_weight * np.eye(adj.shape[0])
+    degree_power = np.power(adj.sum(1), rate)
+    adj = degree_power[:, None] * adj
+    if symmetric:
+        adj = adj * degree_power[None]
+    return adj
+
+
+def random_adj(N=50, density=0.1, seed=42):
+    adj = sp.random(N, N, density, format='csr', random_state=seed)
+    adj = adj + adj.T
+    # keep some of the self-loops
+    adj.setdiag(np.arange(N) % 2)
+    adj.eliminate_zeros()
+    return adj.astype(np.float32)
+
+
+def test_normalize_sparse_adj():
+    adj = random_adj()
+    for fill_weight in (0., 1.0, 2.0):
+        for symmetric in (True, False):
+            out = normalize_adj(adj, rate=-0.5, fill_weight=fill_weight, symmetric=symmetric)
+            assert sp.isspmatrix_csr(out)
+            assert out.dtype == np.float32
+            assert np.allclose(out.toarray(), reference(adj, -0.5, fill_weight, symmetric), atol=1e-5)
+
+
+def test_normalize_sparse_adj_multiple_rates():
+    adj = random_adj()
+    out1, out2 = normalize_adj(adj, rate=[-0.5, -1.0])
+    assert np.allclose(out1.toarray(), reference(adj, -0.5, 1.0, True), atol=1e-5)
+    assert np.allclose(out2.toarray(), reference(adj, -1.0, 1.0, True), atol=1e-5)
+    assert out1.indices is out2.indices
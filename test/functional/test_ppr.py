@@ -0,0 +1,37 @@
+import numpy as np
+import scipy.sparse as sp
+from graphgallery.functional import ppr, gdc
+
+
+def random_adj(N=100, density=0.05, seed=42):
+    adj = sp.random(N, N, density, format='csr', random_state=seed)
+    adj = adj + adj.T
+    adj.data[:] = 1.
+    return adj.astype(np.float32)
+
+
+def test_ppr_push():
+    adj = random_adj()
+    exact = ppr(adj, alpha=0.15)
+    approx = ppr(adj, alpha=0.15, approximate=True, eps=1e-7)
+    assert sp.isspmatrix_csr(approx)
+    assert np.allclose(approx.toarray(), exact, atol=1e-4)
+
+    approx = ppr(adj, alpha=0.15, approximate=True, K=8)
+    assert approx.getnnz(1).max() <= 8
+
+
+def test_gdc_approximate():
+    adj = random_adj()
+    exact = gdc(adj, alpha=0.15, K=16)
+    approx = gdc(adj, alpha=0.15, K=16, approximate=True, approx_eps=1e-7)
+    assert np.allclose(approx.toarray(), exact.toarray(), atol=1e-3)
+
+    exact = gdc(adj, t=3., K=16, which='Heat')
+    approx = gdc(adj, t=3., K=16, which='Heat', approximate=True, approx_eps=1e-7)
+    assert np.allclose(approx.toarray(), exact.toarray(), atol=1e-3)
+
+
+if __name__ == "__main__":
+    test_ppr_push()
+    test_gdc_approximate()
@@ -0,0 +1,43 @@
+import numpy as np
+import scipy.sparse as sp
+from graphgallery.functional import normalize_adj, PropagatedFeatureStore
+
+
+def random_graph(N=100, F=16, density=0.05, seed=42):
+    adj = sp.random(N, N, density, format='csr', random_state=seed)
+    adj = adj + adj.T
+    adj.data[:] = 1.
+    x = np.random.RandomState(seed).rand(N, F).astype(np.float32)
+    return normalize_adj(adj.astype(np.float32)), x
+
+
+def test_propagated_feature_store():
+    adj, x = random_graph()
+    expected = adj @ (adj @ (adj @ x))
+
+    store = PropagatedFeatureStore()
+    assert np.allclose(store.get(adj, x, K=3), expected, atol=1e-5)
+    assert len(store) == 1
+
+    hops = store.hops(adj.copy(), x.copy(), K=2)
+    assert len(store) == 1
+    assert len(hops) == 3
+    assert np.allclose(hops[1], adj @ x, atol=1e-5)
+
+    store.get(adj, x + 1, K=1)
+    assert len(store) == 2
+
+
+def test_propagated_feature_store_max_bytes():
+    adj, x = random_graph()
+    # room for the hops [x, adj @ x] of a single entry
+    store = PropagatedFeatureStore(max_bytes=2 * x.nbytes)
+    store.get(adj, x, K=1)
+    assert len(store) == 1 and store.nbytes == 2 * x.nbytes
+
+    store.get(adj, x + 1, K=1)
+    assert len(store) == 1 and store.nbytes == 2 * x.nbytes
+
+    # an entry larger than `max_bytes` is computed but not kept
+    assert np.allclose(store.get(adj, x, K=2), adj @ (adj @ x), atol=1e-5)
+    assert len(store) == 0 and store.nbytes == 0
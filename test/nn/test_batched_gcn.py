@@ -0,0 +1,51 @@
+import numpy as np
+import scipy.sparse as sp
+import torch
+from graphgallery import functional as gf
+from graphgallery.nn.models.pytorch import GCN, BatchedGCN
+
+
+def random_graph(N=100, F=16, C=4, density=0.05, seed=42):
+    adj = sp.random(N, N, density, format='csr', random_state=seed)
+    adj = adj + adj.T
+    adj.data[:] = 1.
+    adj = gf.normalize_adj(adj.astype(np.float32)).tocoo()
+    adj = torch.sparse.FloatTensor(torch.LongTensor(np.vstack([adj.row, adj.col])),
+                                   torch.FloatTensor(adj.data), adj.shape)
+    rng = np.random.RandomState(seed)
+    x = torch.FloatTensor(rng.rand(N, F))
+    y = torch.LongTensor(rng.randint(C, size=N))
+    index = torch.LongTensor(np.arange(0, N, 2))
+    return x, adj, y, index
+
+
+def fit(model, x, adj, y, index, epochs=20):
+    for _ in range(epochs):
+        model.train_step_on_batch([x, adj], y[index], out_weight=index)
+    model.eval()
+    with torch.no_grad():
+        return model(x, adj)
+
+
+def test_batched_gcn_single_replica():
+    x, adj, y, index = random_graph()
+    torch.manual_seed(0)
+    gcn = GCN(x.size(1), 4, dropout=0.)
+    expected = fit(gcn, x, adj, y, index)
+
+    batched = BatchedGCN(x.size(1), 4, seeds=[0], dropout=0.)
+    out = fit(batched, x, adj, y, index)
+    assert out.shape == (x.size(0), 1, 4)
+    assert torch.allclose(out[:, 0], expected, atol=1e-5)
+
+
+def test_batched_gcn_independent_replicas():
+    x, adj, y, index = random_graph()
+    seeds, lr = [0, 1], [0.01, 0.05]
+    batched = BatchedGCN(x.size(1), 4, seeds=seeds, lr=lr, dropout=0.5)
+    out = fit(batched, x, adj, y, index)
+
+    for r in range(len(seeds)):
+        single = BatchedGCN(x.size(1), 4, seeds=seeds[r:r + 1], lr=lr[r], dropout=0.5)
+        expected = fit(single, x, adj, y, index)
+        assert torch.allclose(out[:, r], expected[:, 0], atol=1e-5)
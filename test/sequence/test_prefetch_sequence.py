@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from graphgallery.sequence import PrefetchSequence
+from graphgallery.sequence.base_sequence import Sequence
+
+
+class RandomSequence(Sequence):
+    def __init__(self, num_batches=8):
+        super().__init__()
+        self.num_batches = num_batches
+        self.rng = np.random.default_rng()
+        self.order = np.arange(num_batches)
+
+    def __len__(self):
+        return self.num_batches
+
+    def __getitem__(self, index):
+        return self.get_batch(index)
+
+    def get_batch(self, index, rng=None):
+        rng = self.rng if rng is None else rng
+        # random delays so that the workers finish out of order
+        time.sleep(rng.random() * 0.01)
+        return self.order[index], rng.random(4)
+
+    def on_epoch_end(self):
+        self.rng.shuffle(self.order)
+
+
+def run(num_workers, num_epochs=2):
+    sequence = PrefetchSequence(RandomSequence(), buffer_size=4,
+                                num_workers=num_workers, seed=42)
+    batches = []
+    try:
+        for _ in range(num_epochs):
+            batches.extend(sequence)
+            sequence.on_epoch_end()
+    finally:
+        sequence.close()
+    return batches
+
+
+def test_prefetch_sequence_num_workers():
+    expected = run(num_workers=1)
+    batches = run(num_workers=4)
+    assert len(batches) == len(expected) == 16
+    for (order, values), (expected_order, expected_values) in zip(batches, expected):
+        assert order == expected_order
+        assert np.array_equal(values, expected_values)